@@ -2,18 +2,41 @@
 
 from __future__ import annotations
 
+from functools import partial
+from typing import TYPE_CHECKING
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.helpers.httpx_client import create_async_httpx_client
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from .client import TeslaFiClient
-from .const import DOMAIN, HTTP_CLIENT, LOGGER
+from .client import TeslaFiClient, TeslaFiVehicle
+from .const import (
+    CONF_CHANGE_EVENT_FIELDS,
+    CONF_CHANGE_EVENTS,
+    CONF_HEDGE_REQUESTS,
+    CONF_JOURNAL,
+    CONF_KEEP_ALL_FIELDS,
+    CONF_DEPARTURE_TIME,
+    CONF_PRICE_ENTITY,
+    CONF_PREWAKE,
+    CONF_PUSH,
+    CONF_SOLAR_EXPORT_ENTITY,
+    DEFAULT_DEPARTURE_TIME,
+    DOMAIN,
+    LOGGER,
+)
 from .coordinator import TeslaFiCoordinator
+from .services import async_setup_services
+from .transport import async_get_transport
+
+if TYPE_CHECKING:
+    from .journal import TeslaFiJournal
 
 PLATFORMS: list[Platform] = [
     Platform.ALARM_CONTROL_PANEL,
@@ -30,13 +53,26 @@ PLATFORMS: list[Platform] = [
     Platform.UPDATE,
 ]
 
+# Platforms that only apply to vehicles reporting at least one of these fields.
+# Unlisted platforms are always set up.
+PLATFORM_FIELDS: dict[Platform, tuple[str, ...]] = {
+    Platform.ALARM_CONTROL_PANEL: ("sentry_mode",),
+    Platform.CLIMATE: ("is_climate_on",),
+    Platform.COVER: ("charge_port_door_open",),
+    Platform.DEVICE_TRACKER: ("latitude", "longitude"),
+    Platform.LOCK: ("locked",),
+    Platform.NUMBER: ("charge_limit_soc", "charge_current_request"),
+    Platform.SWITCH: ("steering_wheel_heater", "charging_state"),
+    Platform.UPDATE: ("car_version",),
+}
+
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the integration."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][HTTP_CLIENT] = create_async_httpx_client(hass)
+    async_setup_services(hass)
     return True
 
 
@@ -45,38 +81,140 @@ async def async_setup_entry(
     entry: ConfigEntry,
 ) -> bool:
     """Set up from a config entry."""
-    http_client = hass.data[DOMAIN][HTTP_CLIENT]
-    client = TeslaFiClient(entry.data[CONF_API_KEY], http_client)
-    coordinator = TeslaFiCoordinator(hass, client)
+    # The shared transport is closed once the last entry has unloaded,
+    # including entries whose setup failed.
+    transport = async_get_transport(hass)
+    http_client = transport.acquire()
+    entry.async_on_unload(partial(transport.async_release, hass))
+    client = TeslaFiClient(
+        entry.data[CONF_API_KEY],
+        http_client,
+        hedge=entry.options.get(CONF_HEDGE_REQUESTS, False),
+    )
+    # Optional features are only imported when enabled
+    journal = None
+    if entry.options.get(CONF_JOURNAL):
+        journal = _journal(hass, entry)
+        await hass.async_add_executor_job(journal.open)
+
+        async def _async_close_journal() -> None:
+            await hass.async_add_executor_job(journal.close)
+
+        entry.async_on_unload(_async_close_journal)
+    coordinator = TeslaFiCoordinator(
+        hass,
+        client,
+        keep_all_fields=entry.options.get(CONF_KEEP_ALL_FIELDS, False),
+        change_events=entry.options.get(CONF_CHANGE_EVENTS, False),
+        change_event_fields=entry.options.get(CONF_CHANGE_EVENT_FIELDS, ()),
+        journal=journal,
+    )
     hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
+    if coordinator.change_events:
+        entry.async_on_unload(coordinator.change_events.async_cancel)
+    if entry.options.get(CONF_PREWAKE):
+        from .prewake import TeslaFiPreWake
+
+        # Before the platforms, which list the learned pre-wakes
+        coordinator.prewake = TeslaFiPreWake(hass, coordinator, entry.entry_id)
+        await coordinator.prewake.async_load()
+        hass.data[DOMAIN][entry.entry_id]["prewake"] = coordinator.prewake
 
     await coordinator.async_config_entry_first_refresh()
     # VIN is the one thing vital for all entities.
     assert coordinator.data.vin
 
+    # Platform modules are only imported when forwarded, so skipping the ones
+    # this vehicle has no data for also skips importing them.
+    platforms = _supported_platforms(coordinator.data)
+    LOGGER.debug("Setting up platforms: %s", platforms)
+    hass.data[DOMAIN][entry.entry_id]["platforms"] = platforms
     await hass.config_entries.async_forward_entry_setups(
         entry,
-        PLATFORMS,
+        platforms,
     )
     # Everything succeeded, now tell the listeners to update their states
     coordinator.async_update_listeners()
+    entry.async_on_unload(coordinator.degradation.async_start())
+    # Sensors exist now, so a downtime found by the first refresh can be backfilled
+    entry.async_create_background_task(
+        hass, coordinator.async_backfill(), "teslafi backfill"
+    )
+    if coordinator.prewake:
+        entry.async_on_unload(coordinator.prewake.async_start())
+    if entry.options.get(CONF_PUSH):
+        from .push import async_setup_push
+
+        async_setup_push(hass, entry, coordinator)
+    if export_entity := entry.options.get(CONF_SOLAR_EXPORT_ENTITY):
+        if entry.options.get(CONF_PRICE_ENTITY):
+            # Both would start and stop charging: the schedule wins
+            LOGGER.warning("Solar charging is disabled while the scheduler is on")
+        else:
+            from .solar import TeslaFiSolarController
+
+            solar = TeslaFiSolarController(hass, coordinator, export_entity)
+            entry.async_on_unload(solar.async_start())
+    if price_entity := entry.options.get(CONF_PRICE_ENTITY):
+        from .scheduler import TeslaFiChargeScheduler
+
+        departure = dt_util.parse_time(
+            entry.options.get(CONF_DEPARTURE_TIME, DEFAULT_DEPARTURE_TIME)
+        )
+        scheduler = TeslaFiChargeScheduler(hass, coordinator, price_entity, departure)
+        entry.async_on_unload(scheduler.async_start())
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
 ) -> bool:
     """Unload a config entry."""
+    platforms = hass.data[DOMAIN][entry.entry_id].get("platforms", PLATFORMS)
     if unload_ok := await hass.config_entries.async_unload_platforms(
         entry,
-        PLATFORMS,
+        platforms,
     ):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the data stored for a removed config entry."""
+    from .precondition import async_remove_preconditioning
+    from .prewake import async_remove_prewake
+
+    await hass.async_add_executor_job(_journal(hass, entry).remove)
+    await async_remove_prewake(hass, entry.entry_id)
+    await async_remove_preconditioning(hass, entry.entry_id)
+
+
+def _journal(hass: HomeAssistant, entry: ConfigEntry) -> TeslaFiJournal:
+    from .journal import TeslaFiJournal
+
+    return TeslaFiJournal(
+        hass.config.path(STORAGE_DIR, DOMAIN, f"{entry.entry_id}.journal")
+    )
+
+
+def _supported_platforms(vehicle: TeslaFiVehicle) -> list[Platform]:
+    """The platforms that apply to a vehicle, based on the fields it reports."""
+    return [
+        platform
+        for platform in PLATFORMS
+        if (fields := PLATFORM_FIELDS.get(platform)) is None
+        or any(field in vehicle for field in fields)
+    ]
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -159,13 +297,17 @@ async def async_migrate_entry(
                 config_entry.entry_id,
             )
 
+            transport = async_get_transport(hass)
             client = TeslaFiClient(
                 config_entry.data[CONF_API_KEY],
-                hass.data[DOMAIN][HTTP_CLIENT],
+                transport.acquire(),
             )
             coordinator = TeslaFiCoordinator(hass, client)
 
-            await coordinator.async_config_entry_first_refresh()
+            try:
+                await coordinator.async_config_entry_first_refresh()
+            finally:
+                await transport.async_release(hass)
             current = config_entry.version = 3
             hass.config_entries.async_update_entry(
                 config_entry,
@@ -18,7 +18,7 @@ from .coordinator import TeslaFiCoordinator
 from .util import _convert_to_bool
 
 
-@dataclass
+@dataclass(frozen=True, kw_only=True, slots=True)
 class TeslaFiSentryEntityDescription(
     AlarmControlPanelEntityDescription,
     TeslaFiBaseEntityDescription,
@@ -152,6 +152,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiSentryEntity] = []
     entities.extend(
-        [TeslaFiSentryEntity(coordinator, description) for description in ALARMS]
+        [
+            TeslaFiSentryEntity(coordinator, description)
+            for description in ALARMS
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
@@ -2,27 +2,20 @@
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from numbers import Number
-from typing import Generic, TypeVar, cast
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Generic, TypeVar, cast
 from typing_extensions import override
-from homeassistant.components.binary_sensor import BinarySensorEntityDescription
-from homeassistant.components.button import ButtonEntityDescription
-from homeassistant.components.climate import ClimateEntityDescription
-from homeassistant.components.cover import CoverEntityDescription
-from homeassistant.components.lock import LockEntityDescription
-from homeassistant.components.number import NumberEntityDescription
-from homeassistant.components.sensor import SensorEntityDescription
-from homeassistant.components.switch import SwitchEntityDescription
-from homeassistant.components.update import UpdateEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .client import TeslaFiVehicle
-from .const import ATTRIBUTION, DOMAIN, LOGGER, MANUFACTURER
+from .const import ATTR_VALUE_UPDATED, ATTRIBUTION, LOGGER
 from .coordinator import TeslaFiCoordinator
-from .util import _convert_to_bool
+from .plan import TeslaFiEvaluation
+from .util import _FieldGetter, _identity, _is_significant
 
 
 _BaseEntityDescriptionT = TypeVar(
@@ -43,18 +36,7 @@ class TeslaFiBaseEntity(CoordinatorEntity[TeslaFiCoordinator]):
 
     @property
     def device_info(self) -> DeviceInfo:
-        car = self.coordinator.data
-        return DeviceInfo(
-            identifiers={(DOMAIN, car.vin)},
-            configuration_url="https://www.teslafi.com/",
-            manufacturer=MANUFACTURER,
-            model=car.car_type,
-            name=car.name,
-            sw_version=car.firmware_version,
-            # TODO: model year, trim? Convert car_type to sentence case?
-            hw_version=f"{car.model_year} {car.car_type or 'Tesla'}",
-            suggested_area="Garage",
-        )
+        return self.coordinator.identity.device_info
 
 
 class TeslaFiEntity(TeslaFiBaseEntity, Generic[_BaseEntityDescriptionT]):
@@ -62,18 +44,117 @@ class TeslaFiEntity(TeslaFiBaseEntity, Generic[_BaseEntityDescriptionT]):
 
     entity_description: _BaseEntityDescriptionT
 
+    _written: tuple[bool, StateType] | None = None
+    """(available, value) as of the last state write that passed the deadband."""
+    _written_at: float = 0.0
+    _dispatched: dict[str, Any] | None = None
+    """Extra state attributes as of the last state write from a coordinator update."""
+    _has_dispatched: bool = False
+
     def __init__(
         self,
         coordinator: TeslaFiCoordinator,
         entity_description: _BaseEntityDescriptionT,
     ) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.data.vin}-{entity_description.key}"
+        self._attr_unique_id = coordinator.identity.unique_id(entity_description.key)
         self.entity_description = entity_description
 
+    @callback
+    @override
+    def _handle_coordinator_update(self) -> None:
+        if self._is_unchanged():
+            return
+        if self._is_significant_update(self._get_value()):
+            self._write_coordinator_update()
+
+    @callback
+    def _write_coordinator_update(self) -> None:
+        """Write the state for a coordinator update that passed the checks."""
+        super()._handle_coordinator_update()
+        self._dispatched = self.extra_state_attributes
+        self._has_dispatched = True
+
+    @callback
+    @override
+    def async_write_ha_state(self) -> None:
+        # Any other write (e.g. an optimistic state) must not be skipped over
+        self._has_dispatched = False
+        super().async_write_ha_state()
+
+    def _is_unchanged(self) -> bool:
+        """Whether nothing shown by this entity changed since its last update write."""
+        if not self._has_dispatched:
+            return False
+        if self.coordinator.reevaluated(self.entity_description):
+            return False
+        return self.extra_state_attributes == self._dispatched
+
+    def _is_significant_update(self, value: StateType) -> bool:
+        """Apply the description's deadbands and minimum write interval to `value`."""
+        description = self.entity_description
+        if (
+            description.deadband is None
+            and description.deadband_relative is None
+            and description.min_write_interval is None
+        ):
+            return True
+
+        available = self.available
+        now = monotonic()
+        if self._written is not None and self._written[0] == available:
+            if not _is_significant(
+                self._written[1],
+                value,
+                description.deadband,
+                description.deadband_relative,
+            ):
+                return False
+            if (interval := description.min_write_interval) and (
+                now - self._written_at < interval.total_seconds()
+            ):
+                return False
+
+        self._written = (available, value)
+        self._written_at = now
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_register_description(self.entity_description)
+        )
+
+    @property
+    def value_updated(self) -> datetime | None:
+        """When the oldest field backing this entity was last refreshed."""
+        if not (fields := self.entity_description.fields):
+            return None
+        data = self.coordinator.data
+        times = [t for f in fields if (t := data.field_updated(f))]
+        return min(times) if times else None
+
+    @property
+    @override
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        # Only expose the age while the value is carried over from older data,
+        # so that fresh values do not write a new attribute on every refresh.
+        updated = self.value_updated
+        merged = self.coordinator.data.last_merged
+        if updated and merged and updated < merged:
+            return {ATTR_VALUE_UPDATED: updated.isoformat()}
+        return None
+
+    @property
+    def _evaluation(self) -> TeslaFiEvaluation | None:
+        """This entity's result from the coordinator's evaluation plan, if any."""
+        return self.coordinator.evaluation(self.entity_description)
+
     @property
     @override
     def available(self) -> bool:
+        if (result := self._evaluation) is not None:
+            return result.available
         if self.entity_description.available:
             return self.entity_description.available(
                 super().available,
@@ -83,131 +164,60 @@ class TeslaFiEntity(TeslaFiBaseEntity, Generic[_BaseEntityDescriptionT]):
         return super().available
 
     def _get_value(self) -> StateType:
+        if (result := self._evaluation) is not None:
+            return result.value
+        # Not part of the evaluation plan yet (e.g. while being added)
         LOGGER.debug("getting value for %s", self.entity_description.key)
-        upstream = self.entity_description.value(self.coordinator.data, self.hass)
+        if derived := self.entity_description.coordinator_value:
+            upstream = derived(self.coordinator)
+        else:
+            upstream = self.entity_description.value(self.coordinator.data, self.hass)
         converted = self.entity_description.convert(upstream)
         return cast(StateType, converted)
 
 
-@dataclass
+@dataclass(frozen=True, kw_only=True)
 class TeslaFiBaseEntityDescription(EntityDescription):
-    """Base TeslaFi EntityDescription"""
+    """
+    Base TeslaFi EntityDescription.
+
+    Descriptions are frozen and shared by every config entry. This base class
+    cannot use slots: HA copies the annotations of its own description classes
+    into ours, which only works while inherited defaults stay class attributes.
+    """
 
     has_entity_name = True
     value: Callable[[TeslaFiVehicle, HomeAssistant], any] = None
     """Callable to obtain the value. Defaults to `data[key]`."""
     available: Callable[[bool, TeslaFiVehicle, HomeAssistant], bool] = None
     """Optional Callable to determine if the entity is available."""
-    convert: Callable[[any], any] = lambda u: u
+    convert: Callable[[any], any] = _identity
     """Optional Callable to convert the upstream value."""
+    coordinator_value: Callable[[TeslaFiCoordinator], any] = None
+    """
+    Optional Callable to obtain a value derived by the coordinator
+    (e.g. analytics), instead of from the vehicle data.
+    """
+    deadband: float = None
+    """Skip state writes while a numeric value moved less than this."""
+    deadband_relative: float = None
+    """Skip state writes while a numeric value moved less than this fraction."""
+    min_write_interval: timedelta = None
+    """Minimum time between state writes for value changes."""
+    fields: tuple[str, ...] = None
+    """
+    Raw fields read by this entity (value, availability, units...).
+    Defaults to `(key,)` when no Callables are given; None if unknown.
+    The first field is the primary one: vehicles that do not report it
+    do not get this entity at all.
+    """
 
     def __post_init__(self):
         # Needs to be in post-init to reference self.key
+        if self.fields is None:
+            if self.coordinator_value:
+                object.__setattr__(self, "fields", ())
+            elif not self.value and not self.available:
+                object.__setattr__(self, "fields", (self.key,))
         if not self.value:
-            self.value = lambda data, hass: data.get(self.key)
-
-
-@dataclass(slots=True)
-class TeslaFiButtonEntityDescription(
-    ButtonEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Button EntityDescription"""
-
-    teslafi_cmd: str = None
-    """The command to send to TeslaFi on button press."""
-
-
-@dataclass
-class TeslaFiClimateEntityDescription(
-    ClimateEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Climate EntityDescription"""
-
-
-@dataclass
-class TeslaFiCoverEntityDescription(
-    CoverEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Cover"""
-
-    value: Callable[[TeslaFiVehicle, HomeAssistant], bool] = None
-    convert: Callable[[any], bool] = _convert_to_bool
-    cmd: Callable[[TeslaFiCoordinator, bool], dict] = None
-
-
-@dataclass
-class TeslaFiSensorEntityDescription(
-    SensorEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Sensor EntityDescription"""
-
-    icons: dict[str, str] = None
-    """Dictionary of state -> icon"""
-
-    fix_unit: Callable[[TeslaFiVehicle, HomeAssistant], str] = lambda d, h: None
-    """Convert the native unit of measurement. Return None to keep the original unit."""
-
-
-@dataclass
-class TeslaFiNumberEntityDescription(
-    NumberEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Number EntityDescription"""
-
-    convert: Callable[[any], int] = lambda v: int(v) if v else None
-    cmd: Callable[[TeslaFiCoordinator, Number], dict] = None
-
-    max_value_key: str = None
-    """
-    If specified, look up this key for the max value,
-    otherwise fall back to max_value.
-    """
-
-
-@dataclass(slots=True)
-class TeslaFiSwitchEntityDescription(
-    SwitchEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Switch EntityDescription"""
-
-    cmd: Callable[[TeslaFiCoordinator, bool], bool] = None
-    """The command to send to TeslaFi on toggle."""
-
-    convert: Callable[[any], bool] = _convert_to_bool
-
-
-@dataclass
-class TeslaFiUpdateEntityDescription(
-    UpdateEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """A class that describes update entities."""
-
-
-@dataclass
-class TeslaFiLockEntityDescription(
-    LockEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi Lock EntityDescription"""
-
-
-@dataclass
-class TeslaFiBinarySensorEntityDescription(
-    BinarySensorEntityDescription,
-    TeslaFiBaseEntityDescription,
-):
-    """TeslaFi BinarySensor EntityDescription"""
-
-    # Redefine return type from TFBED
-    value: Callable[[TeslaFiVehicle, HomeAssistant], bool] = None
-    icons: list[str] = None
-    """List of icons for `[0]=off`, `[1]=on`"""
-
-    convert: Callable[[any], bool] = _convert_to_bool
+            object.__setattr__(self, "value", _FieldGetter(self.key))
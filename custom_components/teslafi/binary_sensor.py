@@ -1,20 +1,41 @@
 """TeslaFi Binary Sensors"""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
+    BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiBinarySensorEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
+from .catalog import CATALOG
 from .const import DOMAIN
 from .coordinator import TeslaFiCoordinator
+from .model import CHARGING_FIELDS, GEAR_FIELDS, TeslaFiVehicle
 from .util import _convert_to_bool
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiBinarySensorEntityDescription(
+    BinarySensorEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi BinarySensor EntityDescription"""
+
+    # Redefine return type from TFBED
+    value: Callable[[TeslaFiVehicle, HomeAssistant], bool] = None
+    icons: list[str] = None
+    """List of icons for `[0]=off`, `[1]=on`"""
+
+    convert: Callable[[any], bool] = _convert_to_bool
+
+
 SENSORS = [
     # region Charging
     TeslaFiBinarySensorEntityDescription(
@@ -25,6 +46,7 @@ SENSORS = [
         device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda d, h: d.is_charging,
+        fields=CHARGING_FIELDS,
     ),
     TeslaFiBinarySensorEntityDescription(
         key="_is_plugged_in",
@@ -33,6 +55,7 @@ SENSORS = [
         device_class=BinarySensorDeviceClass.PLUG,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda d, h: d.is_plugged_in,
+        fields=CHARGING_FIELDS,
     ),
     # endregion
     # region Non-controllable openings
@@ -99,6 +122,44 @@ SENSORS = [
         device_class=BinarySensorDeviceClass.OPENING,
     ),
     # endregion
+    # region TPMS
+    TeslaFiBinarySensorEntityDescription(
+        key="_tpms_leak_front_left",
+        name="TPMS Leak Front Left",
+        icon="mdi:car-tire-alert",
+        entity_registry_enabled_default=False,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        coordinator_value=lambda c: c.tpms_leaks.is_leaking("front_left"),
+    ),
+    TeslaFiBinarySensorEntityDescription(
+        key="_tpms_leak_front_right",
+        name="TPMS Leak Front Right",
+        icon="mdi:car-tire-alert",
+        entity_registry_enabled_default=False,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        coordinator_value=lambda c: c.tpms_leaks.is_leaking("front_right"),
+    ),
+    TeslaFiBinarySensorEntityDescription(
+        key="_tpms_leak_rear_left",
+        name="TPMS Leak Rear Left",
+        icon="mdi:car-tire-alert",
+        entity_registry_enabled_default=False,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        coordinator_value=lambda c: c.tpms_leaks.is_leaking("rear_left"),
+    ),
+    TeslaFiBinarySensorEntityDescription(
+        key="_tpms_leak_rear_right",
+        name="TPMS Leak Rear Right",
+        icon="mdi:car-tire-alert",
+        entity_registry_enabled_default=False,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        coordinator_value=lambda c: c.tpms_leaks.is_leaking("rear_right"),
+    ),
+    # endregion
     # region Others
     TeslaFiBinarySensorEntityDescription(
         key="_is_driving",
@@ -108,6 +169,7 @@ SENSORS = [
         device_class=BinarySensorDeviceClass.MOVING,
         entity_category=EntityCategory.DIAGNOSTIC,
         value=lambda d, h: d.is_in_gear,
+        fields=GEAR_FIELDS,
     ),
     TeslaFiBinarySensorEntityDescription(
         key="is_user_present",
@@ -163,6 +225,19 @@ SENSORS = [
     # endregion
 ]
 
+# Generic binary sensors for the raw fields in the catalog
+CATALOG_SENSORS = [
+    TeslaFiBinarySensorEntityDescription(
+        key=field.key,
+        name=field.name,
+        device_class=field.device_class,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=field.enabled,
+    )
+    for field in CATALOG
+    if field.type is bool
+]
+
 
 class TeslaFiBinarySensor(
     TeslaFiEntity[TeslaFiBinarySensorEntityDescription],
@@ -194,6 +269,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiBinarySensor] = []
     entities.extend(
-        [TeslaFiBinarySensor(coordinator, description) for description in SENSORS]
+        [
+            TeslaFiBinarySensor(coordinator, description)
+            for description in (*SENSORS, *CATALOG_SENSORS)
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
@@ -0,0 +1,29 @@
+"""TeslaFi request budgets"""
+
+from collections import deque
+from datetime import datetime, timedelta
+
+
+class TeslaFiRequestBudget:
+    """
+    At most `limit` requests per sliding `window`. Used for requests the
+    integration sends on its own, so they never add up to API throttling.
+    """
+
+    def __init__(self, limit: int, window: timedelta) -> None:
+        self._limit = limit
+        self._window = window
+        self._times: deque[datetime] = deque()
+
+    def remaining(self, now: datetime) -> int:
+        """Requests still allowed in the current window."""
+        while self._times and now - self._times[0] > self._window:
+            self._times.popleft()
+        return self._limit - len(self._times)
+
+    def try_acquire(self, now: datetime) -> bool:
+        """Spend one request, if the budget allows it."""
+        if self.remaining(now) <= 0:
+            return False
+        self._times.append(now)
+        return True
@@ -1,14 +1,26 @@
 """TeslaFi on-demand action buttons"""
 
+from dataclasses import dataclass
 from datetime import timedelta
-from homeassistant.components.button import ButtonEntity
+from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, LOGGER
 from .coordinator import TeslaFiCoordinator
-from .base import TeslaFiEntity, TeslaFiButtonEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiButtonEntityDescription(
+    ButtonEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Button EntityDescription"""
+
+    teslafi_cmd: str = None
+    """The command to send to TeslaFi on button press."""
 
 
 BUTTONS = [
@@ -18,18 +30,21 @@ BUTTONS = [
         icon="mdi:sleep-off",
         teslafi_cmd="wake_up",
         # available=lambda u, d, h: u and d.is_sleeping, # Needed?
+        fields=(),
     ),
     TeslaFiButtonEntityDescription(
         key="cmd_honk",
         name="Horn",
         icon="mdi:air-horn",
         teslafi_cmd="honk",
+        fields=(),
     ),
     TeslaFiButtonEntityDescription(
         key="cmd_flash_lights",
         name="Flash Lights",
         icon="mdi:car-parking-lights",
         teslafi_cmd="flash_lights",
+        fields=(),
     ),
 ]
 
@@ -44,7 +59,11 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiButton] = []
     entities.extend(
-        [TeslaFiButton(coordinator, description) for description in BUTTONS]
+        [
+            TeslaFiButton(coordinator, description)
+            for description in BUTTONS
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
 
@@ -0,0 +1,136 @@
+"""TeslaFi raw field catalog"""
+
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    DEGREE,
+    PERCENTAGE,
+    UnitOfElectricCurrent,
+    UnitOfLength,
+    UnitOfPower,
+    UnitOfSpeed,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TeslaFiCatalogField:
+    """A raw TeslaFi field exposed as a generic sensor."""
+
+    key: str
+    """The raw TeslaFi field name."""
+    type: type
+    """`float` and `str` become sensors, `bool` becomes a binary sensor."""
+    unit: str | None = None
+    device_class: str | None = None
+    enabled: bool = False
+    """Whether the entity is enabled by default. Most are rarely used."""
+
+    @property
+    def name(self) -> str:
+        return self.key.replace("_", " ").capitalize()
+
+
+# Raw fields without a dedicated entity elsewhere.
+# Catalog entities are generated once per platform module and shared by all
+# config entries. Disabled entities are never added to hass, so they never
+# join the coordinator's evaluation plan and cost nothing per refresh.
+CATALOG: tuple[TeslaFiCatalogField, ...] = (
+    # region Battery
+    TeslaFiCatalogField(
+        "usable_battery_level",
+        float,
+        PERCENTAGE,
+        SensorDeviceClass.BATTERY,
+        enabled=True,
+    ),
+    TeslaFiCatalogField(
+        "est_battery_range",
+        float,
+        UnitOfLength.MILES,
+        SensorDeviceClass.DISTANCE,
+    ),
+    TeslaFiCatalogField(
+        "ideal_battery_range",
+        float,
+        UnitOfLength.MILES,
+        SensorDeviceClass.DISTANCE,
+    ),
+    TeslaFiCatalogField("battery_heater_on", bool, None, BinarySensorDeviceClass.HEAT),
+    TeslaFiCatalogField(
+        "not_enough_power_to_heat", bool, None, BinarySensorDeviceClass.PROBLEM
+    ),
+    # endregion
+    # region Charging
+    TeslaFiCatalogField("charge_rate", float, UnitOfSpeed.MILES_PER_HOUR),
+    TeslaFiCatalogField(
+        "charger_pilot_current",
+        float,
+        UnitOfElectricCurrent.AMPERE,
+        SensorDeviceClass.CURRENT,
+    ),
+    TeslaFiCatalogField("charger_phases", float),
+    TeslaFiCatalogField(
+        "charge_miles_added_rated",
+        float,
+        UnitOfLength.MILES,
+        SensorDeviceClass.DISTANCE,
+    ),
+    TeslaFiCatalogField(
+        "charge_miles_added_ideal",
+        float,
+        UnitOfLength.MILES,
+        SensorDeviceClass.DISTANCE,
+    ),
+    TeslaFiCatalogField(
+        "minutes_to_full_charge",
+        float,
+        UnitOfTime.MINUTES,
+        SensorDeviceClass.DURATION,
+    ),
+    TeslaFiCatalogField("charge_limit_soc_std", float, PERCENTAGE),
+    TeslaFiCatalogField("max_range_charge_counter", float),
+    TeslaFiCatalogField("charge_port_latch", str),
+    TeslaFiCatalogField("conn_charge_cable", str),
+    TeslaFiCatalogField("fast_charger_type", str),
+    TeslaFiCatalogField("fast_charger_brand", str),
+    TeslaFiCatalogField("charge_enable_request", bool),
+    TeslaFiCatalogField("charge_to_max_range", bool),
+    TeslaFiCatalogField("scheduled_charging_pending", bool),
+    TeslaFiCatalogField("managed_charging_active", bool),
+    TeslaFiCatalogField("trip_charging", bool),
+    TeslaFiCatalogField("charge_port_cold_weather_mode", bool),
+    # endregion
+    # region Driving
+    TeslaFiCatalogField("power", float, UnitOfPower.KILO_WATT, SensorDeviceClass.POWER),
+    TeslaFiCatalogField("heading", float, DEGREE),
+    TeslaFiCatalogField("location", str),
+    # endregion
+    # region Climate
+    TeslaFiCatalogField(
+        "passenger_temp_setting",
+        float,
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+    ),
+    TeslaFiCatalogField("seat_heater_left", float),
+    TeslaFiCatalogField("seat_heater_right", float),
+    TeslaFiCatalogField("seat_heater_rear_left", float),
+    TeslaFiCatalogField("seat_heater_rear_center", float),
+    TeslaFiCatalogField("seat_heater_rear_right", float),
+    TeslaFiCatalogField("is_preconditioning", bool),
+    TeslaFiCatalogField("is_auto_conditioning_on", bool),
+    TeslaFiCatalogField("side_mirror_heaters", bool),
+    TeslaFiCatalogField("wiper_blade_heater", bool),
+    # endregion
+    # region Vehicle
+    TeslaFiCatalogField("sun_roof_percent_open", float, PERCENTAGE),
+    TeslaFiCatalogField("center_display_state", float),
+    TeslaFiCatalogField("remote_start", bool),
+    TeslaFiCatalogField("gui_distance_units", str),
+    TeslaFiCatalogField("gui_temperature_units", str),
+    # endregion
+)
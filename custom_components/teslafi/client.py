@@ -1,13 +1,18 @@
 """TeslaFi API Client"""
 
+import asyncio
+from collections.abc import Awaitable, Callable, Collection
+from functools import partial
 from json import JSONDecodeError
-from httpx import AsyncClient, Response
+from time import monotonic
+from httpx import AsyncClient, ReadTimeout, Response, Timeout
 import logging
 
+from .const import HTTP_CONNECT_TIMEOUT
 from .errors import TeslaFiApiError, VehicleNotReadyError
+from .latency import LATENCY_COMMAND, TeslaFiLatencyTracker, latency_class
 from .model import TeslaFiVehicle
 
-REQUEST_TIMEOUT = 5
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -16,31 +21,44 @@ class TeslaFiClient:
 
     _api_key: str
     _client: AsyncClient
+    latency: TeslaFiLatencyTracker
 
     def __init__(
         self,
         api_key: str,
         client: AsyncClient,
+        hedge: bool = False,
     ) -> None:
         """
         Creates a new TeslaFi API Client.
 
         :param api_key: API Key can be obtained from https://www.teslafi.com/api.php
+        :param hedge: Whether reads (the feed and `lastGood`) are hedged: a slow
+            request is raced against a second, identical one.
         """
         self._api_key = api_key
         self._client = client
+        self._hedge = hedge
+        self.latency = TeslaFiLatencyTracker()
 
-    async def last_good(self) -> TeslaFiVehicle:
+    async def last_good(self, fields: Collection[str] | None = None) -> TeslaFiVehicle:
         """
         Return last data point with charge data
+
+        :param fields: If given, only these fields are kept from the response.
         """
-        return TeslaFiVehicle(await self._request("lastGood"))
+        return TeslaFiVehicle(_select(await self._request("lastGood"), fields))
 
-    async def current_data(self) -> TeslaFiVehicle:
+    async def current_data(
+        self,
+        fields: Collection[str] | None = None,
+    ) -> TeslaFiVehicle:
         """
         Return last data point with charge data
+
+        :param fields: If given, only these fields are kept from the response.
         """
-        return TeslaFiVehicle(await self._request(""))
+        return TeslaFiVehicle(_select(await self._request(""), fields))
 
     async def command(self, cmd: str, **kwargs) -> dict:
         """
@@ -54,13 +72,12 @@ class TeslaFiClient:
         :param command: The command to send. Can be empty string, `lastGood`, etc. See
         """
         _LOGGER.debug(">> executing command %s; args=%s", command, kwargs)
-        timeout = kwargs.get("wake", 0) + REQUEST_TIMEOUT
-        response: Response = await self._client.get(
-            url="https://www.teslafi.com/feed.php",
-            headers={"Authorization": "Bearer " + self._api_key},
-            params={"command": command} | kwargs,
-            timeout=timeout,
-        )
+        cls = latency_class(command)
+        request = partial(self._get, command, cls, kwargs)
+        if self._hedge and cls != LATENCY_COMMAND and not kwargs.get("wake"):
+            response = await self._hedged(request, cls)
+        else:
+            response = await request()
         _LOGGER.debug(
             "<< command %s response[%d]: %s",
             command,
@@ -96,3 +113,66 @@ class TeslaFiClient:
                 raise TeslaFiApiError(msg)
 
         return data
+
+    async def _get(self, command: str, cls: str, params: dict) -> Response:
+        """Send one request, with a read timeout adapted to recent latencies."""
+        wake = params.get("wake", 0)
+        read = self.latency.timeout(cls)
+        start = monotonic()
+        try:
+            response = await self._client.get(
+                url="https://www.teslafi.com/feed.php",
+                headers={"Authorization": "Bearer " + self._api_key},
+                params={"command": command} | params,
+                timeout=Timeout(
+                    wake + read,
+                    connect=HTTP_CONNECT_TIMEOUT.total_seconds(),
+                ),
+            )
+        except ReadTimeout:
+            if not wake:
+                self.latency.record(cls, read)
+            raise
+        # Waking the car says nothing about the network
+        if not wake:
+            self.latency.record(cls, monotonic() - start)
+        return response
+
+    async def _hedged(
+        self,
+        request: Callable[[], Awaitable[Response]],
+        cls: str,
+    ) -> Response:
+        """
+        Send a second request if the first one is slower than usual.
+        The first successful response wins and the other request is cancelled.
+        """
+        if (delay := self.latency.hedge_delay(cls)) is None:
+            return await request()
+        first = asyncio.ensure_future(request())
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            _LOGGER.debug("Hedging %s request after %.2f s", cls, delay)
+            pending.add(asyncio.ensure_future(request()))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Both failed: report the original request's error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _select(data: dict, fields: Collection[str] | None) -> dict:
+    """Only the `fields` of a decoded response, so the rest can be freed early."""
+    if fields is None:
+        return data
+    return {k: v for (k, v) in data.items() if k in fields}
@@ -1,11 +1,14 @@
 """TeslaFi Climate controls"""
 
+from dataclasses import dataclass
+
 from homeassistant.components.climate import (
     FAN_AUTO,
     FAN_OFF,
     PRESET_NONE,
     PRESET_BOOST,
     ClimateEntity,
+    ClimateEntityDescription,
     ClimateEntityFeature,
     HVACMode,
 )
@@ -16,19 +19,46 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.unit_conversion import TemperatureConverter
 
 from .coordinator import TeslaFiCoordinator
-from .base import (
-    TeslaFiBinarySensorEntityDescription,
-    TeslaFiClimateEntityDescription,
-    TeslaFiEntity,
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
+from .const import (
+    CLIMATE_TEMP_DEADBAND,
+    DELAY_CLIMATE,
+    DELAY_WAKEUP,
+    DOMAIN,
+    LOGGER,
 )
-from .const import DELAY_CLIMATE, DELAY_WAKEUP, DOMAIN, LOGGER
-from .util import _convert_to_bool
+from .model import CLIMATE_FIELDS
+from .util import _FieldGetter, _convert_to_bool, _number_or_none
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiClimateEntityDescription(
+    ClimateEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Climate EntityDescription"""
+
 
 CLIMATES = [
     TeslaFiClimateEntityDescription(
         key="climate",
         name="Climate",
         entity_registry_enabled_default=False,
+        # The deadband applies to the current temperature
+        value=_FieldGetter("inside_temp"),
+        convert=_number_or_none,
+        deadband=CLIMATE_TEMP_DEADBAND,
+        fields=(
+            *CLIMATE_FIELDS,
+            "driver_temp_setting",
+            "inside_temp",
+            "fan_status",
+            "climate_keeper_mode",
+            "is_front_defroster_on",
+            "is_rear_defroster_on",
+            "defrost_mode",
+            "temperature",
+        ),
     ),
 ]
 
@@ -48,7 +78,11 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiClimate] = []
     entities.extend(
-        [TeslaFiClimate(coordinator, description) for description in CLIMATES]
+        [
+            TeslaFiClimate(coordinator, description)
+            for description in CLIMATES
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
 
@@ -70,6 +104,7 @@ class TeslaFiClimate(TeslaFiEntity[TeslaFiClimateEntityDescription], ClimateEnti
     _attr_preset_modes = [PRESET_NONE, PRESET_BOOST]
 
     # FIXME: why isn't this inherited?
+    _attr_fan_mode = None
     _attr_hvac_action = None
     _attr_hvac_mode = None
     _attr_preset_mode = None
@@ -77,15 +112,18 @@ class TeslaFiClimate(TeslaFiEntity[TeslaFiClimateEntityDescription], ClimateEnti
     _pending_mode = None
 
     def _handle_coordinator_update(self) -> None:
+        if self._is_unchanged():
+            return
+        shown = self._shown()
         # These are in Celsius, despite user settings
         self._attr_target_temperature = (
             float(temp)
             if (temp := self.coordinator.data.get("driver_temp_setting"))
             else None
         )
-        self._attr_current_temperature = (
-            float(temp) if (temp := self.coordinator.data.get("inside_temp")) else None
-        )
+        current = self._get_value()
+        if significant := self._is_significant_update(current):
+            self._attr_current_temperature = current
 
         is_on = self.coordinator.data.is_climate_on
 
@@ -130,7 +168,18 @@ class TeslaFiClimate(TeslaFiEntity[TeslaFiClimateEntityDescription], ClimateEnti
         # TODO others: side_mirror_heaters, wiper_blade_heater, steering_wheel_heater,
         #  not_enough_power_to_heat (cannot turn on heater because battery low...)
 
-        return super()._handle_coordinator_update()
+        if significant or self._shown() != shown:
+            self._write_coordinator_update()
+
+    def _shown(self) -> tuple:
+        """The state shown by this entity, except the current temperature."""
+        return (
+            self._attr_target_temperature,
+            self._attr_hvac_mode,
+            self._attr_fan_mode,
+            self._attr_hvac_action,
+            self._attr_preset_mode,
+        )
 
     def _refresh_soon(self):
         if self.coordinator.data.is_sleeping:
@@ -200,17 +249,13 @@ class TeslaFiClimate(TeslaFiEntity[TeslaFiClimateEntityDescription], ClimateEnti
         LOGGER.debug("set_temperature: %s", kwargs)
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature:
-            # TeslaFi expects temp in configured units:
-            #  (settings > account > measurements)
+            # TeslaFi expects temp in configured units,
             # but we originally reported it in C
-            # So if the TeslaFi API reports F is preferred,
-            # we have to convert it before sending.
-            if self.coordinator.data.get("temperature", "C") == "F":
-                temperature = TemperatureConverter.convert(
-                    temperature,
-                    from_unit=UnitOfTemperature.CELSIUS,
-                    to_unit=UnitOfTemperature.FAHRENHEIT,
-                )
+            temperature = TemperatureConverter.convert(
+                temperature,
+                from_unit=UnitOfTemperature.CELSIUS,
+                to_unit=self.coordinator.data.temperature_unit,
+            )
             await self.coordinator.execute_command("set_temps", temp=temperature)
             self.async_write_ha_state()
             self._refresh_soon()
@@ -8,12 +8,35 @@ import httpx
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_API_KEY
+from homeassistant.components import webhook
+from homeassistant.const import CONF_API_KEY, CONF_WEBHOOK_ID
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    SelectSelector,
+    SelectSelectorConfig,
+    TimeSelector,
+)
 
 from .client import TeslaFiClient
-from .const import DOMAIN
+from .const import (
+    CONF_CHANGE_EVENT_FIELDS,
+    CONF_CHANGE_EVENTS,
+    CONF_HEDGE_REQUESTS,
+    CONF_JOURNAL,
+    CONF_KEEP_ALL_FIELDS,
+    CONF_DEPARTURE_TIME,
+    CONF_PRICE_ENTITY,
+    CONF_PREWAKE,
+    CONF_PUSH,
+    CONF_SOLAR_EXPORT_ENTITY,
+    DEFAULT_DEPARTURE_TIME,
+    DOMAIN,
+)
+from .transport import async_get_transport
 
 STEP_AUTH_SCHEMA = vol.Schema(
     {
@@ -33,6 +56,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._client = None
         super().__init__()
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -58,8 +89,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     async def _async_auth_or_validate(self, user_input, errors):
-        http_client = get_async_client(self.hass)
-        self._client = TeslaFiClient(user_input[CONF_API_KEY], http_client)
+        transport = async_get_transport(self.hass)
+        self._client = TeslaFiClient(user_input[CONF_API_KEY], transport.acquire())
         try:
             result = await self._client.last_good()
         except httpx.HTTPStatusError as ex:
@@ -73,6 +104,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._client = None
             errors["base"] = "cannot_connect"
             return None
+        finally:
+            # Closes the transport, unless an entry is using it
+            await transport.async_release(self.hass)
         if not result:
             self._client = None
             errors["base"] = "cannot_connect"
@@ -81,3 +115,99 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "title": result.name,
             "id": result.vin,
         }
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle TeslaFi options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            # Keep the webhook across toggles, so the relay's URL stays valid
+            webhook_id = self.config_entry.options.get(CONF_WEBHOOK_ID)
+            if user_input.get(CONF_PUSH) and not webhook_id:
+                webhook_id = webhook.async_generate_id()
+            if webhook_id:
+                user_input[CONF_WEBHOOK_ID] = webhook_id
+            return self.async_create_entry(data=user_input)
+
+        # Suggest the fields the vehicle currently reports
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        vehicle = entry_data["coordinator"].data if entry_data else None
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_KEEP_ALL_FIELDS,
+                        default=self.config_entry.options.get(
+                            CONF_KEEP_ALL_FIELDS, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HEDGE_REQUESTS,
+                        default=self.config_entry.options.get(
+                            CONF_HEDGE_REQUESTS, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUSH,
+                        default=self.config_entry.options.get(CONF_PUSH, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CHANGE_EVENTS,
+                        default=self.config_entry.options.get(
+                            CONF_CHANGE_EVENTS, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CHANGE_EVENT_FIELDS,
+                        default=self.config_entry.options.get(
+                            CONF_CHANGE_EVENT_FIELDS, []
+                        ),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=sorted(vehicle or ()),
+                            multiple=True,
+                            custom_value=True,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_SOLAR_EXPORT_ENTITY,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_SOLAR_EXPORT_ENTITY
+                            )
+                        },
+                    ): EntitySelector(
+                        EntitySelectorConfig(
+                            domain="sensor", device_class=SensorDeviceClass.POWER
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_PRICE_ENTITY,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_PRICE_ENTITY
+                            )
+                        },
+                    ): EntitySelector(EntitySelectorConfig(domain="sensor")),
+                    vol.Optional(
+                        CONF_DEPARTURE_TIME,
+                        default=self.config_entry.options.get(
+                            CONF_DEPARTURE_TIME, DEFAULT_DEPARTURE_TIME
+                        ),
+                    ): TimeSelector(),
+                    vol.Optional(
+                        CONF_PREWAKE,
+                        default=self.config_entry.options.get(CONF_PREWAKE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_JOURNAL,
+                        default=self.config_entry.options.get(CONF_JOURNAL, False),
+                    ): bool,
+                }
+            ),
+        )
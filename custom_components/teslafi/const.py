@@ -6,6 +6,35 @@ import logging
 
 
 HTTP_CLIENT = "client.http"
+# Separate connect and read timeouts; commands that wake the car extend the read
+HTTP_CONNECT_TIMEOUT = timedelta(seconds=5)
+HTTP_READ_TIMEOUT = timedelta(seconds=5)
+# Idle connections outlive the fastest polling interval, so polls reuse them
+HTTP_KEEPALIVE_EXPIRY = timedelta(minutes=2)
+# The pool is shared by all entries, including ones added later. Idle connections
+# expire, so the limits only bound bursts (e.g. every vehicle's poll at once).
+HTTP_MAX_CONNECTIONS = 10
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 5
+# Once enough latencies are known, the read timeout is a high quantile of them
+# times a safety factor, within these bounds
+HTTP_READ_TIMEOUT_MIN = timedelta(seconds=2)
+HTTP_READ_TIMEOUT_MAX = timedelta(seconds=15)
+LATENCY_WINDOW = 50
+LATENCY_MIN_SAMPLES = 10
+LATENCY_TIMEOUT_QUANTILE = 0.99
+LATENCY_TIMEOUT_FACTOR = 2.0
+# Hedged reads send a second request once the first is slower than this quantile
+LATENCY_HEDGE_QUANTILE = 0.95
+CONF_CHANGE_EVENTS = "change_events"
+CONF_CHANGE_EVENT_FIELDS = "change_event_fields"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_KEEP_ALL_FIELDS = "keep_all_fields"
+CONF_PUSH = "push"
+CONF_SOLAR_EXPORT_ENTITY = "solar_export_entity"
+CONF_PRICE_ENTITY = "price_entity"
+CONF_DEPARTURE_TIME = "departure_time"
+CONF_PREWAKE = "prewake"
+CONF_JOURNAL = "journal"
 DOMAIN = "teslafi"
 LOGGER = logging.getLogger(__package__)
 MANUFACTURER = "Tesla, Inc."
@@ -14,13 +43,123 @@ POLLING_INTERVAL_DEFAULT = timedelta(minutes=3)
 # Polling interval will be switched automatically in coordinator.py
 POLLING_INTERVAL_DRIVING = timedelta(minutes=1)
 POLLING_INTERVAL_SLEEPING = timedelta(minutes=10)
+# While a relay pushes data, polling is only a safety net
+POLLING_INTERVAL_PUSH = timedelta(minutes=30)
+# Pushing is considered active this long after the last push
+PUSH_ACTIVE_WINDOW = timedelta(minutes=15)
 
 DELAY_CLIMATE = timedelta(seconds=30)
 DELAY_CMD_WAKE = timedelta(seconds=30)
 DELAY_LOCKS = timedelta(seconds=15)
 DELAY_WAKEUP = timedelta(seconds=30)
 
+# Parked drain is reported over a rolling window
+DRAIN_WINDOW = timedelta(hours=24)
+# Minimum parked hours before a drain rate is reported
+DRAIN_MIN_HOURS = 0.5
+DRAIN_WRITE_INTERVAL = timedelta(minutes=15)
+
+# Cabin temperature changes smaller than this are not written (°C)
+CLIMATE_TEMP_DEADBAND = 0.3
+
+# Battery degradation is fitted daily from long-term statistics
+DEGRADATION_FIRST_RUN = timedelta(minutes=10)
+DEGRADATION_INTERVAL = timedelta(days=1)
+DEGRADATION_HISTORY = timedelta(days=5 * 365)
+# Ignore samples below this state of charge (%)
+DEGRADATION_MIN_LEVEL = 40
+DEGRADATION_MIN_SAMPLES = 48
+
+# TPMS leak detection: weight of older samples halves every half-life
+TPMS_LEAK_HALF_LIFE = timedelta(days=7)
+# Minimum spread of the samples (weighted std dev, in days) before a slope is trusted
+TPMS_LEAK_MIN_SPAN = 0.5
+# One tire losing this much more than the others per day, in psi
+TPMS_LEAK_THRESHOLD_PSI = 0.25
+
+SERVICE_IMPORT_HISTORY = "import_history"
+SERVICE_PRECONDITION = "precondition"
+# CSV rows parsed per vectorized chunk, and statistics rows per recorder job
+HISTORY_CHUNK_ROWS = 50_000
+HISTORY_IMPORT_BATCH = 10_000
+
+EVENT_TPMS_LEAK = f"{DOMAIN}_tpms_leak"
+EVENT_VEHICLE_CHANGED = f"{DOMAIN}_vehicle_changed"
+# Changes within this interval of the previous event are coalesced into the next one
+EVENT_CHANGED_MIN_INTERVAL = timedelta(seconds=30)
+
 TESLAFI_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Malformed TeslaFi dates are logged at most once per interval
+DATE_WARNING_INTERVAL = timedelta(hours=1)
+# Parsed dates kept: the current and previous Date of a few vehicles
+DATE_CACHE_SIZE = 16
+
+# A used field older than this is refreshed from lastGood when the car falls asleep
+FIELD_STALE_AFTER = timedelta(minutes=15)
+# Merge timestamps kept per vehicle before unreferenced ones are pruned
+FIELD_VERSIONS_MAX = 32
+
+# Snapshot journal: rotated at this size, and downtimes up to this long are backfilled
+JOURNAL_MAX_BYTES = 4 * 1024 * 1024
+JOURNAL_GAP_MIN = timedelta(hours=1)
+JOURNAL_GAP_MAX = timedelta(days=7)
+
+# Sleep prediction: fetch lastGood alongside the feed when the car is likely
+# to be asleep by the next refresh.
+SLEEP_PREDICT_HISTORY = 5
+SLEEP_PREDICT_IDLE_STREAK = 3
+SLEEP_PREDICT_MIN_IDLE = timedelta(minutes=10)
+# At most this many speculative lastGood requests per window
+SPECULATIVE_FETCH_BUDGET = 4
+SPECULATIVE_FETCH_WINDOW = timedelta(hours=1)
+# Commands sent by the integration's own controllers, shared between them
+COMMAND_BUDGET = 12
+COMMAND_BUDGET_WINDOW = timedelta(hours=1)
+
+# Solar-excess charging
+SOLAR_MIN_AMPS = 5
+# Charging starts above, and stops below, the minimum by this many amps
+SOLAR_HYSTERESIS_AMPS = 1
+# Smaller changes of the charging current are not sent
+SOLAR_MIN_STEP_AMPS = 2
+SOLAR_DWELL = timedelta(minutes=5)
+# Until the charger reports its voltage
+SOLAR_DEFAULT_VOLTAGE = 240
+
+# Charge scheduler
+DEFAULT_DEPARTURE_TIME = "07:00:00"
+# Percent per hour, until charging has been observed
+SCHEDULER_DEFAULT_RATE = 10.0
+SCHEDULER_RATE_SAMPLES = 50
+# Snapshots further apart don't count towards the charging rate
+SCHEDULER_MAX_SAMPLE_GAP = timedelta(minutes=30)
+
+# Seconds to wait for more changes before writing learned data to storage
+STORAGE_SAVE_DELAY = 60
+
+# Pre-wake
+PREWAKE_STORAGE_VERSION = 1
+PREWAKE_HISTORY = timedelta(days=28)
+PREWAKE_BIN = timedelta(minutes=15)
+# Commands in a bin on fewer days are not a habit
+PREWAKE_MIN_DAYS = 3
+PREWAKE_LEAD = timedelta(minutes=3)
+
+# Climate preconditioning
+PRECONDITION_STORAGE_VERSION = 1
+# °C per minute, until rates have been learned
+PRECONDITION_DEFAULT_RATE = 0.7
+PRECONDITION_MIN_RATE = 0.05
+PRECONDITION_MIN_SAMPLES = 5
+# Weight of the previous samples for each new one
+PRECONDITION_FORGET = 0.99
+# °C: closer to the setpoint, the rate is mostly the climate holding it
+PRECONDITION_DEADBAND = 0.5
+PRECONDITION_MIN_LEAD = timedelta(minutes=5)
+PRECONDITION_MAX_LEAD = timedelta(hours=1)
+PRECONDITION_MAX_SAMPLE_GAP = timedelta(minutes=10)
+
+ATTR_VALUE_UPDATED = "value_updated"
 
 ATTRIBUTION = "Data provided by Tesla and TeslaFi"
 
@@ -1,21 +1,58 @@
 """TeslaFi data update coordinator"""
 
+import asyncio
+from collections import deque
+from collections.abc import Collection, Iterable, Mapping
 from datetime import datetime, timedelta
-from typing import override
+import math
+from typing import TYPE_CHECKING, Any, override
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
+from .budget import TeslaFiRequestBudget
 from .client import TeslaFiClient
 from .const import (
+    COMMAND_BUDGET,
+    COMMAND_BUDGET_WINDOW,
     DELAY_CMD_WAKE,
     DOMAIN,
+    EVENT_TPMS_LEAK,
+    FIELD_STALE_AFTER,
+    JOURNAL_GAP_MAX,
+    JOURNAL_GAP_MIN,
     LOGGER,
     POLLING_INTERVAL_DEFAULT,
     POLLING_INTERVAL_DRIVING,
+    POLLING_INTERVAL_PUSH,
     POLLING_INTERVAL_SLEEPING,
+    PUSH_ACTIVE_WINDOW,
+    SLEEP_PREDICT_HISTORY,
+    SLEEP_PREDICT_IDLE_STREAK,
+    SLEEP_PREDICT_MIN_IDLE,
+    SPECULATIVE_FETCH_BUDGET,
+    SPECULATIVE_FETCH_WINDOW,
 )
-from .model import TeslaFiVehicle
+from .degradation import TeslaFiDegradationEstimator
+from .drain import TeslaFiDrainTracker
+from .events import TeslaFiChangeEvents
+from .leak import TeslaFiTpmsLeakDetector
+from .model import (
+    CHARGER_CONNECTED_STATES,
+    CORE_FIELDS,
+    TeslaFiVehicle,
+    TeslaFiVehicleIdentity,
+)
+from .plan import TeslaFiEvaluation, TeslaFiEvaluationPlan
+from .util import _int_or_none, _lower_or_none
+
+if TYPE_CHECKING:
+    from .base import TeslaFiBaseEntityDescription
+    from .journal import JournalRecord, TeslaFiJournal
+    from .precondition import TeslaFiPreconditioner
+    from .prewake import TeslaFiPreWake
 
 
 class TeslaFiCoordinator(DataUpdateCoordinator[TeslaFiVehicle]):
@@ -26,16 +63,60 @@ class TeslaFiCoordinator(DataUpdateCoordinator[TeslaFiVehicle]):
 
     _last_charge_reset: datetime | None = None
     _override_next_refresh: timedelta | None = None
+    _last_push: datetime | None = None
 
     def __init__(
         self,
         hass: HomeAssistant,
         client: TeslaFiClient,
+        keep_all_fields: bool = False,
+        change_events: bool = False,
+        change_event_fields: Collection[str] = (),
+        journal: "TeslaFiJournal | None" = None,
     ) -> None:
         self._client = client
+        self.journal = journal
+        # Learns from the commands the user sends, if enabled
+        self.prewake: "TeslaFiPreWake | None" = None
+        # Created by the first precondition service call
+        self.preconditioner: "TeslaFiPreconditioner | None" = None
+        # Snapshots before and after a downtime, until backfilled
+        self._gap: tuple[JournalRecord, JournalRecord] | None = None
+        self._journal_lock = asyncio.Lock()
+        self._keep_all_fields = keep_all_fields
+        self.change_events = (
+            TeslaFiChangeEvents(hass, change_event_fields) if change_events else None
+        )
         self.data = None
         self._vehicle = TeslaFiVehicle({})
         self._last_charge_reset = None
+        self.identity: TeslaFiVehicleIdentity | None = None
+        self.drain = TeslaFiDrainTracker()
+        self.degradation = TeslaFiDegradationEstimator(hass, self)
+        self.tpms_leaks = TeslaFiTpmsLeakDetector()
+        # id(description) -> [description, number of entities using it]
+        self._descriptions: dict[int, list] = {}
+        # Fields read outside of entity descriptions (e.g. the device tracker)
+        self._required: list[frozenset[str]] = []
+        self._used_fields: frozenset[str] | None = None
+        self._stored_fields: frozenset[str] | None = None
+        self._retained: frozenset[str] | None = None
+        self._plan: TeslaFiEvaluationPlan | None = None
+        # Fields changed since the plan was last evaluated
+        self._changed: set[str] = set()
+        # Sleep prediction, for speculative lastGood fetches
+        self._state_history: deque[str | None] = deque(maxlen=SLEEP_PREDICT_HISTORY)
+        self._idle_streak = 0
+        self._last_active: datetime | None = None
+        self._speculative_budget = TeslaFiRequestBudget(
+            SPECULATIVE_FETCH_BUDGET, SPECULATIVE_FETCH_WINDOW
+        )
+        # Shared by every controller that sends commands on its own
+        self.command_budget = TeslaFiRequestBudget(
+            COMMAND_BUDGET, COMMAND_BUDGET_WINDOW
+        )
+        self.speculative_fetches = 0
+        self.speculative_wasted = 0
         # TODO: implement custom Debouncer to ensure no more than 2x per min,
         #  as per API rate limit?
         super().__init__(
@@ -46,17 +127,132 @@ class TeslaFiCoordinator(DataUpdateCoordinator[TeslaFiVehicle]):
             update_method=self._refresh,
         )
 
-    async def execute_command(self, cmd: str, **kwargs) -> dict:
-        """Execute the remote command."""
+    async def execute_command(
+        self,
+        cmd: str,
+        *,
+        background: bool = False,
+        **kwargs,
+    ) -> dict:
+        """
+        Execute the remote command.
+        `background` commands are sent by the integration itself, not the user.
+        """
         if self.data.is_sleeping:
             kwargs["wake"] = DELAY_CMD_WAKE.seconds
 
         response = await self._client.command(cmd, **kwargs)
-        self._vehicle.update_non_empty(response)
+        if self.prewake is not None and not background and cmd != "wake_up":
+            self.prewake.record(cmd)
+        self._vehicle, changed = self._vehicle.merged(
+            response, keys=self.stored_fields
+        )
+        self._changed.update(changed)
+        if self.change_events:
+            self.change_events.add(self._vehicle, changed)
+        self._update_identity()
         self.async_set_updated_data(self._vehicle)
 
         return response
 
+    @callback
+    def async_register_description(
+        self,
+        description: "TeslaFiBaseEntityDescription",
+    ) -> CALLBACK_TYPE:
+        """Register the description of an added entity. Returns an unregister callback."""
+        key = id(description)
+        self._descriptions.setdefault(key, [description, 0])[1] += 1
+        self._invalidate_descriptions()
+
+        @callback
+        def _unregister() -> None:
+            if (entry := self._descriptions.get(key)) and entry[1] > 1:
+                entry[1] -= 1
+            else:
+                self._descriptions.pop(key, None)
+            self._invalidate_descriptions()
+
+        return _unregister
+
+    @callback
+    def async_require_fields(self, fields: Iterable[str]) -> CALLBACK_TYPE:
+        """Keep raw fields that are read outside of entities. Returns a release callback."""
+        required = frozenset(fields)
+        self._required.append(required)
+        self._invalidate_descriptions()
+
+        @callback
+        def _release() -> None:
+            self._required.remove(required)
+            self._invalidate_descriptions()
+
+        return _release
+
+    @callback
+    def _invalidate_descriptions(self) -> None:
+        self._used_fields = None
+        self._stored_fields = None
+        self._plan = None
+
+    @property
+    def used_fields(self) -> frozenset[str]:
+        """Raw fields read by the currently added entities, and required fields."""
+        if self._used_fields is None:
+            self._used_fields = frozenset(
+                field
+                for description, _ in self._descriptions.values()
+                for field in description.fields or ()
+            ).union(*self._required)
+        return self._used_fields
+
+    @property
+    def stored_fields(self) -> frozenset[str] | None:
+        """Raw fields kept in the vehicle snapshot, or None to keep all of them."""
+        if self._keep_all_fields or not self._descriptions:
+            # Until entities are added, we don't know which fields matter
+            return None
+        if self._stored_fields is None:
+            if any(d.fields is None for d, _ in self._descriptions.values()):
+                # An entity reads fields it doesn't declare
+                return None
+            self._stored_fields = self.used_fields | CORE_FIELDS
+            if self.change_events and self.change_events.keys:
+                # Fields reported in change events must be merged to be compared
+                self._stored_fields |= self.change_events.keys
+        return self._stored_fields
+
+    def evaluation(
+        self,
+        description: "TeslaFiBaseEntityDescription",
+    ) -> TeslaFiEvaluation | None:
+        """The precomputed result for an entity description, if evaluated."""
+        if self._plan is None:
+            return None
+        return self._plan.results.get(id(description))
+
+    def reevaluated(self, description: "TeslaFiBaseEntityDescription") -> bool:
+        """Whether the last evaluation pass may have changed a description's result."""
+        return self._plan is None or id(description) in self._plan.evaluated
+
+    def supports(self, description: "TeslaFiBaseEntityDescription") -> bool:
+        """Whether the vehicle reports the primary field of a description."""
+        if not description.fields:
+            return True
+        return description.fields[0] in self.data
+
+    @override
+    @callback
+    def async_update_listeners(self) -> None:
+        if self.data is not None:
+            if self._plan is None:
+                self._plan = TeslaFiEvaluationPlan(
+                    description for description, _ in self._descriptions.values()
+                )
+            self._plan.evaluate(self, self._changed)
+            self._changed = set()
+        super().async_update_listeners()
+
     def schedule_refresh_in(self, delta: timedelta):
         """Attempt to schedule a refresh"""
         self._override_next_refresh = delta
@@ -89,27 +285,57 @@ class TeslaFiCoordinator(DataUpdateCoordinator[TeslaFiVehicle]):
     async def _refresh(self) -> TeslaFiVehicle:
         """Refresh"""
         was_sleeping = self._vehicle.is_sleeping
-        current = await self._client.current_data()
+        now = dt_util.utcnow()
+        fields = self.stored_fields
+        speculative: asyncio.Task[TeslaFiVehicle] | None = None
+        if not was_sleeping and self._should_speculate(now):
+            LOGGER.debug("Car is likely falling asleep, fetching last good data early")
+            speculative = self.hass.async_create_task(
+                self._client.last_good(fields), "teslafi speculative lastGood"
+            )
+
+        try:
+            current = await self._client.current_data(fields)
+        except BaseException:
+            self._discard_speculative(speculative)
+            raise
         LOGGER.debug("Current: %s", current)
-        
-        self._infer_charge_session(prev=self.data, current=current)
-        
-        if current.is_sleeping and not was_sleeping:
+        first = self.data is None
+        changed: dict[str, Any] = {}
+
+        if current.is_sleeping and not was_sleeping and self._needs_last_good(current):
             LOGGER.debug("Car is now sleeping, fetching last good data")
-            last_good = await self._client.last_good()
+            if speculative is not None:
+                last_good = await speculative
+                speculative = None
+            else:
+                last_good = await self._client.last_good(fields)
             LOGGER.debug("Last good: %s", last_good)
             # Populating last good data as current will have numerous empty fields when car is sleeping
-            self._vehicle.update_non_empty(last_good)
+            self._vehicle, changed = self._vehicle.merged(last_good, keys=fields)
             
             assert last_good.vin
 
-        self._vehicle.update_non_empty(current)
+        self._vehicle, current_changed = self._vehicle.merged(current, keys=fields)
+        for key, old in current_changed.items():
+            # Keep the value from before this refresh
+            changed.setdefault(key, old)
+        if speculative is not None:
+            LOGGER.debug("Speculative last good data not needed, discarding")
+            self.speculative_wasted += 1
+            self._discard_speculative(speculative)
 
-        LOGGER.debug("Remote data last updated %s", self._vehicle.last_remote_update)
-
-        assert self._vehicle.vin
+        self._ingest(changed, now, first)
+        if self.journal is not None:
+            await self._async_journal(first)
 
-        if (car_state := self._vehicle.car_state) == "sleeping":
+        if self._is_pushing(now):
+            self._override_next_refresh = POLLING_INTERVAL_PUSH
+            LOGGER.debug(
+                "data is being pushed, polling only every %s",
+                self._override_next_refresh,
+            )
+        elif (car_state := self._vehicle.car_state) == "sleeping":
             self._override_next_refresh = POLLING_INTERVAL_SLEEPING
             LOGGER.debug(
                 "car is sleeping, decreasing polling interval to %s",
@@ -126,19 +352,205 @@ class TeslaFiCoordinator(DataUpdateCoordinator[TeslaFiVehicle]):
 
         return self._vehicle
 
-    def _infer_charge_session(
-        self,
-        prev: TeslaFiVehicle,
-        current: TeslaFiVehicle,
-    ):
-        if prev and current and (prev != current) and not current.is_sleeping:
-            if not prev.is_plugged_in and current.is_plugged_in:
-                LOGGER.info("Vehicle is newly plugged in: resetting charge session")
-                self._last_charge_reset = current.last_remote_update
-            elif current.charge_session_number and (
-                prev.charge_session_number != current.charge_session_number
-            ):
-                LOGGER.info(
-                    f"New charge session detected: {prev.charge_session_number} -> {current.charge_session_number}"
-                )
-                self._last_charge_reset = current.last_remote_update
+    @callback
+    def async_push(self, data: Mapping[str, Any]) -> None:
+        """Merge a snapshot pushed by a local relay, as if it had been polled."""
+        now = dt_util.utcnow()
+        first = self.data is None
+        self._vehicle, changed = self._vehicle.merged(data, keys=self.stored_fields)
+        self._last_push = now
+        self._ingest(changed, now, first)
+        if self.journal is not None:
+            self.hass.async_create_task(
+                self._async_journal(first), "teslafi journal push"
+            )
+        # Pushes keep coming, so polling only needs to be a safety net
+        self._override_next_refresh = POLLING_INTERVAL_PUSH
+        self.async_set_updated_data(self._vehicle)
+
+    def _is_pushing(self, now: datetime) -> bool:
+        """Whether a relay has pushed data recently."""
+        return self._last_push is not None and now - self._last_push < PUSH_ACTIVE_WINDOW
+
+    def _ingest(self, changed: Mapping[str, Any], now: datetime, first: bool) -> None:
+        """Process a snapshot merged into `self._vehicle`, polled or pushed."""
+        self._changed.update(changed)
+        fields = self.stored_fields
+        if fields is not None and fields is not self._retained:
+            # Drop what was stored before the used fields were known
+            self._vehicle = self._vehicle.retained(fields)
+            self._retained = fields
+
+        LOGGER.debug("Remote data last updated %s", self._vehicle.last_remote_update)
+        if not first:
+            self._infer_charge_session(changed)
+            if self.change_events:
+                self.change_events.add(self._vehicle, changed)
+
+        assert self._vehicle.vin
+        self._update_identity()
+
+        self._track_state(self._vehicle.car_state, now)
+        self.drain.ingest(self._vehicle, now)
+        for tire in self.tpms_leaks.ingest(self._vehicle, now):
+            LOGGER.warning("Possible slow leak detected in %s tire", tire)
+            self.hass.bus.async_fire(
+                EVENT_TPMS_LEAK,
+                {
+                    "vin": self._vehicle.vin,
+                    "tire": tire,
+                    "slope": self.tpms_leaks.slope(tire),
+                },
+            )
+
+    async def _async_journal(self, first: bool) -> None:
+        """Journal the current snapshot, reconciling it with the journal first."""
+        vehicle = self._vehicle
+        timestamp = (vehicle.last_remote_update or dt_util.utcnow()).timestamp()
+        # Pushes can overlap a poll, and the journal is not thread-safe
+        async with self._journal_lock:
+            last = await self.hass.async_add_executor_job(
+                self._write_journal, timestamp, vehicle, first
+            )
+        if last is not None:
+            self._reconcile_journal(last, timestamp, vehicle)
+
+    def _write_journal(
+        self, timestamp: float, vehicle: TeslaFiVehicle, first: bool
+    ) -> "JournalRecord | None":
+        """
+        Append a snapshot, rotating a full journal first.
+        Returns the record it follows on the first refresh. Blocking.
+        """
+        last = self.journal.last() if first else None
+        if not self.journal.append(timestamp, vehicle):
+            self.journal.rotate()
+            self.journal.append(timestamp, vehicle)
+        return last
+
+    def _reconcile_journal(
+        self, last: "JournalRecord", timestamp: float, vehicle: TeslaFiVehicle
+    ) -> None:
+        """Catch up on what happened while Home Assistant was not running."""
+        then, values = last
+        if not math.isnan(previous := values["chargeNumber"]):
+            # A session that started during the downtime
+            self._infer_charge_session({"chargeNumber": previous})
+        gap = timedelta(seconds=timestamp - then)
+        if JOURNAL_GAP_MIN <= gap <= JOURNAL_GAP_MAX:
+            LOGGER.debug("No data for %s, statistics will be backfilled", gap)
+            self._gap = (last, (timestamp, self.journal.values(vehicle)))
+
+    async def async_backfill(self) -> None:
+        """Backfill hourly statistics for a downtime found in the journal."""
+        if (gap := self._gap) is None:
+            return
+        self._gap = None
+        if "recorder" not in self.hass.config.components:
+            return
+        # The recorder is only an after dependency
+        from homeassistant.components.recorder import get_instance
+
+        from .history import async_history_targets, async_import_hourly
+        from .journal import backfill_statistics
+
+        targets = async_history_targets(self.hass, self.identity)
+        statistics = await get_instance(self.hass).async_add_executor_job(
+            backfill_statistics, self.hass, targets, *gap
+        )
+        async_import_hourly(self.hass, targets, statistics)
+
+    @callback
+    def _update_identity(self) -> None:
+        """Rebuild the vehicle identity if it changed, and update the device."""
+        previous = self.identity
+        if previous is not None and previous.matches(self._vehicle):
+            return
+        self.identity = identity = TeslaFiVehicleIdentity.from_vehicle(self._vehicle)
+        if previous is None:
+            return
+
+        LOGGER.debug("Vehicle identity changed: %s", identity)
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(identifiers={(DOMAIN, identity.vin)}):
+            registry.async_update_device(
+                device.id,
+                name=identity.name,
+                sw_version=identity.firmware_version,
+            )
+
+    def _needs_last_good(self, current: TeslaFiVehicle | None) -> bool:
+        """Whether any field used by an entity is missing or stale."""
+        if not self._descriptions:
+            # Not set up yet: we don't know which fields matter
+            return True
+        stale = self._vehicle.stale_fields(
+            (f for f in self.used_fields if not (current and current.get(f))),
+            FIELD_STALE_AFTER,
+        )
+        if stale:
+            LOGGER.debug("Stale fields: %s", stale)
+        else:
+            LOGGER.debug("All used fields are fresh, last good data not needed")
+        return bool(stale)
+
+    def _track_state(self, car_state: str | None, now: datetime) -> None:
+        self._state_history.append(car_state)
+        if car_state == "idling":
+            self._idle_streak += 1
+        else:
+            self._idle_streak = 0
+        if car_state in ["driving", "charging"]:
+            self._last_active = now
+
+    def _predict_sleep(self, now: datetime) -> bool:
+        """Whether the car is likely to be asleep by the next refresh."""
+        if self._vehicle.car_state != "idling":
+            return False
+        if self._idle_streak < SLEEP_PREDICT_IDLE_STREAK:
+            return False
+        if any(state in ["driving", "charging"] for state in self._state_history):
+            return False
+        return not (self._last_active and now - self._last_active < SLEEP_PREDICT_MIN_IDLE)
+
+    def _should_speculate(self, now: datetime) -> bool:
+        if not self._predict_sleep(now):
+            return False
+        # Only worth it if the sleeping data would actually need lastGood
+        if not self._needs_last_good(None):
+            return False
+        if not self._speculative_budget.try_acquire(now):
+            LOGGER.debug("Speculative fetch budget exhausted")
+            return False
+        self.speculative_fetches += 1
+        return True
+
+    @staticmethod
+    def _discard_speculative(task: asyncio.Task | None) -> None:
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            # Retrieve any exception, so it is not reported as unhandled
+            task.exception()
+
+    def _infer_charge_session(self, changed: Mapping[str, Any]) -> None:
+        """Detect a new charge session from the fields changed by a refresh."""
+        vehicle = self._vehicle
+        if not changed or vehicle.is_sleeping:
+            return
+        if (
+            "charging_state" in changed
+            and vehicle.is_plugged_in
+            and _lower_or_none(changed["charging_state"]) not in CHARGER_CONNECTED_STATES
+        ):
+            LOGGER.info("Vehicle is newly plugged in: resetting charge session")
+            self._last_charge_reset = vehicle.last_remote_update
+        elif (
+            "chargeNumber" in changed
+            and (current := vehicle.charge_session_number)
+            and _int_or_none(previous := changed["chargeNumber"] or None) != current
+        ):
+            LOGGER.info(f"New charge session detected: {previous} -> {current}")
+            self._last_charge_reset = vehicle.last_remote_update
@@ -1,7 +1,10 @@
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 from homeassistant.components.cover import (
     CoverDeviceClass,
     CoverEntity,
+    CoverEntityDescription,
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -9,12 +12,26 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiCoverEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
 from .const import DOMAIN, LOGGER
 from .coordinator import TeslaFiCoordinator
 from .errors import TeslaFiApiError
+from .model import CAR_STATE_FIELDS, TeslaFiVehicle
 from .util import _convert_to_bool
 
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiCoverEntityDescription(
+    CoverEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Cover"""
+
+    value: Callable[[TeslaFiVehicle, HomeAssistant], bool] = None
+    convert: Callable[[any], bool] = _convert_to_bool
+    cmd: Callable[[TeslaFiCoordinator, bool], dict] = None
+
+
 COVERS = [
     TeslaFiCoverEntityDescription(
         key="charge_port_door_open",
@@ -26,6 +43,7 @@ COVERS = [
         cmd=lambda c, v: c.execute_command(
             "charge_port_door_open" if v else "charge_port_door_close"
         ),
+        fields=("charge_port_door_open", *CAR_STATE_FIELDS),
     )
 ]
 
@@ -85,6 +103,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiCoverEntity] = []
     entities.extend(
-        [TeslaFiCoverEntity(coordinator, description) for description in COVERS]
+        [
+            TeslaFiCoverEntity(coordinator, description)
+            for description in COVERS
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
@@ -0,0 +1,211 @@
+"""TeslaFi battery degradation estimator"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEGRADATION_FIRST_RUN,
+    DEGRADATION_HISTORY,
+    DEGRADATION_INTERVAL,
+    DEGRADATION_MIN_LEVEL,
+    DEGRADATION_MIN_SAMPLES,
+    DOMAIN,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import TeslaFiCoordinator
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+# Huber tuning constant, in units of the robust residual scale
+HUBER_K = 1.345
+IRLS_ITERATIONS = 10
+
+
+@dataclass(frozen=True, slots=True)
+class TeslaFiDegradation:
+    """Fitted 100%-equivalent range over time."""
+
+    start: datetime
+    """Start of the fitted history."""
+    initial_full_range: float
+    """Fitted full-pack range at the start of the history."""
+    full_range: float
+    """Fitted full-pack range at the end of the history."""
+    slope: float
+    """Change in full-pack range per year."""
+    samples: int
+
+    @property
+    def degradation(self) -> float:
+        """Percent of full-pack range lost since the start of the history."""
+        return 100 * (1 - self.full_range / self.initial_full_range)
+
+    @property
+    def trend(self) -> float:
+        """Percent of full-pack range lost per year."""
+        return -100 * self.slope / self.initial_full_range
+
+
+def _robust_fit(
+    times: np.ndarray,
+    full_range: np.ndarray,
+) -> tuple[float, float]:
+    """
+    Fit `full_range = a + b * years` by iteratively reweighted least squares
+    with Huber weights. Returns (a, b).
+    """
+    years = (times - times[0]) / SECONDS_PER_YEAR
+    design = np.column_stack((np.ones_like(years), years))
+    weights = np.ones_like(full_range)
+    coef = np.zeros(2)
+    for _ in range(IRLS_ITERATIONS):
+        sqrt_w = np.sqrt(weights)
+        coef, *_ = np.linalg.lstsq(
+            design * sqrt_w[:, None], full_range * sqrt_w, rcond=None
+        )
+        resid = full_range - design @ coef
+        # Median absolute deviation, scaled to match a normal distribution
+        scale = 1.4826 * np.median(np.abs(resid - np.median(resid)))
+        if scale <= 0:
+            break
+        abs_resid = np.abs(resid)
+        weights = np.minimum(1.0, HUBER_K * scale / np.maximum(abs_resid, 1e-12))
+    return float(coef[0]), float(coef[1])
+
+
+def _series(rows: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    starts = np.fromiter((r["start"] for r in rows), dtype=float, count=len(rows))
+    means = np.fromiter(
+        (np.nan if (m := r.get("mean")) is None else m for r in rows),
+        dtype=float,
+        count=len(rows),
+    )
+    return starts, means
+
+
+def fit_degradation(
+    level_rows: list[dict],
+    range_rows: list[dict],
+) -> TeslaFiDegradation | None:
+    """Fit degradation from hourly `battery_level` and `battery_range` statistics."""
+    level_t, levels = _series(level_rows)
+    range_t, ranges = _series(range_rows)
+    times, li, ri = np.intersect1d(level_t, range_t, return_indices=True)
+    levels = levels[li]
+    ranges = ranges[ri]
+
+    # Low states of charge amplify the rounding of battery_level
+    mask = (levels >= DEGRADATION_MIN_LEVEL) & (ranges > 0) & np.isfinite(ranges)
+    if np.count_nonzero(mask) < DEGRADATION_MIN_SAMPLES:
+        return None
+
+    times = times[mask]
+    full_range = ranges[mask] * 100 / levels[mask]
+    intercept, slope = _robust_fit(times, full_range)
+    years = (times[-1] - times[0]) / SECONDS_PER_YEAR
+    if intercept <= 0:
+        return None
+
+    return TeslaFiDegradation(
+        start=dt_util.utc_from_timestamp(times[0]),
+        initial_full_range=intercept,
+        full_range=intercept + slope * years,
+        slope=slope,
+        samples=int(times.size),
+    )
+
+
+class TeslaFiDegradationEstimator:
+    """
+    Daily background job estimating battery degradation from the recorder's
+    long-term statistics. Fetching and fitting both run in the recorder's
+    executor, so the amount of history never affects the event loop.
+    """
+
+    result: TeslaFiDegradation | None = None
+
+    def __init__(self, hass: HomeAssistant, coordinator: TeslaFiCoordinator) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self.result = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Schedule the job. Returns a callback to cancel it."""
+        unsubs = [
+            async_call_later(self._hass, DEGRADATION_FIRST_RUN, self._async_run),
+            async_track_time_interval(
+                self._hass,
+                self._async_run,
+                DEGRADATION_INTERVAL,
+                name="TeslaFi battery degradation",
+            ),
+        ]
+
+        @callback
+        def _cancel() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _cancel
+
+    def _statistic_ids(self) -> tuple[str, str] | None:
+        registry = er.async_get(self._hass)
+        identity = self._coordinator.identity
+        level_id = registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, identity.unique_id("battery_level")
+        )
+        range_id = registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, identity.unique_id("battery_range")
+        )
+        if not level_id or not range_id:
+            return None
+        return level_id, range_id
+
+    async def _async_run(self, _now: datetime | None = None) -> None:
+        if "recorder" not in self._hass.config.components:
+            LOGGER.debug("Recorder not loaded, skipping degradation estimate")
+            return
+        if not (ids := self._statistic_ids()):
+            return
+        # The recorder is only an after dependency
+        from homeassistant.components.recorder import get_instance
+
+        self.result = await get_instance(self._hass).async_add_executor_job(
+            self._fetch_and_fit, *ids
+        )
+        LOGGER.debug("Battery degradation estimate: %s", self.result)
+        self._coordinator.async_update_listeners()
+
+    def _fetch_and_fit(self, level_id: str, range_id: str) -> TeslaFiDegradation | None:
+        """Runs in the recorder executor."""
+        from homeassistant.components.recorder.statistics import (
+            statistics_during_period,
+        )
+
+        stats = statistics_during_period(
+            self._hass,
+            dt_util.utcnow() - DEGRADATION_HISTORY,
+            None,
+            {level_id, range_id},
+            "hour",
+            None,
+            {"mean"},
+        )
+        if not (level_rows := stats.get(level_id)) or not (
+            range_rows := stats.get(range_id)
+        ):
+            return None
+        return fit_degradation(level_rows, range_rows)
@@ -14,6 +14,9 @@ from .base import TeslaFiBaseEntity
 from .const import DOMAIN
 from .coordinator import TeslaFiCoordinator
 
+# Required from the coordinator, so that these fields are kept
+TRACKER_FIELDS = ("latitude", "longitude", "heading", "location")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -37,9 +40,13 @@ class TeslaFiTracker(TeslaFiBaseEntity, TrackerEntity):
 
     def __init__(self, coordinator: TeslaFiCoordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.data.vin}-tracker"
+        self._attr_unique_id = coordinator.identity.unique_id("tracker")
         self._attr_name = "Location"
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_require_fields(TRACKER_FIELDS))
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
@@ -0,0 +1,105 @@
+"""TeslaFi parked drain (vampire loss) analytics"""
+
+from collections import deque
+from datetime import datetime, timedelta
+
+from .const import DRAIN_MIN_HOURS, DRAIN_WINDOW
+from .model import TeslaFiVehicle
+from .util import _convert_to_bool
+
+DRAIN_SENTRY = "sentry"
+DRAIN_CLIMATE_KEEPER = "climate_keeper"
+DRAIN_SLEEPING = "sleeping"
+DRAIN_IDLE = "idle"
+
+DRAIN_MODES = (DRAIN_SENTRY, DRAIN_CLIMATE_KEEPER, DRAIN_SLEEPING, DRAIN_IDLE)
+
+CLIMATE_KEEPER_MODES = ["dog", "camp", "on"]
+
+
+def _parked_mode(vehicle: TeslaFiVehicle) -> str | None:
+    """Classify a parked, non-charging snapshot. None if the car is not parked."""
+    state = vehicle.car_state
+    if state is None or state in ["driving", "charging"]:
+        return None
+    if vehicle.is_in_gear or vehicle.is_charging:
+        return None
+    if state == "sentry" or _convert_to_bool(vehicle.get("sentry_mode")):
+        return DRAIN_SENTRY
+    if vehicle.get("climate_keeper_mode") in CLIMATE_KEEPER_MODES:
+        return DRAIN_CLIMATE_KEEPER
+    if vehicle.is_sleeping:
+        return DRAIN_SLEEPING
+    return DRAIN_IDLE
+
+
+class TeslaFiDrainTracker:
+    """
+    Rolling parked drain, in range lost per hour.
+
+    Each refresh closes one interval (previous snapshot -> current snapshot),
+    attributed to the mode the car was in at the start of that interval.
+    Intervals are kept in a deque with running totals per mode, so both
+    ingesting and evicting are O(1) (amortized), and history is never rescanned.
+    """
+
+    def __init__(self, window: timedelta = DRAIN_WINDOW) -> None:
+        self._window = window
+        self._last: tuple[datetime, float | None, str | None] | None = None
+        # (end, mode, hours, loss)
+        self._intervals: deque[tuple[datetime, str, float, float]] = deque()
+        self._hours = dict.fromkeys(DRAIN_MODES, 0.0)
+        self._loss = dict.fromkeys(DRAIN_MODES, 0.0)
+
+    def ingest(self, vehicle: TeslaFiVehicle, now: datetime) -> None:
+        """Account for the interval since the previous snapshot."""
+        mode = _parked_mode(vehicle)
+        current_range = vehicle.battery_range
+        prev = self._last
+        self._last = (now, current_range, mode)
+
+        if prev is not None:
+            prev_time, prev_range, prev_mode = prev
+            hours = (now - prev_time).total_seconds() / 3600
+            if (
+                prev_mode
+                and mode
+                and hours > 0
+                and prev_range is not None
+                and current_range is not None
+            ):
+                loss = prev_range - current_range
+                self._intervals.append((now, prev_mode, hours, loss))
+                self._hours[prev_mode] += hours
+                self._loss[prev_mode] += loss
+
+        self._expire(now)
+
+    def _expire(self, now: datetime) -> None:
+        cutoff = now - self._window
+        while self._intervals and self._intervals[0][0] < cutoff:
+            _, mode, hours, loss = self._intervals.popleft()
+            self._hours[mode] -= hours
+            self._loss[mode] -= loss
+        if not self._intervals:
+            # Avoid accumulating float error once the window is empty
+            self._hours = dict.fromkeys(DRAIN_MODES, 0.0)
+            self._loss = dict.fromkeys(DRAIN_MODES, 0.0)
+
+    def hours(self, mode: str | None = None) -> float:
+        """Parked hours in the window, for one mode or all of them."""
+        if mode is None:
+            return sum(self._hours.values())
+        return self._hours[mode]
+
+    def rate(self, mode: str | None = None) -> float | None:
+        """Range lost per parked hour, for one mode or all of them."""
+        if mode is None:
+            hours = self.hours()
+            loss = sum(self._loss.values())
+        else:
+            hours = self._hours[mode]
+            loss = self._loss[mode]
+        if hours < DRAIN_MIN_HOURS:
+            return None
+        return loss / hours
@@ -0,0 +1,95 @@
+"""TeslaFi vehicle change events"""
+
+from collections.abc import Collection, Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import EVENT_CHANGED_MIN_INTERVAL, EVENT_VEHICLE_CHANGED, LOGGER
+from .model import TeslaFiVehicle
+
+
+class TeslaFiChangeEvents:
+    """
+    Fires one `teslafi_vehicle_changed` event with the fields changed by a
+    refresh, instead of automations listening to many entities.
+
+    Events are rate limited: changes arriving within the minimum interval of
+    the previous event are coalesced into the next one, keeping each field's
+    oldest previous value and newest current value.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        keys: Collection[str] | None = None,
+    ) -> None:
+        """:param keys: Only changes to these fields are reported. All if empty."""
+        self._hass = hass
+        self.keys = frozenset(keys) if keys else None
+        self._vin: str | None = None
+        # field -> value before the first unreported change
+        self._pending: dict[str, Any] = {}
+        self._vehicle: TeslaFiVehicle | None = None
+        self._last_fired: float | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def add(self, vehicle: TeslaFiVehicle, changed: Mapping[str, Any]) -> None:
+        """Report the fields changed by a merge, mapped to their previous value."""
+        if not changed:
+            return
+        keys = self.keys
+        pending = self._pending
+        for key, old in changed.items():
+            if keys is None or key in keys:
+                pending.setdefault(key, old)
+        if not pending:
+            return
+        self._vin = vehicle.vin
+        self._vehicle = vehicle
+        if self._unsub_flush is not None:
+            # Already scheduled
+            return
+        now = self._hass.loop.time()
+        interval = EVENT_CHANGED_MIN_INTERVAL.total_seconds()
+        if self._last_fired is None or now - self._last_fired >= interval:
+            self._fire()
+        else:
+            self._unsub_flush = async_call_later(
+                self._hass, self._last_fired + interval - now, self._async_flush
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop pending changes and any scheduled event."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending = {}
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        self._fire()
+
+    @callback
+    def _fire(self) -> None:
+        vehicle = self._vehicle
+        changes = {
+            key: {"old": old, "new": new}
+            for key, old in self._pending.items()
+            # A field may have changed back in the meantime
+            if (new := vehicle.get(key)) != old
+        }
+        self._pending = {}
+        if not changes:
+            return
+        self._last_fired = self._hass.loop.time()
+        LOGGER.debug("Vehicle changed: %s", changes)
+        self._hass.bus.async_fire(
+            EVENT_VEHICLE_CHANGED,
+            {"vin": self._vin, "changes": changes},
+        )
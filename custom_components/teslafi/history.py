@@ -0,0 +1,415 @@
+"""TeslaFi history import from CSV exports"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta, tzinfo
+from itertools import islice
+from typing import Any
+
+import numpy as np
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    Platform,
+    UnitOfEnergy,
+    UnitOfLength,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, ServiceResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import (
+    BaseUnitConverter,
+    DistanceConverter,
+    EnergyConverter,
+    TemperatureConverter,
+)
+
+from .const import DOMAIN, HISTORY_CHUNK_ROWS, HISTORY_IMPORT_BATCH, LOGGER
+from .model import TeslaFiVehicleIdentity
+
+DATE_COLUMN = "Date"
+
+
+@dataclass(frozen=True, slots=True)
+class TeslaFiHistoryColumn:
+    """A CSV column imported into the statistics of the matching sensor."""
+
+    key: str
+    """The raw TeslaFi field name, used both as column and sensor key."""
+    unit: str | None = None
+    """The unit of the CSV values."""
+    converter: type[BaseUnitConverter] | None = None
+    has_sum: bool = False
+    """Whether the sensor is a total (state and sum), rather than a measurement."""
+
+
+HISTORY_COLUMNS: tuple[TeslaFiHistoryColumn, ...] = (
+    TeslaFiHistoryColumn("battery_level", PERCENTAGE),
+    TeslaFiHistoryColumn("usable_battery_level", PERCENTAGE),
+    TeslaFiHistoryColumn("battery_range", UnitOfLength.MILES, DistanceConverter),
+    TeslaFiHistoryColumn(
+        "odometer", UnitOfLength.MILES, DistanceConverter, has_sum=True
+    ),
+    TeslaFiHistoryColumn(
+        "charge_energy_added",
+        UnitOfEnergy.KILO_WATT_HOUR,
+        EnergyConverter,
+        has_sum=True,
+    ),
+    TeslaFiHistoryColumn(
+        "inside_temp", UnitOfTemperature.CELSIUS, TemperatureConverter
+    ),
+    TeslaFiHistoryColumn(
+        "outside_temp", UnitOfTemperature.CELSIUS, TemperatureConverter
+    ),
+)
+
+
+@dataclass(slots=True)
+class _Target:
+    column: TeslaFiHistoryColumn
+    statistic_id: str
+    unit: str | None
+    """The sensor's current unit, which statistics are stored in."""
+
+    def converter(self) -> Callable[[Any], Any] | None:
+        """Converts values from the column's unit to the sensor's, if they differ."""
+        column = self.column
+        if not column.converter or not column.unit or not self.unit:
+            return None
+        if column.unit == self.unit:
+            return None
+        return column.converter.converter_factory(column.unit, self.unit)
+
+
+class _HourlyAggregate:
+    """
+    Hourly count, total, min, max and last value of one column.
+    Each chunk is bucketed with numpy; only the per-hour results are merged in
+    Python, so the cost per row stays in vectorized code.
+    """
+
+    __slots__ = ("_hours",)
+
+    def __init__(self) -> None:
+        # hour -> [count, total, min, max, last time, last value]
+        self._hours: dict[int, list[float]] = {}
+
+    def add(self, times: np.ndarray, values: np.ndarray) -> None:
+        """Add UTC timestamps (seconds) and values, skipping missing values."""
+        mask = np.isfinite(values) & (times >= 0)
+        if not mask.any():
+            return
+        times = times[mask]
+        values = values[mask]
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        values = values[order]
+        hours = times // 3600
+        starts = np.flatnonzero(np.r_[True, hours[1:] != hours[:-1]])
+        ends = np.r_[starts[1:], hours.size] - 1
+        counts = np.diff(np.r_[starts, hours.size])
+        totals = np.add.reduceat(values, starts)
+        mins = np.minimum.reduceat(values, starts)
+        maxs = np.maximum.reduceat(values, starts)
+
+        merged = self._hours
+        for hour, count, total, low, high, last_t, last in zip(
+            hours[starts].tolist(),
+            counts.tolist(),
+            totals.tolist(),
+            mins.tolist(),
+            maxs.tolist(),
+            times[ends].tolist(),
+            values[ends].tolist(),
+        ):
+            if (agg := merged.get(hour)) is None:
+                merged[hour] = [count, total, low, high, last_t, last]
+                continue
+            agg[0] += count
+            agg[1] += total
+            agg[2] = min(agg[2], low)
+            agg[3] = max(agg[3], high)
+            if last_t >= agg[4]:
+                agg[4] = last_t
+                agg[5] = last
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted hours, and the aggregates as columns of a 2D array."""
+        if not self._hours:
+            return np.empty(0, dtype=np.int64), np.empty((0, 6))
+        hours = np.fromiter(self._hours, dtype=np.int64, count=len(self._hours))
+        order = np.argsort(hours)
+        aggs = np.array(list(self._hours.values()), dtype=float)
+        return hours[order], aggs[order]
+
+
+def _floats(cells: list[str]) -> np.ndarray:
+    """Parse a column of CSV cells, with NaN for missing or invalid values."""
+    arr = np.array(cells)
+    arr = np.where(arr == "", "nan", arr)
+    try:
+        return arr.astype(float)
+    except ValueError:
+        return np.array([_float_or_nan(cell) for cell in cells], dtype=float)
+
+
+def _float_or_nan(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return np.nan
+
+
+def _timestamps(cells: list[str], tz: tzinfo) -> np.ndarray:
+    """Parse local TeslaFi dates into UTC epoch seconds, -1 if invalid."""
+    try:
+        local = np.array(cells, dtype="datetime64[s]")
+    except ValueError:
+        local = np.array([_datetime64_or_nat(cell) for cell in cells])
+    invalid = np.isnat(local)
+    seconds = np.where(invalid, 0, local.astype(np.int64))
+    # UTC offsets only change between hours, so they are looked up per local hour
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    offsets = np.array(
+        [
+            datetime.fromtimestamp(hour * 3600, UTC)
+            .replace(tzinfo=tz)
+            .utcoffset()
+            .total_seconds()
+            for hour in hours.tolist()
+        ]
+    )
+    utc = seconds - offsets[inverse].astype(np.int64)
+    utc[invalid] = -1
+    return utc
+
+
+def _datetime64_or_nat(cell: str) -> np.datetime64:
+    try:
+        return np.datetime64(cell, "s")
+    except ValueError:
+        return np.datetime64("NaT", "s")
+
+
+def read_history(
+    path: str,
+    columns: tuple[TeslaFiHistoryColumn, ...],
+    tz: tzinfo,
+) -> dict[str, _HourlyAggregate]:
+    """
+    Stream a TeslaFi CSV export in chunks, aggregating the columns hourly.
+    Memory is bounded by the chunk size and the number of hours, not rows.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        header = next(reader, None) or []
+        if DATE_COLUMN not in header:
+            raise ServiceValidationError(f"{path} has no {DATE_COLUMN} column")
+        date_index = header.index(DATE_COLUMN)
+        indexes = {
+            column.key: header.index(column.key)
+            for column in columns
+            if column.key in header
+        }
+        aggregates: dict[str, _HourlyAggregate] = {
+            key: _HourlyAggregate() for key in indexes
+        }
+        rows = 0
+        while chunk := list(islice(reader, HISTORY_CHUNK_ROWS)):
+            rows += len(chunk)
+            times = _timestamps(
+                [row[date_index] if len(row) > date_index else "" for row in chunk],
+                tz,
+            )
+            for key, index in indexes.items():
+                aggregates[key].add(
+                    times,
+                    _floats([row[index] if len(row) > index else "" for row in chunk]),
+                )
+    LOGGER.debug("Read %d rows of %s from %s", rows, list(indexes), path)
+    return aggregates
+
+
+def _first_existing(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime,
+) -> dict[str, Any] | None:
+    """The earliest existing hourly statistic at or after `start`."""
+    # Find the first month with data, then the first hour within it
+    months = statistics_during_period(
+        hass, start, None, {statistic_id}, "month", None, {"sum"}
+    ).get(statistic_id)
+    if not months:
+        return None
+    month = max(start, dt_util.utc_from_timestamp(months[0]["start"]))
+    hours = statistics_during_period(
+        hass,
+        month,
+        month + timedelta(days=32),
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    ).get(statistic_id)
+    return hours[0] if hours else None
+
+
+def _statistics(
+    hass: HomeAssistant,
+    target: _Target,
+    aggregate: _HourlyAggregate,
+) -> list[StatisticData]:
+    """
+    Hourly statistics for the hours before the sensor's own statistics begin.
+    Sums are offset so they continue seamlessly into the existing ones.
+    """
+    hours, aggs = aggregate.arrays()
+    if not hours.size:
+        return []
+    column = target.column
+    if convert := target.converter():
+        aggs[:, 1] = convert(aggs[:, 1] / aggs[:, 0]) * aggs[:, 0]
+        aggs[:, 2] = convert(aggs[:, 2])
+        aggs[:, 3] = convert(aggs[:, 3])
+        aggs[:, 5] = convert(aggs[:, 5])
+
+    start = dt_util.utc_from_timestamp(int(hours[0]) * 3600)
+    existing = _first_existing(hass, target.statistic_id, start)
+    if existing is not None:
+        keep = hours * 3600 < existing["start"]
+        hours = hours[keep]
+        aggs = aggs[keep]
+        if not hours.size:
+            return []
+
+    if not column.has_sum:
+        return [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(hour * 3600),
+                mean=total / count,
+                min=low,
+                max=high,
+            )
+            for hour, (count, total, low, high, _, _) in zip(
+                hours.tolist(), aggs.tolist()
+            )
+        ]
+
+    states = aggs[:, 5]
+    # Increases between hours; a drop is a reset (a new charge session)
+    steps = np.diff(states, prepend=states[0])
+    steps = np.where(steps < 0, states, steps)
+    sums = np.cumsum(steps)
+    if existing is not None and existing.get("sum") is not None:
+        step = (existing.get("state") or 0) - states[-1]
+        if step < 0:
+            step = existing.get("state") or 0
+        sums += existing["sum"] - step - sums[-1]
+    return [
+        StatisticData(
+            start=dt_util.utc_from_timestamp(hour * 3600),
+            state=state,
+            sum=total,
+        )
+        for hour, state, total in zip(hours.tolist(), states.tolist(), sums.tolist())
+    ]
+
+
+def _read_and_aggregate(
+    hass: HomeAssistant,
+    path: str,
+    targets: list[_Target],
+) -> dict[str, list[StatisticData]]:
+    """Runs in the recorder executor."""
+    aggregates = read_history(
+        path,
+        tuple(t.column for t in targets),
+        dt_util.get_default_time_zone(),
+    )
+    return {
+        target.statistic_id: _statistics(hass, target, aggregate)
+        for target in targets
+        if (aggregate := aggregates.get(target.column.key)) is not None
+    }
+
+
+@callback
+def async_history_targets(
+    hass: HomeAssistant, identity: TeslaFiVehicleIdentity
+) -> list[_Target]:
+    """The statistics of the vehicle's sensors that history can be imported into."""
+    registry = er.async_get(hass)
+    targets = []
+    for column in HISTORY_COLUMNS:
+        entity_id = registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, identity.unique_id(column.key)
+        )
+        if not entity_id or not (state := hass.states.get(entity_id)):
+            continue
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        targets.append(_Target(column, entity_id, unit))
+    return targets
+
+
+@callback
+def async_import_hourly(
+    hass: HomeAssistant,
+    targets: list[_Target],
+    statistics: dict[str, list[StatisticData]],
+) -> None:
+    """Queue hourly statistics for import, in large batches."""
+    by_id = {target.statistic_id: target for target in targets}
+    for statistic_id, rows in statistics.items():
+        if not rows:
+            continue
+        target = by_id[statistic_id]
+        metadata = StatisticMetaData(
+            has_mean=not target.column.has_sum,
+            has_sum=target.column.has_sum,
+            name=None,
+            source="recorder",
+            statistic_id=statistic_id,
+            unit_of_measurement=target.unit,
+        )
+        # Each batch is a single job in the recorder's queue
+        for i in range(0, len(rows), HISTORY_IMPORT_BATCH):
+            async_import_statistics(hass, metadata, rows[i : i + HISTORY_IMPORT_BATCH])
+        LOGGER.info("Importing %d hours of %s", len(rows), statistic_id)
+
+
+async def async_import_history(
+    hass: HomeAssistant, identity: TeslaFiVehicleIdentity, path: str
+) -> ServiceResponse:
+    """Import a TeslaFi CSV export into the statistics of a vehicle's sensors."""
+    if not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(f"Access to {path} is not allowed")
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError("The recorder is not loaded")
+
+    targets = async_history_targets(hass, identity)
+    try:
+        statistics = await get_instance(hass).async_add_executor_job(
+            _read_and_aggregate, hass, path, targets
+        )
+    except OSError as err:
+        raise ServiceValidationError(f"Unable to read {path}: {err}") from err
+    async_import_hourly(hass, targets, statistics)
+    return {
+        "imported": {
+            statistic_id: len(rows) for statistic_id, rows in statistics.items()
+        }
+    }
@@ -0,0 +1,267 @@
+"""TeslaFi snapshot journal"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timedelta
+import math
+import mmap
+import os
+import struct
+from typing import Any
+
+import numpy as np
+
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import JOURNAL_MAX_BYTES, LOGGER
+from .history import HISTORY_COLUMNS, _Target
+
+JOURNAL_MAGIC = b"TFJ1"
+# Magic, number of fields per record, number of records
+HEADER = struct.Struct("<4sIQ")
+# Fields with hourly statistics, plus what charge session inference needs
+JOURNAL_FIELDS: tuple[str, ...] = (
+    *(column.key for column in HISTORY_COLUMNS),
+    "chargeNumber",
+)
+
+# A journaled snapshot: its UTC timestamp, and its fields (NaN if missing)
+JournalRecord = tuple[float, dict[str, float]]
+
+
+def _float_or_nan(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class TeslaFiJournal:
+    """
+    Compact, append-only journal of vehicle snapshots, kept across restarts so
+    the data from before a downtime can be reconciled with the first fresh poll.
+
+    Records are fixed-size rows of float64: the data's timestamp, then each
+    journaled field. The file is preallocated and memory-mapped. It is sparse,
+    so even an append can wait for the disk to allocate a block: every method
+    that touches the file is blocking, and none is thread-safe. A full journal
+    is rotated to `<path>.1`, replacing the previous rotation, so disk usage is
+    bounded to twice the maximum size.
+    """
+
+    def __init__(self, path: str, max_bytes: int = JOURNAL_MAX_BYTES) -> None:
+        self.path = path
+        self._record = struct.Struct(f"<{1 + len(JOURNAL_FIELDS)}d")
+        self._capacity = (max_bytes - HEADER.size) // self._record.size
+        self._size = HEADER.size + self._capacity * self._record.size
+        self._map: mmap.mmap | None = None
+        self._count = 0
+        self._last_timestamp = -math.inf
+
+    def open(self) -> None:
+        """Open the journal, or start a new one. Blocking."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path, "r+b") as file:
+                header = file.read(HEADER.size)
+                if self._is_valid(header, os.fstat(file.fileno()).st_size):
+                    self._map = mmap.mmap(file.fileno(), self._size)
+                    self._count = HEADER.unpack(header)[2]
+                    if last := self.last():
+                        self._last_timestamp = last[0]
+                    return
+            # Written with a different layout or size: keep it for replay only
+            LOGGER.debug("Rotating incompatible journal %s", self.path)
+            os.replace(self.path, f"{self.path}.1")
+        self._create()
+
+    def close(self) -> None:
+        """Flush and close the journal. Blocking."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+
+    def rotate(self) -> None:
+        """Move the journal to `<path>.1` and start a new one. Blocking."""
+        self.close()
+        os.replace(self.path, f"{self.path}.1")
+        self._create()
+
+    def remove(self) -> None:
+        """Close and delete the journal and its rotation. Blocking."""
+        self.close()
+        for path in (self.path, f"{self.path}.1"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def append(self, timestamp: float, vehicle: Mapping[str, Any]) -> bool:
+        """
+        Journal a snapshot, unless it is not newer than the last one.
+        Returns False if the journal is full and must be rotated first. Blocking.
+        """
+        if self._map is None or timestamp <= self._last_timestamp:
+            return True
+        if self._count >= self._capacity:
+            return False
+        self._record.pack_into(
+            self._map,
+            HEADER.size + self._count * self._record.size,
+            timestamp,
+            *(_float_or_nan(vehicle.get(field)) for field in JOURNAL_FIELDS),
+        )
+        self._count += 1
+        HEADER.pack_into(self._map, 0, JOURNAL_MAGIC, len(JOURNAL_FIELDS), self._count)
+        self._last_timestamp = timestamp
+        return True
+
+    def last(self) -> JournalRecord | None:
+        """The most recent record in the current journal. Blocking."""
+        if self._map is None or not self._count:
+            return None
+        return self._unpack(
+            self._record.unpack_from(
+                self._map, HEADER.size + (self._count - 1) * self._record.size
+            )
+        )
+
+    @staticmethod
+    def values(vehicle: Mapping[str, Any]) -> dict[str, float]:
+        """The journaled fields of a snapshot."""
+        return {field: _float_or_nan(vehicle.get(field)) for field in JOURNAL_FIELDS}
+
+    def _is_valid(self, header: bytes, size: int) -> bool:
+        if len(header) < HEADER.size or size != self._size:
+            return False
+        magic, fields, count = HEADER.unpack(header)
+        return (
+            magic == JOURNAL_MAGIC
+            and fields == len(JOURNAL_FIELDS)
+            and count <= self._capacity
+        )
+
+    def _create(self) -> None:
+        with open(self.path, "w+b") as file:
+            file.write(HEADER.pack(JOURNAL_MAGIC, len(JOURNAL_FIELDS), 0))
+            # Sparse on most filesystems: blocks are allocated as records are added
+            file.truncate(self._size)
+            self._map = mmap.mmap(file.fileno(), self._size)
+        self._count = 0
+        self._last_timestamp = -math.inf
+
+    @staticmethod
+    def _unpack(row: tuple[float, ...]) -> JournalRecord:
+        return row[0], dict(zip(JOURNAL_FIELDS, row[1:]))
+
+
+def replay(path: str) -> Iterator[tuple[datetime, dict[str, float]]]:
+    """
+    All records of a journal and its rotation, oldest first. Blocking.
+    Intended for debugging, e.g. from a Python shell on the HA host.
+    """
+    record = struct.Struct(f"<{1 + len(JOURNAL_FIELDS)}d")
+    for file_path in (f"{path}.1", path):
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                continue
+            magic, fields, count = HEADER.unpack(header)
+            if magic != JOURNAL_MAGIC or fields != len(JOURNAL_FIELDS):
+                LOGGER.warning("Skipping incompatible journal %s", file_path)
+                continue
+            for row in record.iter_unpack(file.read(count * record.size)):
+                yield dt_util.utc_from_timestamp(row[0]), dict(
+                    zip(JOURNAL_FIELDS, row[1:])
+                )
+
+
+def backfill_statistics(
+    hass: HomeAssistant,
+    targets: list[_Target],
+    before: JournalRecord,
+    after: JournalRecord,
+) -> dict[str, list[StatisticData]]:
+    """
+    Hourly statistics for the hours fully within a downtime, interpolated
+    linearly between the last journaled snapshot and the first fresh one.
+    Hours that already have statistics are left untouched.
+    Runs in the recorder executor.
+    """
+    (t0, start), (t1, end) = before, after
+    hours = np.arange(math.ceil(t0 / 3600), math.floor(t1 / 3600))
+    if not hours.size:
+        return {}
+    first = dt_util.utc_from_timestamp(int(hours[0]) * 3600)
+    last = dt_util.utc_from_timestamp(int(hours[-1] + 1) * 3600)
+    ids = {target.statistic_id for target in targets}
+    existing = statistics_during_period(
+        hass, first, last, ids, "hour", None, {"state"}
+    )
+    previous = statistics_during_period(
+        hass, first - timedelta(days=1), first, ids, "hour", None, {"state", "sum"}
+    )
+
+    result: dict[str, list[StatisticData]] = {}
+    for target in targets:
+        key = target.column.key
+        v0, v1 = start.get(key, math.nan), end.get(key, math.nan)
+        if not (math.isfinite(v0) and math.isfinite(v1)):
+            continue
+        if convert := target.converter():
+            v0, v1 = float(convert(v0)), float(convert(v1))
+        taken = {row["start"] for row in existing.get(target.statistic_id, ())}
+        keep = ~np.isin(hours * 3600, list(taken))
+        kept = hours[keep]
+        if not kept.size:
+            continue
+        if target.column.has_sum:
+            rows = previous.get(target.statistic_id)
+            if v1 < v0 or not rows or rows[-1].get("sum") is None:
+                # A reset during the downtime can't be interpolated, and without
+                # a previous sum the backfilled ones would not line up
+                continue
+            base = rows[-1]
+            base_state = base.get("state") or 0
+            # State at the end of each hour
+            states = np.interp((kept + 1) * 3600, (t0, t1), (v0, v1))
+            sums = base["sum"] + np.maximum(states - base_state, 0)
+            result[target.statistic_id] = [
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(hour * 3600),
+                    state=state,
+                    sum=total,
+                )
+                for hour, state, total in zip(
+                    kept.tolist(), states.tolist(), sums.tolist()
+                )
+            ]
+            continue
+
+        mids = np.interp(kept * 3600 + 1800, (t0, t1), (v0, v1))
+        # Hour boundaries of each kept hour (they need not be consecutive)
+        lows = np.interp(kept * 3600, (t0, t1), (v0, v1))
+        highs = np.interp((kept + 1) * 3600, (t0, t1), (v0, v1))
+        result[target.statistic_id] = [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(hour * 3600),
+                mean=mean,
+                min=min(a, b),
+                max=max(a, b),
+            )
+            for hour, mean, a, b in zip(
+                kept.tolist(), mids.tolist(), lows.tolist(), highs.tolist()
+            )
+        ]
+    LOGGER.debug(
+        "Backfilling %s to %s: %s",
+        first,
+        last,
+        {statistic_id: len(rows) for statistic_id, rows in result.items()},
+    )
+    return result
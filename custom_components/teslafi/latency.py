@@ -0,0 +1,81 @@
+"""TeslaFi request latency tracking"""
+
+from collections import deque
+
+from .const import (
+    HTTP_READ_TIMEOUT,
+    HTTP_READ_TIMEOUT_MAX,
+    HTTP_READ_TIMEOUT_MIN,
+    LATENCY_HEDGE_QUANTILE,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_TIMEOUT_FACTOR,
+    LATENCY_TIMEOUT_QUANTILE,
+    LATENCY_WINDOW,
+)
+
+LATENCY_FEED = "feed"
+LATENCY_LAST_GOOD = "lastGood"
+LATENCY_COMMAND = "command"
+
+
+def latency_class(command: str) -> str:
+    """The class a command's latency is tracked under."""
+    if not command:
+        return LATENCY_FEED
+    if command == LATENCY_LAST_GOOD:
+        return LATENCY_LAST_GOOD
+    return LATENCY_COMMAND
+
+
+def _quantile(samples: list[float], q: float) -> float:
+    """Nearest-rank quantile of sorted samples."""
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class TeslaFiLatencyTracker:
+    """
+    Rolling request latencies per command class, used to derive read timeouts.
+
+    The timeout is a high quantile of the recent latencies times a safety
+    factor, clamped to fixed bounds. Requests that time out are recorded at
+    their timeout, so a slow network raises the timeout instead of failing
+    over and over at the same value.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+        # Sorted copies, invalidated whenever a class gets a new sample
+        self._sorted: dict[str, list[float]] = {}
+
+    def record(self, cls: str, seconds: float) -> None:
+        """Add the latency of a completed (or timed out) request."""
+        if (samples := self._samples.get(cls)) is None:
+            samples = self._samples[cls] = deque(maxlen=self._window)
+        samples.append(seconds)
+        self._sorted.pop(cls, None)
+
+    def quantile(self, cls: str, q: float) -> float | None:
+        """The latency quantile of a class, or None until enough samples exist."""
+        samples = self._samples.get(cls)
+        if not samples or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        if (ordered := self._sorted.get(cls)) is None:
+            ordered = self._sorted[cls] = sorted(samples)
+        return _quantile(ordered, q)
+
+    def timeout(self, cls: str) -> float:
+        """Read timeout for the next request of a class, in seconds."""
+        if (latency := self.quantile(cls, LATENCY_TIMEOUT_QUANTILE)) is None:
+            return HTTP_READ_TIMEOUT.total_seconds()
+        return min(
+            HTTP_READ_TIMEOUT_MAX.total_seconds(),
+            max(
+                HTTP_READ_TIMEOUT_MIN.total_seconds(),
+                latency * LATENCY_TIMEOUT_FACTOR,
+            ),
+        )
+
+    def hedge_delay(self, cls: str) -> float | None:
+        """How long to wait before hedging a request, or None to not hedge."""
+        return self.quantile(cls, LATENCY_HEDGE_QUANTILE)
@@ -0,0 +1,137 @@
+"""TeslaFi TPMS slow-leak detector"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .const import (
+    TPMS_LEAK_HALF_LIFE,
+    TPMS_LEAK_MIN_SPAN,
+    TPMS_LEAK_THRESHOLD_PSI,
+)
+from .model import TeslaFiVehicle
+
+TIRES = ("front_left", "front_right", "rear_left", "rear_right")
+
+# Atmospheric pressure in each TeslaFi pressure unit; TPMS reports gauge pressure.
+ATMOSPHERE = {
+    "psi": 14.696,
+    "kpa": 101.325,
+    "bar": 1.01325,
+    "mmhg": 760.0,
+}
+# Temperature that pressures are normalized to, in Kelvin (20 °C)
+REFERENCE_TEMP_K = 293.15
+
+
+@dataclass(slots=True)
+class _TireTrend:
+    """Exponentially weighted least-squares sums of (days, residual)."""
+
+    w: float = 0.0
+    t: float = 0.0
+    tt: float = 0.0
+    y: float = 0.0
+    ty: float = 0.0
+    leaking: bool = False
+
+    def decay(self, factor: float) -> None:
+        self.w *= factor
+        self.t *= factor
+        self.tt *= factor
+        self.y *= factor
+        self.ty *= factor
+
+    def add(self, t: float, y: float) -> None:
+        self.w += 1
+        self.t += t
+        self.tt += t * t
+        self.y += y
+        self.ty += t * y
+
+    @property
+    def span(self) -> float:
+        """Weighted standard deviation of the sample times, in days."""
+        if self.w <= 0:
+            return 0.0
+        var = self.tt / self.w - (self.t / self.w) ** 2
+        return var**0.5 if var > 0 else 0.0
+
+    @property
+    def slope(self) -> float | None:
+        """Residual pressure change per day."""
+        denom = self.w * self.tt - self.t * self.t
+        if denom <= 0:
+            return None
+        return (self.w * self.ty - self.t * self.y) / denom
+
+
+class TeslaFiTpmsLeakDetector:
+    """
+    Detects one tire losing pressure relative to the other three.
+
+    Pressures are normalized to 20 °C using `outside_temp` (Gay-Lussac),
+    then each tire is compared against the mean of the other three, which
+    cancels the shared seasonal and temperature trends. The residual's slope
+    is tracked with exponentially weighted regression sums, so each refresh is
+    O(1) and memory is a handful of floats per tire.
+    """
+
+    def __init__(self) -> None:
+        self._trends = {tire: _TireTrend() for tire in TIRES}
+        self._origin: datetime | None = None
+        self._last_time: datetime | None = None
+        self._last_sample: str | None = None
+
+    def is_leaking(self, tire: str) -> bool:
+        """Whether the tire is currently flagged as leaking."""
+        return self._trends[tire].leaking
+
+    def slope(self, tire: str) -> float | None:
+        """Normalized slope of the tire relative to the others, per day."""
+        trend = self._trends[tire]
+        return trend.slope if trend.span >= TPMS_LEAK_MIN_SPAN else None
+
+    def ingest(self, vehicle: TeslaFiVehicle, now: datetime) -> list[str]:
+        """Add a sample. Returns the tires that started leaking."""
+        if vehicle.is_in_gear:
+            # Tires heat unevenly while driving
+            return []
+        if (sample := vehicle.get("Date")) == self._last_sample:
+            # Data carried over from an earlier snapshot
+            return []
+        tpms = vehicle.tpms
+        pressures = [getattr(tpms, tire) for tire in TIRES]
+        outside = vehicle.get("outside_temp")
+        if None in pressures or not outside:
+            return []
+        self._last_sample = sample
+
+        atm = ATMOSPHERE.get((tpms.unit or "psi").lower(), ATMOSPHERE["psi"])
+        scale = REFERENCE_TEMP_K / (float(outside) + 273.15)
+        normalized = [(p + atm) * scale - atm for p in pressures]
+        total = sum(normalized)
+
+        if self._origin is None:
+            self._origin = now
+        days = (now - self._origin).total_seconds() / 86400
+        decay = 1.0
+        if self._last_time is not None:
+            elapsed = now - self._last_time
+            decay = 0.5 ** (elapsed / TPMS_LEAK_HALF_LIFE)
+        self._last_time = now
+
+        threshold = TPMS_LEAK_THRESHOLD_PSI * atm / ATMOSPHERE["psi"]
+        started = []
+        for tire, value in zip(TIRES, normalized):
+            trend = self._trends[tire]
+            trend.decay(decay)
+            # Compare against the mean of the other three tires
+            trend.add(days, value - (total - value) / 3)
+            if (slope := self.slope(tire)) is None:
+                continue
+            if not trend.leaking and slope < -threshold:
+                trend.leaking = True
+                started.append(tire)
+            elif trend.leaking and slope > -threshold / 2:
+                trend.leaking = False
+        return started
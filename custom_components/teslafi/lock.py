@@ -1,21 +1,32 @@
 """TeslaFi Locks."""
 
+from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.lock import LockEntity, LockState
+from homeassistant.components.lock import LockEntity, LockEntityDescription, LockState
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiLockEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
 from .const import DELAY_LOCKS, DELAY_WAKEUP, DOMAIN, LOGGER
 from .coordinator import TeslaFiCoordinator
 
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiLockEntityDescription(
+    LockEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Lock EntityDescription"""
+
+
 LOCKS = [
     TeslaFiLockEntityDescription(
         key="_locks",
         name="Lock",
         value=lambda d, h: d.is_locked,
+        fields=("locked",),
     ),
 ]
 
@@ -29,7 +40,13 @@ async def async_setup_entry(
     coordinator: TeslaFiCoordinator
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiLock] = []
-    entities.extend([TeslaFiLock(coordinator, description) for description in LOCKS])
+    entities.extend(
+        [
+            TeslaFiLock(coordinator, description)
+            for description in LOCKS
+            if coordinator.supports(description)
+        ]
+    )
     async_add_entities(entities)
 
 
@@ -1,15 +1,29 @@
 """TeslaFi Object Models"""
 
-from collections import UserDict
-from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
 import logging
+from time import monotonic
+from typing import Any, Self
 
 from typing_extensions import deprecated
 
-from homeassistant.const import UnitOfPressure
-
-from .const import SHIFTER_STATES, TESLAFI_DATE_FORMAT, VIN_YEARS
+from homeassistant.const import UnitOfPressure, UnitOfTemperature
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATE_CACHE_SIZE,
+    DATE_WARNING_INTERVAL,
+    DOMAIN,
+    FIELD_VERSIONS_MAX,
+    MANUFACTURER,
+    SHIFTER_STATES,
+    TESLAFI_DATE_FORMAT,
+    VIN_YEARS,
+)
 from .util import (
     _convert_to_bool,
     _int_or_none,
@@ -22,6 +36,55 @@ NAN: float = float("NaN")
 
 LOGGER = logging.getLogger(__package__)
 
+_date_warned_at: float | None = None
+
+
+def _parse_teslafi_date(value: str) -> datetime | None:
+    """
+    Parse a TeslaFi `YYYY-MM-DD HH:MM:SS` date in Home Assistant's time zone.
+
+    The format is fixed, so slicing is much cheaper than strptime, and the
+    same values are read many times per refresh, so recent results are cached
+    (per time zone, and for a few vehicles at once).
+    """
+    return _parse_date(value, dt_util.get_default_time_zone())
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(value: str, tz: tzinfo) -> datetime | None:
+    global _date_warned_at  # pylint: disable=global-statement
+
+    try:
+        if len(value) != 19 or value[4] != "-" or value[10] != " ":
+            raise ValueError(value)
+        parsed = datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            tzinfo=tz,
+        )
+    except ValueError:
+        now = monotonic()
+        if (
+            _date_warned_at is None
+            or now - _date_warned_at > DATE_WARNING_INTERVAL.total_seconds()
+        ):
+            _date_warned_at = now
+            LOGGER.warning(
+                "Failed to parse TeslaFi date %r, expected %s",
+                value,
+                TESLAFI_DATE_FORMAT,
+            )
+        else:
+            LOGGER.debug("Failed to parse TeslaFi date %r", value)
+        parsed = None
+
+    return parsed
+
+
 CHARGER_CONNECTED_STATES = [
     "charging",
     "complete",
@@ -30,6 +93,45 @@ CHARGER_CONNECTED_STATES = [
     "stopped",
 ]
 
+# Raw fields read by the derived properties below, for entity descriptions.
+CAR_STATE_FIELDS = ("carState",)
+GEAR_FIELDS = ("carState", "shift_state")
+CHARGING_FIELDS = ("charging_state",)
+CLIMATE_FIELDS = ("is_climate_on", "carState")
+CHARGER_FIELDS = (
+    "charging_state",
+    "charger_voltage",
+    "charger_actual_current",
+    "charger_power",
+    "fast_charger_present",
+)
+# Raw fields read by the coordinator itself (identity, polling, charge sessions,
+# analytics), which are stored whether or not an entity uses them.
+CORE_FIELDS = frozenset(
+    {
+        "vin",
+        "display_name",
+        "car_type",
+        "car_version",
+        "Date",
+        "tesla_request_counter",
+        "chargeNumber",
+        "battery_level",
+        "battery_range",
+        "outside_temp",
+        "pressure",
+        "tpms_front_left",
+        "tpms_front_right",
+        "tpms_rear_left",
+        "tpms_rear_right",
+        "sentry_mode",
+        "climate_keeper_mode",
+        *GEAR_FIELDS,
+        *CLIMATE_FIELDS,
+        *CHARGER_FIELDS,
+    }
+)
+
 
 @dataclass
 class TeslaFiTirePressure:
@@ -53,19 +155,225 @@ class TeslaFiTirePressure:
         return unit_mapping.get(unit.lower(), None) if unit else None
 
 
-class TeslaFiVehicle(UserDict):
-    """TeslaFi Vehicle Data"""
+class _Overlay(Mapping):
+    """
+    Read-only mapping of recent changes layered over a shared base dict.
+
+    Successive snapshot versions share the base, and only copy the (small)
+    changes. Once the changes grow past a quarter of the base, they are
+    flattened into a new base, so lookups never go deeper than two dicts.
+    """
+
+    __slots__ = ("_base", "_changes")
+
+    def __init__(self, base: dict[str, Any], changes: dict[str, Any]) -> None:
+        self._base = base
+        self._changes = changes
 
-    def update_non_empty(self, data) -> None:
-        """Update this object with non-empty data from `data`."""
-        if (api_request_counts := data.pop("tesla_request_counter", {})):
-            super().update(api_request_counts)
-        if not self.data:
-            # Start out with all fields
-            super().update(data)
+    @classmethod
+    def layer(cls, stored: Mapping[str, Any], updates: dict[str, Any]) -> Mapping:
+        """`stored` with `updates` applied, sharing as much of `stored` as possible."""
+        if not updates:
+            return stored
+        if isinstance(stored, _Overlay):
+            base, changes = stored._base, stored._changes | updates
         else:
-            filtered = {k: v for (k, v) in data.items() if v}
-            super().update(filtered)
+            base, changes = stored, updates
+        if len(changes) * 4 > len(base):
+            return base | changes
+        return cls(base, changes)
+
+    def __getitem__(self, key: str) -> Any:
+        changes = self._changes
+        return changes[key] if key in changes else self._base[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        changes = self._changes
+        return changes[key] if key in changes else self._base.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._changes or key in self._base
+
+    def __iter__(self):
+        yield from self._base
+        yield from (k for k in self._changes if k not in self._base)
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for k in self._changes if k not in self._base)
+
+
+class TeslaFiVehicle(Mapping):
+    """
+    TeslaFi Vehicle Data
+
+    Snapshots are immutable: merging new data returns a new version, which
+    shares the unchanged fields with the version it was merged from. They are
+    read-only mappings rather than dicts, so there is no copy, update or `|`.
+    """
+
+    previous: "TeslaFiVehicle | None"
+    """
+    The version this one was merged from, without its own `previous`, so
+    older versions are not kept.
+    """
+
+    def __init__(self, data=None, /) -> None:
+        # Takes ownership of `data`, which is usually a freshly decoded response
+        self.data = data if isinstance(data, dict) else dict(data or {})
+        # Per-field version vector: field -> version of the last non-empty merge,
+        # and version -> merge timestamp (only for versions still referenced).
+        self._field_versions: dict[str, int] = {}
+        self._version_times: dict[int, float] = {}
+        self._version = 0
+        self.previous = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.data)!r})"
+
+    def _derive(
+        self,
+        data: Mapping[str, Any],
+        field_versions: dict[str, int],
+        version_times: dict[int, float],
+        version: int,
+        previous: "TeslaFiVehicle | None",
+    ) -> Self:
+        vehicle = object.__new__(type(self))
+        vehicle.data = data
+        vehicle._field_versions = field_versions
+        vehicle._version_times = version_times
+        vehicle._version = version
+        vehicle.previous = previous
+        return vehicle
+
+    def _without_history(self) -> Self:
+        """This version, unlinked from the versions before it."""
+        if self.previous is None:
+            return self
+        vehicle = object.__new__(type(self))
+        vehicle.__dict__.update(self.__dict__)
+        vehicle.previous = None
+        return vehicle
+
+    def merged(
+        self,
+        data: Mapping[str, Any],
+        now: datetime | None = None,
+        keys: Collection[str] | None = None,
+    ) -> tuple[Self, dict[str, Any]]:
+        """
+        A new version of this snapshot, with non-empty data from `data` merged in.
+        If `keys` is given, only those fields are stored.
+
+        Also returns the fields whose value changed, mapped to their previous
+        value (None if the field was not stored before).
+        """
+        version = self._version + 1
+        stored = self.data
+        updates: dict[str, Any] = {}
+        touched: list[str] = []
+        changed: dict[str, Any] = {}
+        # Start out with all fields, empty or not
+        keep_empty = not stored
+        if isinstance(data, TeslaFiVehicle):
+            data = data.data
+
+        for key, value in data.items():
+            if key == "tesla_request_counter":
+                # Counters are merged as top-level fields
+                for name, count in (value or {}).items():
+                    if keys is not None and name not in keys:
+                        continue
+                    if (old := stored.get(name)) != count:
+                        changed[name] = old
+                        updates[name] = count
+                    touched.append(name)
+                continue
+            if not value and not keep_empty:
+                continue
+            if keys is not None and key not in keys:
+                continue
+            if (old := stored.get(key)) != value or key not in stored:
+                changed[key] = old
+                updates[key] = value
+            if value:
+                touched.append(key)
+
+        field_versions = self._field_versions | dict.fromkeys(touched, version)
+        version_times = self._version_times | {
+            version: (now or dt_util.utcnow()).timestamp()
+        }
+        if len(version_times) > FIELD_VERSIONS_MAX:
+            live = set(field_versions.values())
+            version_times = {v: t for (v, t) in version_times.items() if v in live}
+        vehicle = self._derive(
+            _Overlay.layer(stored, updates),
+            field_versions,
+            version_times,
+            version,
+            # Only one version of history is kept, so older ones can be reclaimed
+            self._without_history(),
+        )
+        return vehicle, changed
+
+    def retained(self, keys: Collection[str]) -> Self:
+        """A copy of this snapshot with only the fields in `keys`."""
+        return self._derive(
+            {k: v for (k, v) in self.data.items() if k in keys},
+            {k: v for (k, v) in self._field_versions.items() if k in keys},
+            self._version_times,
+            self._version,
+            # Same version with fewer fields: link to the actual previous version
+            self.previous,
+        )
+
+    @property
+    def last_merged(self) -> datetime | None:
+        """When data was last merged into this snapshot."""
+        if not (stamp := self._version_times.get(self._version)):
+            return None
+        return dt_util.utc_from_timestamp(stamp)
+
+    def field_updated(self, key: str) -> datetime | None:
+        """When `key` last received a non-empty value, if ever."""
+        if (version := self._field_versions.get(key)) is None:
+            return None
+        return dt_util.utc_from_timestamp(self._version_times[version])
+
+    def field_age(self, key: str, now: datetime | None = None) -> timedelta | None:
+        """How long ago `key` last received a non-empty value, if ever."""
+        if (updated := self.field_updated(key)) is None:
+            return None
+        return (now or dt_util.utcnow()) - updated
+
+    def stale_fields(
+        self,
+        keys: Iterable[str],
+        max_age: timedelta,
+        now: datetime | None = None,
+    ) -> set[str]:
+        """Fields in `keys` that are missing, or older than `max_age`."""
+        now = now or dt_util.utcnow()
+        return {
+            key
+            for key in keys
+            if (age := self.field_age(key, now)) is None or age > max_age
+        }
 
     @property
     @deprecated("Use .vin instead")
@@ -84,6 +392,11 @@ class TeslaFiVehicle(UserDict):
         """Odometer"""
         return float(self.get("odometer", NAN))
 
+    @property
+    def battery_range(self) -> float | None:
+        """Rated battery range"""
+        return float(r) if (r := self.get("battery_range", None)) else None
+
     @property
     def firmware_version(self) -> str | None:
         """Firmware version"""
@@ -100,16 +413,8 @@ class TeslaFiVehicle(UserDict):
 
     @property
     def last_remote_update(self) -> datetime | None:
-        """Last remote update."""
-        try:
-            return (
-                datetime.strptime(s, TESLAFI_DATE_FORMAT)
-                if (s := self.get("Date", None))
-                else None
-            )
-        except ValueError:
-            LOGGER.warning("Failed to parse TeslaFi date: %s", s)
-            return None
+        """Last remote update, in Home Assistant's time zone."""
+        return _parse_teslafi_date(s) if (s := self.get("Date", None)) else None
 
     @property
     def car_type(self) -> str | None:
@@ -254,6 +559,16 @@ class TeslaFiVehicle(UserDict):
             and self.get("is_climate_on") == "2" 
         )
 
+    @property
+    def temperature_unit(self) -> UnitOfTemperature:
+        """
+        The unit of the TeslaFi account (settings > account > measurements),
+        which temperature commands expect. Reported temperatures are in Celsius.
+        """
+        if self.get("temperature", "C") == "F":
+            return UnitOfTemperature.FAHRENHEIT
+        return UnitOfTemperature.CELSIUS
+
     @property
     def tpms(self) -> TeslaFiTirePressure:
         """TPMS state(s): (front-left, front-right, rear-left, rear-right)."""
@@ -280,3 +595,57 @@ class TeslaFiVehicle(UserDict):
             ),
             unit=self.get("pressure", "psi"),
         )
+
+
+@dataclass(frozen=True, slots=True)
+class TeslaFiVehicleIdentity:
+    """
+    Per-vehicle metadata shared by all entities: built once, and rebuilt only
+    when `display_name` or `car_version` change.
+    """
+
+    vin: str
+    display_name: str | None
+    firmware_version: str | None
+    name: str
+    car_type: str | None
+    model_year: int | None
+    device_info: DeviceInfo = field(compare=False)
+
+    @classmethod
+    def from_vehicle(cls, vehicle: TeslaFiVehicle) -> Self:
+        """Decode the identity of a vehicle snapshot."""
+        car_type = vehicle.car_type
+        model_year = vehicle.model_year
+        name = vehicle.name
+        return cls(
+            vin=vehicle.vin,
+            display_name=vehicle.get("display_name", None),
+            firmware_version=vehicle.firmware_version,
+            name=name,
+            car_type=car_type,
+            model_year=model_year,
+            device_info=DeviceInfo(
+                identifiers={(DOMAIN, vehicle.vin)},
+                configuration_url="https://www.teslafi.com/",
+                manufacturer=MANUFACTURER,
+                model=car_type,
+                name=name,
+                sw_version=vehicle.firmware_version,
+                # TODO: model year, trim? Convert car_type to sentence case?
+                hw_version=f"{model_year} {car_type or 'Tesla'}",
+                suggested_area="Garage",
+            ),
+        )
+
+    def matches(self, vehicle: TeslaFiVehicle) -> bool:
+        """Whether this identity is still current for the vehicle snapshot."""
+        return (
+            self.firmware_version == vehicle.firmware_version
+            and self.display_name == vehicle.get("display_name", None)
+            and self.vin == vehicle.get("vin")
+        )
+
+    def unique_id(self, key: str) -> str:
+        """Unique id of an entity of this vehicle."""
+        return f"{self.vin}-{key}"
@@ -1,11 +1,33 @@
-from homeassistant.components.number import NumberEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+from numbers import Number
+
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfElectricCurrent
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from .base import TeslaFiEntity, TeslaFiNumberEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
 from .coordinator import TeslaFiCoordinator
 from .const import DOMAIN, LOGGER
+from .model import CHARGER_FIELDS
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiNumberEntityDescription(
+    NumberEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Number EntityDescription"""
+
+    convert: Callable[[any], int] = lambda v: int(v) if v else None
+    cmd: Callable[[TeslaFiCoordinator, Number], dict] = None
+
+    max_value_key: str = None
+    """
+    If specified, look up this key for the max value,
+    otherwise fall back to max_value.
+    """
 
 
 NUMBERS = [
@@ -21,6 +43,7 @@ NUMBERS = [
         native_step=1,
         max_value_key="charge_limit_soc_max",
         cmd=lambda c, v: c.execute_command("set_charge_limit", charge_limit_soc=v),
+        fields=("charge_limit_soc", "charge_limit_soc_max"),
     ),
     TeslaFiNumberEntityDescription(
         key="charge_current_request",
@@ -40,6 +63,11 @@ NUMBERS = [
         max_value_key="charge_current_request_max",
         cmd=lambda c, v: c.execute_command("set_charging_amps", charging_amps=v),
         available=lambda u, v, h: u and v.is_plugged_in,
+        fields=(
+            "charge_current_request",
+            "charge_current_request_max",
+            *CHARGER_FIELDS,
+        ),
     ),
 ]
 
@@ -84,6 +112,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiNumber] = []
     entities.extend(
-        [TeslaFiNumber(coordinator, description) for description in NUMBERS]
+        [
+            TeslaFiNumber(coordinator, description)
+            for description in NUMBERS
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
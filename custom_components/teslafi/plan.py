@@ -0,0 +1,120 @@
+"""TeslaFi entity evaluation plan"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.typing import StateType
+
+from .const import LOGGER
+from .util import _FieldGetter, _identity
+
+if TYPE_CHECKING:
+    from .base import TeslaFiBaseEntityDescription
+    from .coordinator import TeslaFiCoordinator
+
+
+@dataclass(slots=True)
+class TeslaFiEvaluation:
+    """Precomputed state of one entity description."""
+
+    value: StateType
+    available: bool
+    unit: str | None = None
+
+
+class TeslaFiEvaluationPlan:
+    """
+    All registered entity descriptions, compiled into a single pass over the
+    vehicle snapshot. Entities read their precomputed value, availability and
+    unit instead of evaluating their description one by one.
+    """
+
+    def __init__(self, descriptions: Iterable[TeslaFiBaseEntityDescription]) -> None:
+        # Default Callables are dropped at compile time, so the loop below
+        # only calls what actually transforms the data.
+        self._steps = [
+            (
+                id(d),
+                d.key,
+                # Only descriptions with known raw fields can be skipped
+                frozenset(d.fields) if d.fields else None,
+                d.coordinator_value,
+                d.value.key if isinstance(d.value, _FieldGetter) else None,
+                d.value,
+                None if d.convert is _identity else d.convert,
+                d.available,
+                getattr(d, "fix_unit", None),
+            )
+            for d in descriptions
+        ]
+        self._upstream: bool | None = None
+        self.results: dict[int, TeslaFiEvaluation] = {}
+        self.evaluated: set[int] = set()
+        """Descriptions evaluated in the last pass; the others kept their result."""
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def evaluate(
+        self,
+        coordinator: TeslaFiCoordinator,
+        changed: Collection[str] | None = None,
+    ) -> None:
+        """
+        Evaluate the descriptions against the coordinator's current data.
+        If `changed` is given, descriptions that read none of those fields keep
+        their previous result.
+        """
+        start = perf_counter()
+        data = coordinator.data
+        hass = coordinator.hass
+        upstream = coordinator.last_update_success
+        if upstream != self._upstream:
+            # Availability of every description depends on it
+            changed = None
+        self._upstream = upstream
+        previous = self.results
+        results: dict[int, TeslaFiEvaluation] = {}
+        evaluated: set[int] = set()
+
+        for step in self._steps:
+            key, name, fields, derived, field, value, convert, available, unit = step
+            if (
+                changed is not None
+                and fields is not None
+                and key in previous
+                and fields.isdisjoint(changed)
+            ):
+                results[key] = previous[key]
+                continue
+            evaluated.add(key)
+            try:
+                if derived:
+                    raw: Any = derived(coordinator)
+                elif field:
+                    raw = data.get(field)
+                else:
+                    raw = value(data, hass)
+                if convert:
+                    raw = convert(raw)
+                results[key] = TeslaFiEvaluation(
+                    raw,
+                    bool(available(upstream, data, hass)) if available else upstream,
+                    unit(data, hass) if unit else None,
+                )
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.debug("Error evaluating %s", name, exc_info=True)
+                results[key] = TeslaFiEvaluation(None, False)
+
+        self.results = results
+        self.evaluated = evaluated
+        LOGGER.debug(
+            "Evaluated %d of %d descriptions in %.3f ms",
+            len(evaluated),
+            len(self._steps),
+            (perf_counter() - start) * 1000,
+        )
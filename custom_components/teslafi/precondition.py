@@ -0,0 +1,311 @@
+"""TeslaFi climate preconditioning planner"""
+
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    PRECONDITION_DEADBAND,
+    PRECONDITION_DEFAULT_RATE,
+    PRECONDITION_FORGET,
+    PRECONDITION_MAX_LEAD,
+    PRECONDITION_MAX_SAMPLE_GAP,
+    PRECONDITION_MIN_LEAD,
+    PRECONDITION_MIN_RATE,
+    PRECONDITION_MIN_SAMPLES,
+    PRECONDITION_STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+)
+from .coordinator import TeslaFiCoordinator
+from .model import CLIMATE_FIELDS, TeslaFiVehicle
+from .util import _number_or_none
+
+# Required from the coordinator, so that these fields are kept
+PRECONDITION_FIELDS = (
+    "inside_temp",
+    "outside_temp",
+    "driver_temp_setting",
+    "temperature",
+    *CLIMATE_FIELDS,
+)
+
+
+@dataclass(slots=True)
+class _RateModel:
+    """
+    Online least squares fit of the rate (°C per minute) at which the cabin
+    approaches the setpoint, as a linear function of how much warmer it is
+    outside than inside. Older samples are gradually forgotten, so the fit
+    follows the seasons.
+    """
+
+    n: float = 0.0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxx: float = 0.0
+    sxy: float = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        """Add an observed rate `y` at outside minus inside temperature `x`."""
+        f = PRECONDITION_FORGET
+        self.n = self.n * f + 1
+        self.sx = self.sx * f + x
+        self.sy = self.sy * f + y
+        self.sxx = self.sxx * f + x * x
+        self.sxy = self.sxy * f + x * y
+
+    def rate(self, x: float) -> float | None:
+        """The predicted rate at `x`, once there are enough samples."""
+        if self.n < PRECONDITION_MIN_SAMPLES:
+            return None
+        det = self.n * self.sxx - self.sx * self.sx
+        if det <= 1e-9 * self.n * self.n:
+            # All samples at about the same temperatures: just the mean
+            return self.sy / self.n
+        slope = (self.n * self.sxy - self.sx * self.sy) / det
+        return (self.sy - slope * self.sx) / self.n + slope * x
+
+
+class TeslaFiPreconditioner:
+    """
+    Starts the climate just in time for a departure.
+
+    Warm-up and cool-down rates are learned from the snapshots while the
+    climate is on, from how fast the inside temperature approaches the
+    setpoint. A prediction is a few float operations, so the start time is
+    re-evaluated on every refresh as the temperatures change, and the climate
+    is started once, at the latest time that still reaches the target.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TeslaFiCoordinator,
+        entry_id: str,
+    ) -> None:
+        self._hass = hass
+        self.coordinator = coordinator
+        self._store = _store(hass, entry_id)
+        self._warm = _RateModel()
+        self._cool = _RateModel()
+        # (timestamp, inside, setpoint) of the last snapshot with climate on
+        self._sample: tuple[float, float, float] | None = None
+        # (departure, target temperature in °C), until started
+        self._plan: tuple[datetime, float] | None = None
+        self._unsub_start: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the learned rates."""
+        if data := await self._store.async_load():
+            self._warm = _RateModel(*data.get("warm", ()))
+            self._cool = _RateModel(*data.get("cool", ()))
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start learning and planning. Returns a callback to stop."""
+        unsubs = [
+            self.coordinator.async_require_fields(PRECONDITION_FIELDS),
+            self.coordinator.async_add_listener(self._async_on_update),
+        ]
+
+        @callback
+        def _cancel() -> None:
+            for unsub in unsubs:
+                unsub()
+            self._cancel_start()
+
+        return _cancel
+
+    def lead_time(self, inside: float, outside: float, target: float) -> timedelta:
+        """How long the climate needs to bring the cabin to `target`."""
+        delta = target - inside
+        if abs(delta) < PRECONDITION_DEADBAND:
+            return PRECONDITION_MIN_LEAD
+        model = self._warm if delta > 0 else self._cool
+        rate = model.rate(outside - (inside + target) / 2)
+        if rate is None:
+            rate = PRECONDITION_DEFAULT_RATE
+        minutes = abs(delta) / max(rate, PRECONDITION_MIN_RATE)
+        return min(
+            max(timedelta(minutes=minutes), PRECONDITION_MIN_LEAD),
+            PRECONDITION_MAX_LEAD,
+        )
+
+    def start_time(self, departure: datetime, target: float) -> datetime | None:
+        """The latest start for a departure, with the current temperatures."""
+        vehicle = self.coordinator.data
+        inside = _number_or_none(vehicle.get("inside_temp"))
+        outside = _number_or_none(vehicle.get("outside_temp"))
+        if inside is None:
+            return None
+        if outside is None:
+            outside = inside
+        return departure - self.lead_time(inside, outside, target)
+
+    @callback
+    def async_plan(self, departure: datetime, target: float) -> datetime | None:
+        """Plan preconditioning for a departure. Returns the predicted start."""
+        self._plan = (departure, target)
+        return self._evaluate(dt_util.utcnow())
+
+    @callback
+    def _async_on_update(self) -> None:
+        vehicle = self.coordinator.data
+        self._learn(vehicle)
+        if self._plan is not None:
+            self._evaluate(dt_util.utcnow())
+
+    @callback
+    def _async_on_start(self, now: datetime) -> None:
+        self._unsub_start = None
+        self._evaluate(now)
+
+    def _learn(self, vehicle: TeslaFiVehicle) -> None:
+        inside = _number_or_none(vehicle.get("inside_temp"))
+        outside = _number_or_none(vehicle.get("outside_temp"))
+        setpoint = _number_or_none(vehicle.get("driver_temp_setting"))
+        updated = vehicle.last_remote_update
+        if (
+            not vehicle.is_climate_on
+            or inside is None
+            or setpoint is None
+            or updated is None
+        ):
+            self._sample = None
+            return
+        stamp = updated.timestamp()
+        if (previous := self._sample) is not None:
+            elapsed = stamp - previous[0]
+            if elapsed <= 0:
+                return
+            before, previous_setpoint = previous[1], previous[2]
+            gap = previous_setpoint - before
+            if (
+                elapsed <= PRECONDITION_MAX_SAMPLE_GAP.total_seconds()
+                and setpoint == previous_setpoint
+                and abs(gap) >= PRECONDITION_DEADBAND
+            ):
+                # Toward the setpoint is positive, whether warming or cooling
+                rate = (inside - before) / (elapsed / 60) * (1 if gap > 0 else -1)
+                x = (outside if outside is not None else inside) - (
+                    (inside + before) / 2
+                )
+                (self._warm if gap > 0 else self._cool).add(x, rate)
+                self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        self._sample = (stamp, inside, setpoint)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"warm": list(astuple(self._warm)), "cool": list(astuple(self._cool))}
+
+    def _cancel_start(self) -> None:
+        if self._unsub_start is not None:
+            self._unsub_start()
+            self._unsub_start = None
+
+    @callback
+    def _evaluate(self, now: datetime) -> datetime | None:
+        self._cancel_start()
+        if self._plan is None:
+            return None
+        departure, target = self._plan
+        if now >= departure:
+            LOGGER.debug("Departure passed, dropping the preconditioning plan")
+            self._plan = None
+            return None
+        if (start := self.start_time(departure, target)) is None:
+            return None
+        if now < start:
+            # Refreshes may be far apart while the car sleeps
+            self._unsub_start = async_track_point_in_utc_time(
+                self._hass, self._async_on_start, start
+            )
+            return start
+        self._plan = None
+        self._hass.async_create_background_task(
+            self._async_precondition(target), "teslafi preconditioning"
+        )
+        return start
+
+    async def _async_precondition(self, target: float) -> None:
+        vehicle = self.coordinator.data
+        LOGGER.debug("Preconditioning to %s°C", target)
+        try:
+            setpoint = _number_or_none(vehicle.get("driver_temp_setting"))
+            if setpoint is None or abs(setpoint - target) >= PRECONDITION_DEADBAND:
+                # TeslaFi expects the account's units, like the climate entity
+                temperature = TemperatureConverter.convert(
+                    target,
+                    from_unit=UnitOfTemperature.CELSIUS,
+                    to_unit=vehicle.temperature_unit,
+                )
+                await self.coordinator.execute_command(
+                    "set_temps", background=True, temp=temperature
+                )
+            await self.coordinator.execute_command(
+                "auto_conditioning_start", background=True
+            )
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Preconditioning failed", exc_info=True)
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, PRECONDITION_STORAGE_VERSION, f"{DOMAIN}.climate.{entry_id}")
+
+
+async def async_remove_preconditioning(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the learned rates of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+async def _async_get_preconditioner(
+    coordinator: TeslaFiCoordinator,
+) -> TeslaFiPreconditioner:
+    """The vehicle's preconditioner, created and started on first use."""
+    if coordinator.preconditioner is None:
+        entry = coordinator.config_entry
+        preconditioner = TeslaFiPreconditioner(
+            coordinator.hass, coordinator, entry.entry_id
+        )
+        await preconditioner.async_load()
+        if coordinator.preconditioner is None:
+            coordinator.preconditioner = preconditioner
+            entry.async_on_unload(preconditioner.async_start())
+            if any(field not in coordinator.data for field in PRECONDITION_FIELDS):
+                # Fields no entity uses are only stored from now on
+                await coordinator.async_refresh()
+    return coordinator.preconditioner
+
+
+async def async_precondition(
+    coordinator: TeslaFiCoordinator, departure: datetime, target: float | None
+) -> ServiceResponse:
+    """Plan preconditioning for a departure, to `target` in the user's unit."""
+    departure = dt_util.as_utc(departure)
+    if departure <= dt_util.utcnow():
+        raise ServiceValidationError("The departure must be in the future")
+    preconditioner = await _async_get_preconditioner(coordinator)
+    if target is not None:
+        target = TemperatureConverter.convert(
+            target,
+            from_unit=coordinator.hass.config.units.temperature_unit,
+            to_unit=UnitOfTemperature.CELSIUS,
+        )
+    elif (
+        target := _number_or_none(coordinator.data.get("driver_temp_setting"))
+    ) is None:
+        raise ServiceValidationError("No target temperature")
+
+    start = preconditioner.async_plan(departure, target)
+    return {"start": start.isoformat() if start else None}
@@ -0,0 +1,240 @@
+"""TeslaFi pre-wake, learned from command history"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DELAY_WAKEUP,
+    DOMAIN,
+    LOGGER,
+    PREWAKE_BIN,
+    PREWAKE_HISTORY,
+    PREWAKE_LEAD,
+    PREWAKE_MIN_DAYS,
+    STORAGE_SAVE_DELAY,
+    PREWAKE_STORAGE_VERSION,
+)
+from .coordinator import TeslaFiCoordinator
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, PREWAKE_STORAGE_VERSION, f"{DOMAIN}.prewake.{entry_id}")
+
+
+async def async_remove_prewake(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored command history of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiPreWakeSlot:
+    """A time of day at which commands are usually sent."""
+
+    key: str
+    """Start of the time bin, as HHMM."""
+
+    at: time
+    """When to wake the car, in local time."""
+
+    weekdays: frozenset[int]
+    """Days of the week (Monday is 0) with commands in this bin."""
+
+    days: int
+    """Number of days with commands in this bin."""
+
+    commands: tuple[str, ...]
+
+
+def learn_slots(
+    commands: list[tuple[float, str]],
+    now: datetime,
+) -> dict[str, TeslaFiPreWakeSlot]:
+    """
+    Time bins in which commands were sent on at least a few different days.
+    The pre-wake is a little before the earlier commands of the bin, so that
+    most of them run against an awake car.
+    """
+    bin_minutes = int(PREWAKE_BIN.total_seconds() // 60)
+    since = (now - PREWAKE_HISTORY).timestamp()
+    # bin -> (dates, minutes of the day, commands)
+    bins: dict[int, tuple[set, list[int], set[str]]] = {}
+    for stamp, cmd in commands:
+        if stamp < since:
+            continue
+        local = dt_util.as_local(dt_util.utc_from_timestamp(stamp))
+        minute = local.hour * 60 + local.minute
+        dates, minutes, cmds = bins.setdefault(
+            minute // bin_minutes, (set(), [], set())
+        )
+        dates.add(local.date())
+        minutes.append(minute)
+        cmds.add(cmd)
+
+    slots: dict[str, TeslaFiPreWakeSlot] = {}
+    lead = int(PREWAKE_LEAD.total_seconds() // 60)
+    for index, (dates, minutes, cmds) in sorted(bins.items()):
+        if len(dates) < PREWAKE_MIN_DAYS:
+            continue
+        start = index * bin_minutes
+        # Lower quartile, so one late command doesn't delay the wake
+        wake = max(sorted(minutes)[len(minutes) // 4] - lead, 0)
+        key = f"{start // 60:02d}{start % 60:02d}"
+        slots[key] = TeslaFiPreWakeSlot(
+            key=key,
+            at=time(wake // 60, wake % 60),
+            weekdays=frozenset(date.weekday() for date in dates),
+            days=len(dates),
+            commands=tuple(sorted(cmds)),
+        )
+    return slots
+
+
+class TeslaFiPreWake:
+    """
+    Learns when commands are usually sent (e.g. morning climate, evening charge
+    start), and wakes a sleeping car shortly before, so those commands don't
+    wait for it to wake up.
+
+    The wake is low priority: it is skipped if the car is already awake, if the
+    command budget is spent, or if the user opted out of that time. The command
+    history and opt-outs are kept in storage, across restarts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TeslaFiCoordinator,
+        entry_id: str,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store = _store(hass, entry_id)
+        self._commands: list[tuple[float, str]] = []
+        self._disabled: set[str] = set()
+        self.slots: dict[str, TeslaFiPreWakeSlot] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_wake: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the command history and opt-outs."""
+        if data := await self._store.async_load():
+            self._commands = [tuple(command) for command in data.get("commands", ())]
+            self._disabled = set(data.get("disabled", ()))
+        self._relearn(dt_util.utcnow())
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start waking the car. Returns a callback to stop."""
+        self._schedule(dt_util.utcnow())
+
+        @callback
+        def _cancel() -> None:
+            if self._unsub_wake is not None:
+                self._unsub_wake()
+                self._unsub_wake = None
+
+        return _cancel
+
+    @callback
+    def async_add_listener(self, update: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for changes to the learned slots."""
+        self._listeners.append(update)
+        return lambda: self._listeners.remove(update)
+
+    def is_enabled(self, key: str) -> bool:
+        """Whether the car is woken for a slot."""
+        return key not in self._disabled
+
+    @callback
+    def async_set_enabled(self, key: str, enabled: bool) -> None:
+        """Opt in or out of a slot."""
+        if enabled:
+            self._disabled.discard(key)
+        else:
+            self._disabled.add(key)
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        self._schedule(dt_util.utcnow())
+
+    @callback
+    def record(self, cmd: str) -> None:
+        """Record a command sent by the user."""
+        now = dt_util.utcnow()
+        self._commands.append((now.timestamp(), cmd))
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        self._relearn(now)
+        self._schedule(now)
+
+    def next_wake(self, now: datetime) -> datetime | None:
+        """The next pre-wake after `now`, of the enabled slots."""
+        local = dt_util.as_local(now)
+        upcoming = [
+            moment
+            for slot in self.slots.values()
+            if self.is_enabled(slot.key)
+            for offset in range(8)
+            if (day := local.date() + timedelta(days=offset)).weekday()
+            in slot.weekdays
+            and (moment := datetime.combine(day, slot.at, local.tzinfo)) > local
+        ]
+        return min(upcoming, default=None)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "commands": [list(command) for command in self._commands],
+            "disabled": sorted(self._disabled),
+        }
+
+    def _relearn(self, now: datetime) -> None:
+        since = (now - PREWAKE_HISTORY).timestamp()
+        self._commands = [
+            command for command in self._commands if command[0] >= since
+        ]
+        slots = learn_slots(self._commands, now)
+        if slots == self.slots:
+            return
+        LOGGER.debug("Learned pre-wake slots: %s", slots)
+        self.slots = slots
+        for update in list(self._listeners):
+            update()
+
+    @callback
+    def _schedule(self, now: datetime) -> None:
+        if self._unsub_wake is not None:
+            self._unsub_wake()
+            self._unsub_wake = None
+        if (moment := self.next_wake(now)) is not None:
+            self._unsub_wake = async_track_point_in_utc_time(
+                self._hass, self._async_on_wake, moment
+            )
+
+    @callback
+    def _async_on_wake(self, now: datetime) -> None:
+        self._unsub_wake = None
+        self._schedule(now)
+        vehicle = self._coordinator.data
+        if vehicle is None or not vehicle.is_sleeping:
+            return
+        if not self._coordinator.command_budget.try_acquire(now):
+            LOGGER.debug("Command budget exhausted, not waking the car")
+            return
+        self._hass.async_create_background_task(
+            self._async_wake(), "teslafi pre-wake"
+        )
+
+    async def _async_wake(self) -> None:
+        LOGGER.debug("Waking the car ahead of the usual commands")
+        try:
+            await self._coordinator.execute_command("wake_up", background=True)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Pre-wake failed", exc_info=True)
+            return
+        self._coordinator.schedule_refresh_in(DELAY_WAKEUP)
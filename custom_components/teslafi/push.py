@@ -0,0 +1,61 @@
+"""TeslaFi push ingestion"""
+
+from functools import partial
+from http import HTTPStatus
+
+from aiohttp import web
+from aiohttp.hdrs import METH_POST
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+from .coordinator import TeslaFiCoordinator
+
+
+@callback
+def async_setup_push(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: TeslaFiCoordinator,
+) -> None:
+    """
+    Accept feed snapshots posted by a local relay, in the same shape as the
+    TeslaFi feed. They go through the same merge and entity updates as polls.
+    """
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+
+    async def _async_handle(
+        hass: HomeAssistant,
+        webhook_id: str,
+        request: web.Request,
+    ) -> web.Response | None:
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Invalid JSON")
+        if not isinstance(data, dict) or not data:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Expected a feed")
+        if (vin := data.get("vin")) and coordinator.data and vin != coordinator.data.vin:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Wrong vehicle")
+        LOGGER.debug("Pushed: %s", data)
+        coordinator.async_push(data)
+        return None
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"TeslaFi {entry.title}",
+        webhook_id,
+        _async_handle,
+        local_only=True,
+        allowed_methods=[METH_POST],
+    )
+    entry.async_on_unload(partial(webhook.async_unregister, hass, webhook_id))
+    LOGGER.info(
+        "Accepting pushed TeslaFi data for %s at %s",
+        entry.title,
+        webhook.async_generate_path(webhook_id),
+    )
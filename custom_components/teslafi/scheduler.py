@@ -0,0 +1,349 @@
+"""TeslaFi tariff-aware charge scheduler"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime, time, timedelta
+import math
+from typing import Any
+
+import numpy as np
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    LOGGER,
+    SCHEDULER_DEFAULT_RATE,
+    SCHEDULER_MAX_SAMPLE_GAP,
+    SCHEDULER_RATE_SAMPLES,
+)
+from .coordinator import TeslaFiCoordinator
+from .model import CHARGER_FIELDS, TeslaFiVehicle
+from .util import _number_or_none
+
+# Required from the coordinator, so that these fields are kept
+SCHEDULER_FIELDS = (
+    "battery_level",
+    "charge_limit_soc",
+    "chargeNumber",
+    *CHARGER_FIELDS,
+)
+
+# Forecast attributes of common price integrations (e.g. Nord Pool, Energi Data
+# Service), each a list of slots
+PRICE_ATTRIBUTES = ("raw_today", "raw_tomorrow", "forecast", "prices")
+PRICE_START_KEYS = ("start", "startsAt", "hour", "time")
+PRICE_VALUE_KEYS = ("value", "price", "total")
+
+# Slot start and end (UTC timestamps) and price, ordered by start
+PriceSlots = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _timestamp(value: Any) -> float | None:
+    if isinstance(value, str):
+        value = dt_util.parse_datetime(value)
+    if not isinstance(value, datetime):
+        return None
+    return dt_util.as_utc(value).timestamp()
+
+
+def _first(entry: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
+    return next((entry[key] for key in keys if key in entry), None)
+
+
+def price_slots(state: State | None) -> PriceSlots | None:
+    """The price forecast of a state, if it has one."""
+    if state is None:
+        return None
+    starts: list[float] = []
+    ends: list[float] = []
+    prices: list[float] = []
+    for attribute in PRICE_ATTRIBUTES:
+        entries = state.attributes.get(attribute)
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if not isinstance(entry, Mapping):
+                continue
+            start = _timestamp(_first(entry, PRICE_START_KEYS))
+            price = _number_or_none(_first(entry, PRICE_VALUE_KEYS))
+            if start is None or price is None:
+                continue
+            starts.append(start)
+            ends.append(_timestamp(entry.get("end")) or math.nan)
+            prices.append(price)
+    if not starts:
+        return None
+
+    # Attributes may overlap (e.g. today's slots in the forecast too)
+    start, index = np.unique(np.array(starts), return_index=True)
+    end = np.array(ends)[index]
+    price = np.array(prices)[index]
+    # Without an end, a slot lasts until the next one starts
+    missing = np.isnan(end)
+    following = np.append(start[1:], math.nan)
+    end[missing] = following[missing]
+    if np.isnan(end[-1]):
+        end[-1] = start[-1] + (np.median(np.diff(start)) if start.size > 1 else 3600)
+    return start, end, price
+
+
+def plan_windows(
+    slots: PriceSlots,
+    now: float,
+    departure: float,
+    needed: float,
+) -> np.ndarray:
+    """
+    The cheapest charging windows that add up to `needed` seconds between now
+    and the departure, as an array of [start, end) rows.
+
+    Time after the end of the forecast counts as one slot at the forecast's
+    median price, so the plan doesn't crowd into the known slots before the
+    next prices are published.
+    """
+    start, end, price = slots
+    if needed <= 0 or departure <= now:
+        return np.empty((0, 2))
+    if end[-1] < departure:
+        start = np.append(start, end[-1])
+        end = np.append(end, departure)
+        price = np.append(price, np.median(price))
+    lo = np.maximum(start, now)
+    hi = np.minimum(end, departure)
+    durations = hi - lo
+    usable = np.flatnonzero(durations > 0)
+    if not usable.size:
+        return np.empty((0, 2))
+
+    # Cheapest first; on a tie, the earlier slot
+    order = usable[np.argsort(price[usable], kind="stable")]
+    covered = np.cumsum(durations[order])
+    count = min(int(np.searchsorted(covered, needed)) + 1, order.size)
+    chosen = np.sort(order[:count])
+
+    lo, hi = lo[chosen], hi[chosen]
+    # Merge adjacent slots into windows
+    breaks = np.flatnonzero(lo[1:] > hi[:-1]) + 1
+    return np.column_stack(
+        (lo[np.r_[0, breaks]], hi[np.r_[breaks - 1, hi.size - 1]])
+    )
+
+
+class TeslaFiChargeScheduler:
+    """
+    Charges in the cheapest slots of a price forecast before the departure time.
+
+    Replanning is a handful of vectorized operations over the forecast's slots,
+    so it runs on every price update and every refresh. Commands are only sent
+    at slot boundaries, and when the car is plugged in, so charging isn't
+    toggled mid-slot as the plan shifts. The charging rate, in percent per hour,
+    is learned from recent charging sessions.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TeslaFiCoordinator,
+        entity_id: str,
+        departure: time,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entity_id = entity_id
+        self._departure = departure
+        self._slots: PriceSlots | None = None
+        self._edges = np.empty(0)
+        self._windows = np.empty((0, 2))
+        # (percent, hours) of charging progress between snapshots
+        self._progress: deque[tuple[float, float]] = deque(
+            maxlen=SCHEDULER_RATE_SAMPLES
+        )
+        # (timestamp, charge session, battery level) of the last charging snapshot
+        self._sample: tuple[float, int | None, float] | None = None
+        self._plugged_in: bool | None = None
+        self._busy = False
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+
+    @property
+    def rate(self) -> float:
+        """Charging rate in percent per hour."""
+        hours = sum(hours for _, hours in self._progress)
+        percent = sum(percent for percent, _ in self._progress)
+        if hours <= 0 or percent <= 0:
+            return SCHEDULER_DEFAULT_RATE
+        return percent / hours
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start scheduling. Returns a callback to stop."""
+        unsubs = [
+            self._coordinator.async_require_fields(SCHEDULER_FIELDS),
+            async_track_state_change_event(
+                self._hass, [self._entity_id], self._async_on_prices
+            ),
+            self._coordinator.async_add_listener(self._async_on_update),
+        ]
+        self._set_prices(self._hass.states.get(self._entity_id))
+        self._replan(dt_util.utcnow())
+
+        @callback
+        def _cancel() -> None:
+            for unsub in unsubs:
+                unsub()
+            if self._unsub_boundary is not None:
+                self._unsub_boundary()
+                self._unsub_boundary = None
+
+        return _cancel
+
+    def next_departure(self, now: datetime) -> datetime:
+        """The next departure after `now`."""
+        local = dt_util.as_local(now)
+        departure = datetime.combine(local.date(), self._departure, local.tzinfo)
+        if departure <= local:
+            departure += timedelta(days=1)
+        return departure
+
+    def charging_wanted(self, now: datetime) -> bool:
+        """Whether the current plan charges at `now`."""
+        stamp = now.timestamp()
+        windows = self._windows
+        return bool(np.any((windows[:, 0] <= stamp) & (stamp < windows[:, 1])))
+
+    def _set_prices(self, state: State | None) -> None:
+        self._slots = price_slots(state)
+        if self._slots is None:
+            self._edges = np.empty(0)
+            return
+        start, end, _ = self._slots
+        self._edges = np.unique(np.concatenate((start, end)))
+
+    @callback
+    def _async_on_prices(self, event: Event[EventStateChangedData]) -> None:
+        self._set_prices(event.data["new_state"])
+        self._replan(dt_util.utcnow())
+
+    @callback
+    def _async_on_update(self) -> None:
+        vehicle = self._coordinator.data
+        self._learn(vehicle)
+        now = dt_util.utcnow()
+        self._replan(now)
+        plugged_in = bool(vehicle.is_plugged_in)
+        if plugged_in and self._plugged_in is False:
+            # The car starts charging when plugged in, without waiting for a slot
+            self._apply(now)
+        self._plugged_in = plugged_in
+
+    @callback
+    def _async_on_boundary(self, now: datetime) -> None:
+        self._unsub_boundary = None
+        self._replan(now)
+        self._apply(now)
+
+    def _learn(self, vehicle: TeslaFiVehicle) -> None:
+        level = _number_or_none(vehicle.get("battery_level"))
+        updated = vehicle.last_remote_update
+        if not vehicle.is_charging or level is None or updated is None:
+            self._sample = None
+            return
+        sample = (updated.timestamp(), vehicle.charge_session_number, level)
+        if (previous := self._sample) is not None:
+            elapsed = sample[0] - previous[0]
+            if elapsed <= 0:
+                return
+            if (
+                previous[1] == sample[1]
+                and elapsed <= SCHEDULER_MAX_SAMPLE_GAP.total_seconds()
+                and level >= previous[2]
+            ):
+                self._progress.append((level - previous[2], elapsed / 3600))
+        self._sample = sample
+
+    def _replan(self, now: datetime) -> None:
+        vehicle = self._coordinator.data
+        level = _number_or_none(vehicle.get("battery_level")) if vehicle else None
+        target = _number_or_none(vehicle.get("charge_limit_soc")) if vehicle else None
+        if self._slots is None or level is None or target is None:
+            windows = np.empty((0, 2))
+        else:
+            windows = plan_windows(
+                self._slots,
+                now.timestamp(),
+                self.next_departure(now).timestamp(),
+                (target - level) / self.rate * 3600,
+            )
+        if not np.array_equal(windows, self._windows):
+            LOGGER.debug(
+                "Charging plan: %s",
+                [
+                    (dt_util.utc_from_timestamp(a), dt_util.utc_from_timestamp(b))
+                    for a, b in windows.tolist()
+                ],
+            )
+        self._windows = windows
+        self._schedule_boundary(now)
+
+    def _schedule_boundary(self, now: datetime) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+        edges = self._edges
+        index = np.searchsorted(edges, now.timestamp(), side="right")
+        if index >= edges.size:
+            return
+        self._unsub_boundary = async_track_point_in_utc_time(
+            self._hass,
+            self._async_on_boundary,
+            dt_util.utc_from_timestamp(float(edges[index])),
+        )
+
+    @callback
+    def _apply(self, now: datetime) -> None:
+        vehicle = self._coordinator.data
+        if (
+            self._busy
+            or vehicle is None
+            or not vehicle.is_plugged_in
+            or vehicle.is_fast_charger
+        ):
+            return
+        if not len(self._windows):
+            # No forecast, or nothing left to charge: leave the car's own
+            # charging alone
+            return
+        charging = vehicle.charging_state in ("charging", "starting")
+        wanted = self.charging_wanted(now)
+        if wanted == charging:
+            return
+        self._busy = True
+        self._hass.async_create_background_task(
+            self._async_send(now, "charge_start" if wanted else "charge_stop"),
+            "teslafi charge scheduler",
+        )
+
+    async def _async_send(self, now: datetime, cmd: str) -> None:
+        try:
+            if not self._coordinator.command_budget.try_acquire(now):
+                LOGGER.debug("Command budget exhausted, not sending %s", cmd)
+                return
+            LOGGER.debug("Charge scheduler: %s", cmd)
+            await self._coordinator.execute_command(cmd, background=True)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Charge scheduler command %s failed", cmd, exc_info=True)
+        finally:
+            self._busy = False
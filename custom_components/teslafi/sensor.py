@@ -1,5 +1,7 @@
 """Sensors"""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from functools import cached_property
 from typing import override
@@ -7,6 +9,7 @@ from typing import override
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -27,10 +30,40 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiSensorEntityDescription
-from .const import DOMAIN, SHIFTER_STATES
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
+from .catalog import CATALOG
+from .const import DOMAIN, DRAIN_WRITE_INTERVAL, SHIFTER_STATES
 from .coordinator import TeslaFiCoordinator
-from .model import TeslaFiTirePressure
+from .drain import (
+    DRAIN_CLIMATE_KEEPER,
+    DRAIN_IDLE,
+    DRAIN_SENTRY,
+    DRAIN_SLEEPING,
+)
+from .model import (
+    CAR_STATE_FIELDS,
+    CHARGER_FIELDS,
+    CHARGING_FIELDS,
+    GEAR_FIELDS,
+    TeslaFiTirePressure,
+    TeslaFiVehicle,
+)
+from .util import _identity, _number_or_none
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiSensorEntityDescription(
+    SensorEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Sensor EntityDescription"""
+
+    icons: dict[str, str] = None
+    """Dictionary of state -> icon"""
+
+    fix_unit: Callable[[TeslaFiVehicle, HomeAssistant], str] = None
+    """Convert the native unit of measurement. Return None to keep the original unit."""
+
 
 SENSORS = [
     # region Generic car info
@@ -43,6 +76,7 @@ SENSORS = [
         native_unit_of_measurement=UnitOfLength.MILES,
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.1,
     ),
     TeslaFiSensorEntityDescription(
         key="carState",
@@ -59,6 +93,7 @@ SENSORS = [
             "driving": "mdi:steering",
         },
         value=lambda d, h: d.car_state,
+        fields=CAR_STATE_FIELDS,
     ),
     TeslaFiSensorEntityDescription(
         key="speed",
@@ -68,6 +103,8 @@ SENSORS = [
         device_class=SensorDeviceClass.SPEED,
         native_unit_of_measurement=UnitOfSpeed.MILES_PER_HOUR,
         available=lambda u, d, h: u and d.is_in_gear,
+        fields=("speed", *GEAR_FIELDS),
+        deadband=1,
     ),
     TeslaFiSensorEntityDescription(
         key="shift_state",
@@ -79,6 +116,7 @@ SENSORS = [
         options=list(SHIFTER_STATES.values()),
         value=lambda d, h: d.shift_state,
         available=lambda u, d, h: u and d.car_state == "driving",
+        fields=GEAR_FIELDS,
     ),
     # endregion
     # region Battery
@@ -99,6 +137,31 @@ SENSORS = [
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.MILES,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.5,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_battery_degradation",
+        name="Battery Degradation",
+        icon="mdi:battery-minus-variant",
+        suggested_display_precision=1,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: (
+            r.degradation if (r := c.degradation.result) else None
+        ),
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_battery_degradation_trend",
+        name="Battery Degradation Trend",
+        icon="mdi:chart-line-variant",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{PERCENTAGE}/y",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: r.trend if (r := c.degradation.result) else None,
     ),
     # endregion
     # region Charging
@@ -109,6 +172,7 @@ SENSORS = [
         device_class=SensorDeviceClass.DURATION,
         entity_category=EntityCategory.DIAGNOSTIC,
         available=lambda u, d, h: u and d.is_charging,
+        fields=("time_to_full_charge", *CHARGING_FIELDS),
     ),
     TeslaFiSensorEntityDescription(
         key="charger_voltage",
@@ -117,6 +181,8 @@ SENSORS = [
         device_class=SensorDeviceClass.VOLTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
         available=lambda u, d, h: u and d.is_plugged_in,
+        fields=("charger_voltage", *CHARGING_FIELDS),
+        deadband=2,
     ),
     TeslaFiSensorEntityDescription(
         key="charger_actual_current",
@@ -126,6 +192,7 @@ SENSORS = [
         entity_category=EntityCategory.DIAGNOSTIC,
         available=lambda u, d, h: u and d.is_plugged_in,
         value=lambda d, h: d.charger_current,
+        fields=CHARGER_FIELDS,
     ),
     TeslaFiSensorEntityDescription(
         key="charge_energy_added",
@@ -137,6 +204,7 @@ SENSORS = [
         state_class=SensorStateClass.TOTAL,
         last_reset=None,
         available=lambda u, d, h: u and d.is_plugged_in,
+        fields=("charge_energy_added", "chargeNumber", *CHARGING_FIELDS),
     ),
     TeslaFiSensorEntityDescription(
         # NOTE: this field is kW as an integer, so its value is not very useful.
@@ -149,6 +217,7 @@ SENSORS = [
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
         available=lambda u, d, h: u and d.is_plugged_in,
+        fields=("charger_power", *CHARGING_FIELDS),
     ),
     TeslaFiSensorEntityDescription(
         # This is a synthetic entity with actual calculation of apparent power.
@@ -161,6 +230,8 @@ SENSORS = [
         entity_registry_enabled_default=False,
         value=lambda d, h: d.charger_voltage * d.charger_current,
         available=lambda u, d, h: u and d.is_plugged_in,
+        fields=CHARGER_FIELDS,
+        deadband_relative=0.02,
     ),
     TeslaFiSensorEntityDescription(
         key="_charger_level",
@@ -173,6 +244,7 @@ SENSORS = [
         translation_key="charger_level",
         value=lambda d, h: d.charger_level,
         available=lambda u, d, h: u and d.is_charging,
+        fields=CHARGER_FIELDS,
     ),
     # endregion
     # region Climate
@@ -182,6 +254,7 @@ SENSORS = [
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        deadband=0.3,
     ),
     TeslaFiSensorEntityDescription(
         key="outside_temp",
@@ -189,9 +262,86 @@ SENSORS = [
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        deadband=0.5,
     ),
     # ... climate.py
     # endregion
+    # region Parked drain
+    TeslaFiSensorEntityDescription(
+        key="_parked_drain",
+        name="Parked Drain",
+        icon="mdi:battery-arrow-down-outline",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Rated range lost per parked hour, converted like any other distance
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.MILES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        coordinator_value=lambda c: c.drain.rate(),
+        deadband=0.01,
+        min_write_interval=DRAIN_WRITE_INTERVAL,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_parked_drain_sentry",
+        name="Parked Drain Sentry",
+        icon="mdi:shield-car",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Rated range lost per parked hour, converted like any other distance
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.MILES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.drain.rate(DRAIN_SENTRY),
+        deadband=0.01,
+        min_write_interval=DRAIN_WRITE_INTERVAL,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_parked_drain_climate_keeper",
+        name="Parked Drain Climate Keeper",
+        icon="mdi:fan",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Rated range lost per parked hour, converted like any other distance
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.MILES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.drain.rate(DRAIN_CLIMATE_KEEPER),
+        deadband=0.01,
+        min_write_interval=DRAIN_WRITE_INTERVAL,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_parked_drain_sleeping",
+        name="Parked Drain Sleeping",
+        icon="mdi:sleep",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Rated range lost per parked hour, converted like any other distance
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.MILES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.drain.rate(DRAIN_SLEEPING),
+        deadband=0.01,
+        min_write_interval=DRAIN_WRITE_INTERVAL,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_parked_drain_idle",
+        name="Parked Drain Idle",
+        icon="mdi:car",
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Rated range lost per parked hour, converted like any other distance
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.MILES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.drain.rate(DRAIN_IDLE),
+        deadband=0.01,
+        min_write_interval=DRAIN_WRITE_INTERVAL,
+    ),
+    # endregion
     # region TPMS
     TeslaFiSensorEntityDescription(
         key="tpms_front_left",
@@ -205,6 +355,8 @@ SENSORS = [
         fix_unit=lambda d, h: TeslaFiTirePressure.convert_unit(d.tpms.unit),
         value=lambda d, h: d.tpms.front_left,
         available=lambda u, d, h: u and d.tpms.front_left,
+        fields=("tpms_front_left", "pressure"),
+        deadband_relative=0.01,
     ),
     TeslaFiSensorEntityDescription(
         key="tpms_front_right",
@@ -218,6 +370,8 @@ SENSORS = [
         fix_unit=lambda d, h: TeslaFiTirePressure.convert_unit(d.tpms.unit),
         value=lambda d, h: d.tpms.front_right,
         available=lambda u, d, h: u and d.tpms.front_right,
+        fields=("tpms_front_right", "pressure"),
+        deadband_relative=0.01,
     ),
     TeslaFiSensorEntityDescription(
         key="tpms_rear_left",
@@ -231,6 +385,8 @@ SENSORS = [
         fix_unit=lambda d, h: TeslaFiTirePressure.convert_unit(d.tpms.unit),
         value=lambda d, h: d.tpms.rear_left,
         available=lambda u, d, h: u and d.tpms.rear_left,
+        fields=("tpms_rear_left", "pressure"),
+        deadband_relative=0.01,
     ),
     TeslaFiSensorEntityDescription(
         key="tpms_rear_right",
@@ -244,6 +400,8 @@ SENSORS = [
         fix_unit=lambda d, h: TeslaFiTirePressure.convert_unit(d.tpms.unit),
         value=lambda d, h: d.tpms.rear_right,
         available=lambda u, d, h: u and d.tpms.rear_right,
+        fields=("tpms_rear_right", "pressure"),
+        deadband_relative=0.01,
     ),
     # endregion
     # region TeslaFi API Counts
@@ -265,18 +423,63 @@ SENSORS = [
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_registry_enabled_default=False,
     ),
+    TeslaFiSensorEntityDescription(
+        key="_speculative_fetches",
+        name="API Speculative Fetches",
+        icon="mdi:counter",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.speculative_fetches,
+    ),
+    TeslaFiSensorEntityDescription(
+        key="_speculative_wasted",
+        name="API Speculative Fetches Wasted",
+        icon="mdi:counter",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        coordinator_value=lambda c: c.speculative_wasted,
+    ),
     # endregion
 ]
 
+# Generic sensors for the raw fields in the catalog
+CATALOG_SENSORS = [
+    TeslaFiSensorEntityDescription(
+        key=field.key,
+        name=field.name,
+        device_class=field.device_class,
+        native_unit_of_measurement=field.unit,
+        state_class=SensorStateClass.MEASUREMENT if field.type is float else None,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=field.enabled,
+        convert=_number_or_none if field.type is float else _identity,
+    )
+    for field in CATALOG
+    if field.type is not bool
+]
+
 
 class TeslaFiSensor(TeslaFiEntity[TeslaFiSensorEntityDescription], SensorEntity):
     """Base TeslaFi Sensor"""
 
     def _handle_coordinator_update(self) -> None:
-        self._attr_native_value = self._get_value()
-        if self.entity_description.fix_unit and (
-            fixed := self.entity_description.fix_unit(self.coordinator.data, self.hass)
-        ):
+        if self._is_unchanged():
+            return
+        value = self._get_value()
+        if not self._is_significant_update(value):
+            # Keep the value that was last written
+            return
+
+        self._attr_native_value = value
+        if (result := self._evaluation) is not None:
+            fixed = result.unit
+        elif self.entity_description.fix_unit:
+            fixed = self.entity_description.fix_unit(self.coordinator.data, self.hass)
+        else:
+            fixed = None
+        if fixed:
             self._attr_native_unit_of_measurement = fixed
 
         if self.entity_description.key == "charge_energy_added":
@@ -287,7 +490,7 @@ class TeslaFiSensor(TeslaFiEntity[TeslaFiSensorEntityDescription], SensorEntity)
             else:
                 self._attr_last_reset = None
 
-        return super()._handle_coordinator_update()
+        self._write_coordinator_update()
 
     @property
     @override
@@ -308,6 +511,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiSensor] = []
     entities.extend(
-        [TeslaFiSensor(coordinator, description) for description in SENSORS]
+        [
+            TeslaFiSensor(coordinator, description)
+            for description in (*SENSORS, *CATALOG_SENSORS)
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
@@ -0,0 +1,100 @@
+"""TeslaFi services"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_TEMPERATURE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import DOMAIN, SERVICE_IMPORT_HISTORY, SERVICE_PRECONDITION
+
+if TYPE_CHECKING:
+    from .coordinator import TeslaFiCoordinator
+
+ATTR_DEPARTURE = "departure"
+ATTR_PATH = "path"
+
+IMPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+PRECONDITION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_DEPARTURE): cv.datetime,
+        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+    }
+)
+
+
+def _device_vin(hass: HomeAssistant, device_id: str) -> str:
+    if device := dr.async_get(hass).async_get(device_id):
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN:
+                return identifier
+    raise ServiceValidationError(f"Not a TeslaFi vehicle: {device_id}")
+
+
+def _device_coordinator(hass: HomeAssistant, device_id: str) -> TeslaFiCoordinator:
+    vin = _device_vin(hass, device_id)
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        if not isinstance(entry_data, dict):
+            continue
+        coordinator: TeslaFiCoordinator | None = entry_data.get("coordinator")
+        if coordinator and coordinator.data and coordinator.data.vin == vin:
+            return coordinator
+    raise ServiceValidationError(f"Vehicle is not loaded: {device_id}")
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """
+    Register the integration's services. Their implementations are only
+    imported once called: the history import pulls in the recorder and numpy.
+    """
+
+    async def _async_import_history(call: ServiceCall) -> ServiceResponse:
+        from .history import async_import_history
+
+        coordinator = _device_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        return await async_import_history(
+            hass, coordinator.identity, call.data[ATTR_PATH]
+        )
+
+    async def _async_precondition(call: ServiceCall) -> ServiceResponse:
+        from .precondition import async_precondition
+
+        return await async_precondition(
+            _device_coordinator(hass, call.data[ATTR_DEVICE_ID]),
+            call.data[ATTR_DEPARTURE],
+            call.data.get(ATTR_TEMPERATURE),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        _async_import_history,
+        schema=IMPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PRECONDITION,
+        _async_precondition,
+        schema=PRECONDITION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
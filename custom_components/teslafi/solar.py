@@ -0,0 +1,210 @@
+"""TeslaFi solar-excess charging controller"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfPower,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    LOGGER,
+    SOLAR_DEFAULT_VOLTAGE,
+    SOLAR_DWELL,
+    SOLAR_HYSTERESIS_AMPS,
+    SOLAR_MIN_AMPS,
+    SOLAR_MIN_STEP_AMPS,
+)
+from .coordinator import TeslaFiCoordinator
+from .model import CHARGER_FIELDS, TeslaFiVehicle
+from .util import _int_or_none, _number_or_none
+
+# Required from the coordinator, so that these fields are kept
+SOLAR_FIELDS = (
+    "battery_level",
+    "charge_limit_soc",
+    "charge_current_request",
+    "charge_current_request_max",
+    "charger_phases",
+    *CHARGER_FIELDS,
+)
+
+
+def _export_watts(state: State | None) -> float | None:
+    """Grid export in W, positive when exporting."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    if state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == UnitOfPower.KILO_WATT:
+        value *= 1000
+    return value
+
+
+def _is_full(vehicle: TeslaFiVehicle) -> bool:
+    """Whether charging is complete, or the battery is at its limit."""
+    if vehicle.charging_state == "complete":
+        return True
+    level = _number_or_none(vehicle.get("battery_level"))
+    limit = _number_or_none(vehicle.get("charge_limit_soc"))
+    return level is not None and limit is not None and level >= limit
+
+
+class TeslaFiSolarController:
+    """
+    Follows surplus solar power with the charging current.
+
+    Runs on state changes of a grid export sensor, so it reacts as soon as the
+    sensor does, without polling TeslaFi. The power of one amp is estimated
+    from the live charger voltage and phases, and the amps the car draws are
+    assumed to follow our last request until a newer snapshot shows otherwise.
+    Commands are only sent for changes of a few amps, no sooner than the dwell
+    time after the previous one, and within the coordinator's command budget.
+    Charging starts and stops with a margin around the minimum current, so a
+    passing cloud does not toggle it. Only sessions started by the controller
+    are adjusted or stopped; charging started by the user is left alone.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TeslaFiCoordinator,
+        entity_id: str,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entity_id = entity_id
+        self._last_command: datetime | None = None
+        self._busy = False
+        # (snapshot Date when requested, amps), until a newer snapshot arrives
+        self._requested: tuple[str | None, int] | None = None
+        # Snapshot Date when we started the current session, if we did
+        self._started: str | None = None
+        self._volts = SOLAR_DEFAULT_VOLTAGE
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start following the export sensor. Returns a callback to stop."""
+        unsubs = [
+            self._coordinator.async_require_fields(SOLAR_FIELDS),
+            async_track_state_change_event(
+                self._hass, [self._entity_id], self._async_on_export
+            ),
+        ]
+
+        @callback
+        def _cancel() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _cancel
+
+    @callback
+    def _async_on_export(self, event: Event[EventStateChangedData]) -> None:
+        if self._busy:
+            return
+        now = dt_util.utcnow()
+        if self._last_command and now - self._last_command < SOLAR_DWELL:
+            return
+        if (command := self._decide(event.data["new_state"])) is None:
+            return
+        self._busy = True
+        self._hass.async_create_background_task(
+            self._async_send(now, *command), "teslafi solar charging"
+        )
+
+    def _decide(self, state: State | None) -> tuple[str, dict[str, Any]] | None:
+        """The command that moves charging toward the surplus, if any."""
+        vehicle = self._coordinator.data
+        if vehicle is None or not vehicle.is_plugged_in or vehicle.is_fast_charger:
+            self._started = None
+            return None
+        if (export := _export_watts(state)) is None:
+            return None
+
+        charging = vehicle.charging_state in ("charging", "starting")
+        if (
+            self._started is not None
+            and not charging
+            and vehicle.get("Date") != self._started
+        ):
+            # A newer snapshot shows that the session we started has ended
+            self._started = None
+        if charging and self._started is None:
+            # Started by the user or another automation
+            return None
+        if charging and (volts := vehicle.charger_voltage):
+            # Only meaningful while charging; remembered for the next start
+            self._volts = volts
+        phases = _int_or_none(vehicle.get("charger_phases")) or 1
+        watts_per_amp = self._volts * phases
+        requested = self._requested_amps(vehicle)
+        drawn = (requested or vehicle.charger_current or 0) if charging else 0
+        # The car's own load is part of the surplus it could use
+        target = int((export + drawn * watts_per_amp) // watts_per_amp)
+        if max_amps := _int_or_none(vehicle.get("charge_current_request_max")):
+            target = min(target, max_amps)
+
+        if not charging:
+            if target >= SOLAR_MIN_AMPS + SOLAR_HYSTERESIS_AMPS and not _is_full(
+                vehicle
+            ):
+                return "charge_start", {}
+            return None
+        if target < SOLAR_MIN_AMPS - SOLAR_HYSTERESIS_AMPS:
+            return "charge_stop", {}
+        target = max(target, SOLAR_MIN_AMPS)
+        if requested is not None and abs(target - requested) < SOLAR_MIN_STEP_AMPS:
+            return None
+        return "set_charging_amps", {"charging_amps": target}
+
+    def _requested_amps(self, vehicle: TeslaFiVehicle) -> int | None:
+        """Our last request while the snapshot predates it, else the car's."""
+        if self._requested is not None:
+            date, amps = self._requested
+            if vehicle.get("Date") == date:
+                return amps
+            self._requested = None
+        return _int_or_none(vehicle.get("charge_current_request"))
+
+    async def _async_send(
+        self,
+        now: datetime,
+        cmd: str,
+        kwargs: dict[str, Any],
+    ) -> None:
+        try:
+            if not self._coordinator.command_budget.try_acquire(now):
+                LOGGER.debug("Command budget exhausted, not sending %s", cmd)
+                return
+            LOGGER.debug("Solar charging: %s %s", cmd, kwargs)
+            date = self._coordinator.data.get("Date")
+            self._last_command = now
+            await self._coordinator.execute_command(cmd, background=True, **kwargs)
+            if amps := kwargs.get("charging_amps"):
+                self._requested = (date, amps)
+            elif cmd == "charge_start":
+                self._started = date
+            elif cmd == "charge_stop":
+                self._started = None
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Solar charging command %s failed", cmd, exc_info=True)
+        finally:
+            self._busy = False
@@ -1,19 +1,38 @@
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 from homeassistant.components.switch import (
     SwitchDeviceClass,
     SwitchEntity,
+    SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiSwitchEntityDescription
+from .base import TeslaFiBaseEntity, TeslaFiBaseEntityDescription, TeslaFiEntity
 from .const import DOMAIN, LOGGER
 from .coordinator import TeslaFiCoordinator
+from .model import CHARGING_FIELDS, CLIMATE_FIELDS
+from .prewake import TeslaFiPreWake
 from .util import _convert_to_bool
 
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiSwitchEntityDescription(
+    SwitchEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """TeslaFi Switch EntityDescription"""
+
+    cmd: Callable[[TeslaFiCoordinator, bool], bool] = None
+    """The command to send to TeslaFi on toggle."""
+
+    convert: Callable[[any], bool] = _convert_to_bool
+
+
 SWITCHES = [
     TeslaFiSwitchEntityDescription(
         key="steering_wheel_heater",
@@ -22,6 +41,7 @@ SWITCHES = [
         icon="mdi:steering",
         available=lambda u, v, h: u and v.is_climate_on,
         cmd=lambda c, v: c.execute_command("steering_wheel_heater", statement=v),
+        fields=("steering_wheel_heater", *CLIMATE_FIELDS),
     ),
     TeslaFiSwitchEntityDescription(
         key="_set_charging",
@@ -33,6 +53,7 @@ SWITCHES = [
         available=lambda u, v, h: u and v.is_plugged_in,
         value=lambda d, h: d.is_charging,
         cmd=lambda c, v: c.execute_command("charge_start" if v else "charge_stop"),
+        fields=CHARGING_FIELDS,
     ),
 ]
 
@@ -58,6 +79,62 @@ class TeslaFiSwitchEntity(
         return self.async_write_ha_state()
 
 
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+class TeslaFiPreWakeSwitch(TeslaFiBaseEntity, SwitchEntity):
+    """Opt-out of a learned pre-wake"""
+
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_icon = "mdi:alarm"
+
+    def __init__(
+        self,
+        coordinator: TeslaFiCoordinator,
+        prewake: TeslaFiPreWake,
+        key: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._prewake = prewake
+        self._key = key
+        self._attr_unique_id = coordinator.identity.unique_id(f"prewake_{key}")
+        self._attr_name = f"Pre-wake {key[:2]}:{key[2:]}"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._prewake.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        # Unavailable once the habit is no longer seen
+        return super().available and self._key in self._prewake.slots
+
+    @property
+    def is_on(self) -> bool:
+        return self._prewake.is_enabled(self._key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if (slot := self._prewake.slots.get(self._key)) is None:
+            return None
+        return {
+            "wake_at": slot.at.isoformat(),
+            "weekdays": [day for i, day in enumerate(WEEKDAYS) if i in slot.weekdays],
+            "days_seen": slot.days,
+            "commands": list(slot.commands),
+        }
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        self._prewake.async_set_enabled(self._key, True)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        self._prewake.async_set_enabled(self._key, False)
+        self.async_write_ha_state()
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -68,6 +145,26 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiSwitchEntity] = []
     entities.extend(
-        [TeslaFiSwitchEntity(coordinator, description) for description in SWITCHES]
+        [
+            TeslaFiSwitchEntity(coordinator, description)
+            for description in SWITCHES
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
+
+    if (prewake := coordinator.prewake) is None:
+        return
+    added: set[str] = set()
+
+    @callback
+    def _add_prewake_switches() -> None:
+        # Slots learned later get their switch as they appear
+        keys = [key for key in prewake.slots if key not in added]
+        added.update(keys)
+        async_add_entities(
+            TeslaFiPreWakeSwitch(coordinator, prewake, key) for key in keys
+        )
+
+    _add_prewake_switches()
+    config_entry.async_on_unload(prewake.async_add_listener(_add_prewake_switches))
@@ -0,0 +1,85 @@
+"""TeslaFi HTTP transport"""
+
+from importlib.util import find_spec
+
+import httpx
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.httpx_client import SERVER_SOFTWARE, USER_AGENT
+from homeassistant.util.ssl import client_context
+
+from .const import (
+    DOMAIN,
+    HTTP_CLIENT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_READ_TIMEOUT,
+    LOGGER,
+)
+
+# HTTP/2 multiplexes every entry's polls over one connection, but needs `h2`
+HTTP2 = find_spec("h2") is not None
+
+
+class TeslaFiTransport:
+    """
+    HTTP client shared by all TeslaFi entries, tuned for small, frequent
+    JSON polls of a single host: connections are kept alive between polls,
+    HTTP/2 is used where available, and responses are compressed (httpx
+    negotiates gzip, plus brotli if it is installed).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.client = httpx.AsyncClient(
+            verify=client_context(),
+            http2=HTTP2,
+            headers={USER_AGENT: SERVER_SOFTWARE},
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY.total_seconds(),
+            ),
+            timeout=httpx.Timeout(
+                HTTP_READ_TIMEOUT.total_seconds(),
+                connect=HTTP_CONNECT_TIMEOUT.total_seconds(),
+            ),
+        )
+        self._users = 0
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_on_close
+        )
+        LOGGER.debug("Created HTTP transport: http2=%s", HTTP2)
+
+    @callback
+    def acquire(self) -> httpx.AsyncClient:
+        """Use the client for a config entry, until `async_release`."""
+        self._users += 1
+        return self.client
+
+    async def async_release(self, hass: HomeAssistant) -> None:
+        """Release the client for a config entry, closing it after the last one."""
+        self._users -= 1
+        if self._users > 0:
+            return
+        if hass.data.get(DOMAIN, {}).get(HTTP_CLIENT) is self:
+            hass.data[DOMAIN].pop(HTTP_CLIENT)
+        self._unsub_close()
+        await self.client.aclose()
+        LOGGER.debug("Closed HTTP transport")
+
+    async def _async_on_close(self, _event: Event) -> None:
+        # The listener is gone once it has fired
+        self._unsub_close = lambda: None
+        await self.client.aclose()
+
+
+@callback
+def async_get_transport(hass: HomeAssistant) -> TeslaFiTransport:
+    """The shared transport, created on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (transport := domain_data.get(HTTP_CLIENT)) is None:
+        transport = domain_data[HTTP_CLIENT] = TeslaFiTransport(hass)
+    return transport
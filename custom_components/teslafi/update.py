@@ -1,27 +1,39 @@
 """TeslaFi Update sensor"""
 
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.update import (
     UpdateDeviceClass,
     UpdateEntity,
+    UpdateEntityDescription,
     UpdateEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .base import TeslaFiEntity, TeslaFiUpdateEntityDescription
+from .base import TeslaFiBaseEntityDescription, TeslaFiEntity
 from .const import DOMAIN, LOGGER
 from .coordinator import TeslaFiCoordinator
 
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TeslaFiUpdateEntityDescription(
+    UpdateEntityDescription,
+    TeslaFiBaseEntityDescription,
+):
+    """A class that describes update entities."""
+
+
 UPDATERS = [
     TeslaFiUpdateEntityDescription(
         key="update",
         name="Software",
         icon="mdi:cellphone-arrow-down",
         device_class=UpdateDeviceClass.FIRMWARE,
+        fields=("car_version", "newVersion", "newVersionStatus"),
     ),
 ]
 
@@ -88,6 +100,10 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     entities: list[TeslaFiUpdater] = []
     entities.extend(
-        [TeslaFiUpdater(coordinator, description) for description in UPDATERS]
+        [
+            TeslaFiUpdater(coordinator, description)
+            for description in UPDATERS
+            if coordinator.supports(description)
+        ]
     )
     async_add_entities(entities)
@@ -1,3 +1,7 @@
+def _identity(value: any) -> any:
+    return value
+
+
 def _is_state(src: str | None, expect: str) -> bool | None:
     return None if src is None else src == expect
 
@@ -26,3 +30,53 @@ def _convert_to_bool(value: any) -> bool | None:
     if value == "0":
         return False
     return bool(value)
+
+
+def _number_or_none(value: any) -> float | None:
+    """Numeric value of `value` (TeslaFi sends numbers as strings), if any."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_significant(
+    old: any,
+    new: any,
+    deadband: float | None = None,
+    relative: float | None = None,
+) -> bool:
+    """Whether `new` differs from `old` by more than the deadband(s)."""
+    if old == new:
+        return False
+    if (old := _number_or_none(old)) is None or (new := _number_or_none(new)) is None:
+        return True
+    delta = abs(new - old)
+    if deadband is not None and delta < deadband:
+        return False
+    if relative is not None and delta < abs(old) * relative:
+        return False
+    return True
+
+
+class _FieldGetter:
+    """Value Callable returning `data.get(key)`, shared by all descriptions of `key`."""
+
+    __slots__ = ("key",)
+    _cache: dict[str, "_FieldGetter"] = {}
+
+    def __new__(cls, key: str) -> "_FieldGetter":
+        if (getter := cls._cache.get(key)) is None:
+            getter = cls._cache[key] = super().__new__(cls)
+            getter.key = key
+        return getter
+
+    def __call__(self, data, hass=None) -> any:
+        return data.get(self.key)
+
+    def __repr__(self) -> str:
+        return f"_FieldGetter({self.key!r})"
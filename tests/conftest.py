@@ -1,9 +1,57 @@
+"""Tests for TeslaFi integration"""
+import json
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_API_KEY
+
+from custom_components.teslafi.const import DOMAIN
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
+
+
+@pytest.fixture
+def feed() -> dict:
+    """A recorded feed.php response."""
+    return json.loads((FIXTURES / "feed.json").read_text())
+
+
+@pytest.fixture
+def mock_api(feed):
+    """Answers TeslaFi requests with the recorded feed, and commands with success."""
+
+    async def _request(self, command: str = "", **kwargs) -> dict:
+        if command in ("", "lastGood"):
+            return dict(feed)
+        return {"response": {"result": True}}
+
+    with patch(
+        "custom_components.teslafi.client.TeslaFiClient._request",
+        autospec=True,
+        side_effect=_request,
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def config_entry(feed) -> MockConfigEntry:
+    """A config entry for the recorded vehicle."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=feed["display_name"],
+        unique_id=feed["vin"],
+        version=3,
+        data={CONF_API_KEY: "abc123"},
+    )
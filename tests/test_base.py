@@ -0,0 +1,35 @@
+"""Test the TeslaFi entity descriptions."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from custom_components.teslafi.base import TeslaFiBaseEntityDescription
+from custom_components.teslafi.sensor import TeslaFiSensorEntityDescription
+from custom_components.teslafi.util import _FieldGetter
+
+
+def test_description_frozen() -> None:
+    """Descriptions cannot be changed once shared by the entities."""
+    description = TeslaFiSensorEntityDescription(key="odometer", deadband=0.1)
+    with pytest.raises(FrozenInstanceError):
+        description.deadband = 1
+    assert description.fields == ("odometer",)
+    assert hash(description) == hash(
+        TeslaFiSensorEntityDescription(key="odometer", deadband=0.1)
+    )
+
+
+def test_default_value_shared() -> None:
+    """Descriptions of the same field share one accessor."""
+    first = TeslaFiBaseEntityDescription(key="odometer")
+    second = TeslaFiSensorEntityDescription(key="odometer", deadband=0.1)
+    assert first.value is second.value is _FieldGetter("odometer")
+    assert first.value({"odometer": "1000.0"}) == "1000.0"
+
+    derived = TeslaFiBaseEntityDescription(
+        key="_range", value=lambda d, h: d.get("est_battery_range")
+    )
+    assert not isinstance(derived.value, _FieldGetter)
+    assert derived.fields is None
+
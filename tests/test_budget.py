@@ -0,0 +1,32 @@
+"""Test request budgets."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.teslafi.budget import TeslaFiRequestBudget
+
+START = datetime(2024, 1, 15, tzinfo=UTC)
+
+
+def test_budget_drains() -> None:
+    """Requests are refused once the limit is spent within the window."""
+    budget = TeslaFiRequestBudget(3, timedelta(hours=1))
+    for minute in range(3):
+        assert budget.try_acquire(START + timedelta(minutes=minute))
+    assert budget.remaining(START + timedelta(minutes=5)) == 0
+    assert not budget.try_acquire(START + timedelta(minutes=5))
+    # Refused requests don't count against the budget
+    assert budget.remaining(START + timedelta(minutes=6)) == 0
+
+
+def test_budget_leaks() -> None:
+    """Requests leave the sliding window one by one."""
+    budget = TeslaFiRequestBudget(3, timedelta(hours=1))
+    for minute in (0, 10, 20):
+        assert budget.try_acquire(START + timedelta(minutes=minute))
+
+    # Still inside the window at exactly an hour
+    assert budget.remaining(START + timedelta(hours=1)) == 0
+    assert budget.remaining(START + timedelta(hours=1, minutes=1)) == 1
+    assert budget.try_acquire(START + timedelta(hours=1, minutes=1))
+    assert not budget.try_acquire(START + timedelta(hours=1, minutes=2))
+    assert budget.remaining(START + timedelta(hours=2, minutes=2)) == 3
@@ -0,0 +1,49 @@
+"""Test the TeslaFi climate entity."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.teslafi.const import DOMAIN
+
+CLIMATE = "climate.red_rocket_climate"
+
+
+async def test_deadband(hass: HomeAssistant, mock_api, config_entry, feed) -> None:
+    """Small changes of the cabin temperature alone don't write the state."""
+    config_entry.add_to_hass(hass)
+    # Disabled by default
+    er.async_get(hass).async_get_or_create(
+        "climate",
+        DOMAIN,
+        f"{feed['vin']}-climate",
+        config_entry=config_entry,
+        suggested_object_id="red_rocket_climate",
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    state = hass.states.get(CLIMATE)
+    assert state.attributes["current_temperature"] == 4.4
+    # Updated in place by identical writes
+    reported = state.last_reported
+
+    feed.update(Date="2024-01-15 07:00:00", inside_temp="4.6")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(CLIMATE).last_reported == reported
+
+    # Anything else shown is written, with the temperature as last written
+    feed.update(Date="2024-01-15 07:01:00", driver_temp_setting="22.0")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(CLIMATE)
+    assert state.attributes["temperature"] == 22.0
+    assert state.attributes["current_temperature"] == 4.4
+
+    feed.update(Date="2024-01-15 07:02:00", inside_temp="4.8")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(CLIMATE).attributes["current_temperature"] == 4.8
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,29 @@
+"""Test the TeslaFi config flow."""
+
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.teslafi.const import DOMAIN, HTTP_CLIENT
+
+
+async def test_user_flow(hass: HomeAssistant, mock_api, feed) -> None:
+    """The flow creates an entry for the vehicle, and releases its HTTP client."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+
+    with patch("custom_components.teslafi.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_API_KEY: "abc123"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == feed["display_name"]
+    assert result["result"].unique_id == feed["vin"]
+    assert HTTP_CLIENT not in hass.data.get(DOMAIN, {})
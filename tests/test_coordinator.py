@@ -0,0 +1,137 @@
+"""Test the TeslaFi coordinator."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.teslafi.base import TeslaFiBaseEntityDescription
+from custom_components.teslafi.const import (
+    CONF_KEEP_ALL_FIELDS,
+    DOMAIN,
+    SPECULATIVE_FETCH_BUDGET,
+)
+from custom_components.teslafi.coordinator import TeslaFiCoordinator
+from custom_components.teslafi.model import CORE_FIELDS
+
+START = datetime(2024, 1, 15, 12, tzinfo=UTC)
+
+
+def _observe(coordinator: TeslaFiCoordinator, state: str, now: datetime) -> None:
+    coordinator._vehicle, _ = coordinator._vehicle.merged({"carState": state}, now)
+    coordinator._track_state(coordinator._vehicle.car_state, now)
+
+
+async def test_predict_sleep(hass: HomeAssistant) -> None:
+    """Sleep is predicted after a streak of idling, not right after a drive."""
+    coordinator = TeslaFiCoordinator(hass, MagicMock())
+    now = START
+    for state in ("driving", "idling", "idling"):
+        _observe(coordinator, state, now)
+        now += timedelta(minutes=5)
+    assert not coordinator._predict_sleep(now)
+
+    for _ in range(3):
+        _observe(coordinator, "idling", now)
+        now += timedelta(minutes=5)
+    # The drive has left the history, and was long enough ago
+    assert coordinator._predict_sleep(now)
+
+    _observe(coordinator, "charging", now)
+    assert not coordinator._predict_sleep(now)
+
+
+async def test_speculative_budget(hass: HomeAssistant) -> None:
+    """Speculative fetches are limited per window."""
+    coordinator = TeslaFiCoordinator(hass, MagicMock())
+    now = START
+    for _ in range(5):
+        _observe(coordinator, "idling", now)
+    for _ in range(SPECULATIVE_FETCH_BUDGET):
+        assert coordinator._should_speculate(now)
+    assert not coordinator._should_speculate(now)
+    assert coordinator.speculative_fetches == SPECULATIVE_FETCH_BUDGET
+
+    assert coordinator._should_speculate(now + timedelta(hours=1, minutes=1))
+
+
+async def test_identity(hass: HomeAssistant, mock_api, config_entry, feed) -> None:
+    """The identity is reused until the firmware or name change."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    identity = coordinator.identity
+    assert identity.unique_id("odometer") == f"{feed['vin']}-odometer"
+
+    feed["odometer"] = "12346.0"
+    await coordinator.async_refresh()
+    assert coordinator.identity is identity
+
+    feed["car_version"] = "2024.2.7 7b5d2d1ed0"
+    await coordinator.async_refresh()
+    assert coordinator.identity is not identity
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, feed["vin"])})
+    assert device.sw_version == "2024.2.7 7b5d2d1ed0"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_stored_fields(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """Only the fields used by entities and the coordinator are kept."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    fields = coordinator.stored_fields
+    assert CORE_FIELDS <= fields
+    # Only used by a disabled catalog sensor
+    assert "charger_pilot_current" not in fields
+    assert "charger_pilot_current" in coordinator.data
+
+    await coordinator.async_refresh()
+    assert "charger_pilot_current" not in coordinator.data
+    assert set(coordinator.data) <= fields
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_keep_all_fields(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """The keep all fields option stores the whole snapshot."""
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_KEEP_ALL_FIELDS: True}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    assert coordinator.stored_fields is None
+
+    await coordinator.async_refresh()
+    assert "charger_pilot_current" in coordinator.data
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_require_fields(hass: HomeAssistant) -> None:
+    """Required fields are kept until released."""
+    coordinator = TeslaFiCoordinator(hass, MagicMock())
+    description = TeslaFiBaseEntityDescription(key="odometer", fields=("odometer",))
+    coordinator.async_register_description(description)
+
+    release = coordinator.async_require_fields(("latitude", "longitude"))
+    assert coordinator.used_fields == {"odometer", "latitude", "longitude"}
+    assert coordinator.stored_fields == CORE_FIELDS | coordinator.used_fields
+    # Only entity descriptions are evaluated
+    coordinator.data = coordinator._vehicle
+    coordinator.async_update_listeners()
+    assert coordinator.evaluation(description) is not None
+    assert len(coordinator._plan) == 1
+
+    release()
+    assert coordinator.used_fields == {"odometer"}
+    assert "latitude" not in coordinator.stored_fields
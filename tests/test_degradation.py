@@ -0,0 +1,43 @@
+"""Test the battery degradation fit."""
+
+import pytest
+
+from custom_components.teslafi.degradation import SECONDS_PER_YEAR, fit_degradation
+
+START = 1_700_000_000.0
+HOUR = 3600.0
+
+
+def _rows(values: list[float | None]) -> list[dict]:
+    return [{"start": START + i * HOUR * 24, "mean": v} for i, v in enumerate(values)]
+
+
+def test_fit_degradation() -> None:
+    """A steady loss of range at varying charge levels is fit as a full-pack trend."""
+    days = 365
+    levels = [50 + (i * 7) % 40 for i in range(days)]
+    # 300 miles when new, losing 6 miles (2%) per year
+    full = [300 - 6 * (i * HOUR * 24) / SECONDS_PER_YEAR for i in range(days)]
+    ranges = [f * level / 100 for f, level in zip(full, levels)]
+    # A few readings far off, e.g. right after a firmware recalibration
+    for i in (30, 100, 200):
+        ranges[i] *= 0.8
+
+    result = fit_degradation(_rows(levels), _rows(ranges))
+    assert result is not None
+    assert result.samples == days
+    assert result.initial_full_range == pytest.approx(300, abs=0.1)
+    assert result.trend == pytest.approx(2.0, abs=0.05)
+    assert result.degradation == pytest.approx(2.0 * (days - 1) / 365.25, abs=0.05)
+
+
+def test_fit_degradation_filters() -> None:
+    """Low levels, gaps and unmatched hours are left out of the fit."""
+    levels = [80.0] * 60
+    ranges: list[float | None] = [240.0] * 60
+    levels[:20] = [20.0] * 20
+    ranges[20:30] = [None] * 10
+    # Too few usable samples left
+    assert fit_degradation(_rows(levels), _rows(ranges)) is None
+    assert fit_degradation(_rows([80.0] * 60), _rows([240.0] * 60)[30:]) is None
+    assert fit_degradation([], []) is None
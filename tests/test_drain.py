@@ -0,0 +1,60 @@
+"""Test parked drain analytics."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.teslafi.drain import (
+    DRAIN_IDLE,
+    DRAIN_SENTRY,
+    DRAIN_SLEEPING,
+    TeslaFiDrainTracker,
+)
+from custom_components.teslafi.model import TeslaFiVehicle
+
+START = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+
+def _parked(range_: float, car_state: str = "Idling", **fields) -> TeslaFiVehicle:
+    return TeslaFiVehicle(
+        {"carState": car_state, "shift_state": "P", "battery_range": str(range_)}
+        | fields
+    )
+
+
+def test_drain_per_mode() -> None:
+    """Each interval counts toward the mode at its start."""
+    tracker = TeslaFiDrainTracker()
+    tracker.ingest(_parked(200.0, sentry_mode="1"), START)
+    tracker.ingest(_parked(198.0, "Sleeping"), START + timedelta(hours=1))
+    tracker.ingest(_parked(197.5, "Sleeping"), START + timedelta(hours=3))
+
+    assert tracker.rate(DRAIN_SENTRY) == 2.0
+    assert tracker.rate(DRAIN_SLEEPING) == 0.25
+    assert tracker.rate(DRAIN_IDLE) is None
+    assert tracker.hours() == 3.0
+    assert tracker.rate() == 2.5 / 3
+
+
+def test_drain_skips_driving() -> None:
+    """Intervals that start or end while driving are not parked drain."""
+    tracker = TeslaFiDrainTracker()
+    tracker.ingest(_parked(200.0), START)
+    driving = _parked(190.0, "Driving", shift_state="D")
+    tracker.ingest(driving, START + timedelta(hours=1))
+    tracker.ingest(_parked(180.0), START + timedelta(hours=2))
+
+    assert tracker.hours() == 0.0
+    assert tracker.rate() is None
+
+
+def test_drain_window() -> None:
+    """Intervals leave the rolling window, and their totals with them."""
+    tracker = TeslaFiDrainTracker(window=timedelta(hours=2))
+    tracker.ingest(_parked(200.0), START)
+    tracker.ingest(_parked(196.0), START + timedelta(hours=1))
+    tracker.ingest(_parked(195.0), START + timedelta(hours=2))
+    assert tracker.rate(DRAIN_IDLE) == 2.5
+
+    tracker.ingest(_parked(194.0), START + timedelta(hours=3, minutes=30))
+    # Only the last two intervals remain
+    assert tracker.hours(DRAIN_IDLE) == 2.5
+    assert tracker.rate(DRAIN_IDLE) == 2.0 / 2.5
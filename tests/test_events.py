@@ -0,0 +1,58 @@
+"""Test vehicle change events."""
+
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.teslafi.const import (
+    CONF_CHANGE_EVENT_FIELDS,
+    CONF_CHANGE_EVENTS,
+    DOMAIN,
+    EVENT_VEHICLE_CHANGED,
+)
+
+
+async def test_change_events(hass: HomeAssistant, mock_api, config_entry, feed) -> None:
+    """Changes of the selected fields are fired, coalesced within the interval."""
+    events = async_capture_events(hass, EVENT_VEHICLE_CHANGED)
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_CHANGE_EVENTS: True, CONF_CHANGE_EVENT_FIELDS: ["battery_level"]},
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    # Nothing is fired for the first refresh
+    assert not events
+
+    feed.update(battery_level="75", odometer="28106.0")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data == {
+        "vin": feed["vin"],
+        "changes": {"battery_level": {"old": "74", "new": "75"}},
+    }
+
+    # Within the minimum interval, changes wait for the next event
+    feed.update(battery_level="76")
+    await coordinator.async_refresh()
+    feed.update(battery_level="77")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    assert events[1].data["changes"] == {"battery_level": {"old": "75", "new": "77"}}
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
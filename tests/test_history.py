@@ -0,0 +1,78 @@
+"""Test reading TeslaFi CSV exports."""
+
+from datetime import UTC, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.teslafi import history
+from custom_components.teslafi.const import DOMAIN
+from custom_components.teslafi.history import (
+    HISTORY_COLUMNS,
+    async_history_targets,
+    read_history,
+)
+
+CHICAGO = ZoneInfo("America/Chicago")
+
+# Exported with a byte order mark
+CSV = """\ufeffDate,battery_level,odometer,other
+2024-01-15 06:10:00,74,1000.0,x
+2024-01-15 06:40:00,72,1010.0,x
+2024-01-15 06:50:00,,1012.5,x
+2024-01-15 07:05:00,70,not a number,x
+not a date,10,10.0,x
+2024-01-15 06:20:00,76,1005.0,x
+"""
+
+
+def _hour(hour: int) -> int:
+    return int(datetime(2024, 1, 15, hour, tzinfo=UTC).timestamp()) // 3600
+
+
+def test_read_history(tmp_path, monkeypatch) -> None:
+    """Rows are aggregated per UTC hour, across chunks and out of order."""
+    monkeypatch.setattr(history, "HISTORY_CHUNK_ROWS", 2)
+    path = tmp_path / "teslafi.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    aggregates = read_history(str(path), HISTORY_COLUMNS, CHICAGO)
+    assert set(aggregates) == {"battery_level", "odometer"}
+
+    hours, aggs = aggregates["battery_level"].arrays()
+    # 06:00 and 07:00 in Chicago are 12:00 and 13:00 UTC
+    assert hours.tolist() == [_hour(12), _hour(13)]
+    # count, total, min, max, last time, last value
+    count, total, low, high, _, last = aggs[0].tolist()
+    assert (count, total, low, high, last) == (3, 222, 72, 76, 72)
+    assert aggs[1].tolist()[0] == 1
+
+    hours, aggs = aggregates["odometer"].arrays()
+    assert hours.tolist() == [_hour(12)]
+    assert aggs[0].tolist()[5] == 1012.5
+
+
+def test_read_history_no_date(tmp_path) -> None:
+    """Exports without a Date column are rejected."""
+    path = tmp_path / "teslafi.csv"
+    path.write_text("battery_level\n74\n", encoding="utf-8")
+    with pytest.raises(ServiceValidationError):
+        read_history(str(path), HISTORY_COLUMNS, CHICAGO)
+
+
+async def test_history_targets(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """History is imported into the enabled sensors of the vehicle."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+
+    targets = {
+        target.column.key: target.statistic_id
+        for target in async_history_targets(hass, coordinator.identity)
+    }
+    assert targets["battery_level"] == "sensor.red_rocket_battery"
+    assert targets["usable_battery_level"] == "sensor.red_rocket_usable_battery_level"
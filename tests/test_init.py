@@ -1,9 +1,133 @@
 """Test component setup."""
 
+import httpx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_WEBHOOK_ID, Platform, UnitOfPower
+from homeassistant.helpers import entity_registry as er
 from homeassistant.setup import async_setup_component
 
-from custom_components.teslafi.const import DOMAIN
+from custom_components.teslafi.const import (
+    CONF_CHANGE_EVENT_FIELDS,
+    CONF_CHANGE_EVENTS,
+    CONF_DEPARTURE_TIME,
+    CONF_HEDGE_REQUESTS,
+    CONF_JOURNAL,
+    CONF_PREWAKE,
+    CONF_PRICE_ENTITY,
+    CONF_PUSH,
+    CONF_SOLAR_EXPORT_ENTITY,
+    DOMAIN,
+    HTTP_CLIENT,
+)
+
+EXPORT = "sensor.grid_export"
+PRICES = "sensor.electricity_price"
 
 async def test_async_setup(hass):
     """Test the component gets setup."""
     assert await async_setup_component(hass, DOMAIN, {}) is True
+
+
+async def test_setup_entry_platforms(hass, mock_api, config_entry, feed):
+    """Only the platforms and entities the vehicle reports data for are set up."""
+    for field in ("sentry_mode", "latitude", "longitude", "tpms_front_left"):
+        del feed[field]
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    platforms = hass.data[DOMAIN][config_entry.entry_id]["platforms"]
+    assert Platform.ALARM_CONTROL_PANEL not in platforms
+    assert Platform.DEVICE_TRACKER not in platforms
+    assert {Platform.SENSOR, Platform.LOCK} <= set(platforms)
+    assert not hass.states.async_entity_ids("alarm_control_panel")
+    assert not hass.states.async_entity_ids("device_tracker")
+    registry = er.async_get(hass)
+    vin = feed["vin"]
+    assert not registry.async_get_entity_id("sensor", DOMAIN, f"{vin}-tpms_front_left")
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{vin}-tpms_front_right")
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert HTTP_CLIENT not in hass.data[DOMAIN]
+
+
+async def test_migrate_releases_client(hass, mock_api, config_entry):
+    """Migration releases its HTTP client, even when TeslaFi can't be reached."""
+    mock_api.side_effect = httpx.ConnectError("unreachable")
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=dict(config_entry.data))
+    entry.add_to_hass(hass)
+    assert not await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.MIGRATION_ERROR
+    assert mock_api.called
+    assert HTTP_CLIENT not in hass.data.get(DOMAIN, {})
+
+
+async def test_setup_entry_options(hass, mock_api, config_entry, caplog):
+    """An entry with every optional feature on sets up, and unloads cleanly."""
+    assert await async_setup_component(hass, "http", {})
+    hass.states.async_set(EXPORT, "0", {"unit_of_measurement": UnitOfPower.WATT})
+    hass.states.async_set(
+        PRICES,
+        "0.21",
+        {"raw_today": [{"start": "2024-01-15T00:00:00+00:00", "value": 0.21}]},
+    )
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_HEDGE_REQUESTS: True,
+            CONF_CHANGE_EVENTS: True,
+            CONF_CHANGE_EVENT_FIELDS: ["battery_level"],
+            CONF_PUSH: True,
+            CONF_WEBHOOK_ID: "teslafi_test",
+            CONF_SOLAR_EXPORT_ENTITY: EXPORT,
+            CONF_PRICE_ENTITY: PRICES,
+            CONF_DEPARTURE_TIME: "07:30:00",
+            CONF_PREWAKE: True,
+            CONF_JOURNAL: True,
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    assert entry_data["prewake"] is coordinator.prewake is not None
+    assert coordinator.change_events is not None
+    assert coordinator.journal is not None
+    # Only created by the precondition service
+    assert coordinator.preconditioner is None
+    assert "teslafi_test" in hass.data["webhook"]
+    # Kept for the scheduler
+    assert "chargeNumber" in coordinator.stored_fields
+    assert "Solar charging is disabled while the scheduler is on" in caplog.text
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "teslafi_test" not in hass.data["webhook"]
+    assert HTTP_CLIENT not in hass.data[DOMAIN]
+
+
+async def test_setup_entry_solar(hass, mock_api, config_entry):
+    """Surplus solar power starts charging a plugged in car."""
+    hass.states.async_set(EXPORT, "0", {"unit_of_measurement": UnitOfPower.WATT})
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_SOLAR_EXPORT_ENTITY: EXPORT}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert not [c for c in mock_api.call_args_list if c.args[1] == "charge_start"]
+
+    hass.states.async_set(EXPORT, "3.0", {"unit_of_measurement": UnitOfPower.KILO_WATT})
+    await hass.async_block_till_done()
+    assert [c for c in mock_api.call_args_list if c.args[1] == "charge_start"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,104 @@
+"""Test the snapshot journal."""
+
+import math
+import struct
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from custom_components.teslafi.const import CONF_JOURNAL, DOMAIN
+from custom_components.teslafi.journal import (
+    HEADER,
+    JOURNAL_FIELDS,
+    TeslaFiJournal,
+    replay,
+)
+
+RECORD = struct.Struct(f"<{1 + len(JOURNAL_FIELDS)}d")
+START = 1_705_300_000.0
+
+
+def _journal(tmp_path, records: int = 3) -> TeslaFiJournal:
+    path = str(tmp_path / "journal" / "vehicle.bin")
+    return TeslaFiJournal(path, HEADER.size + records * RECORD.size)
+
+
+def test_append(tmp_path) -> None:
+    """Snapshots are appended in order, and survive a reopen."""
+    journal = _journal(tmp_path)
+    journal.open()
+    assert journal.last() is None
+    assert journal.append(START, {"battery_level": "74", "odometer": "1000.5"})
+    # Not newer than the last record
+    assert journal.append(START, {"battery_level": "10"})
+    journal.close()
+
+    journal.open()
+    timestamp, values = journal.last()
+    assert timestamp == START
+    assert values["battery_level"] == 74.0
+    assert values["odometer"] == 1000.5
+    assert math.isnan(values["chargeNumber"])
+    journal.close()
+
+
+def test_rotate_and_replay(tmp_path) -> None:
+    """A full journal is rotated, and replay reads both files in order."""
+    journal = _journal(tmp_path)
+    journal.open()
+    for i in range(3):
+        assert journal.append(START + i * 60, {"battery_level": 70 + i})
+    assert not journal.append(START + 180, {"battery_level": 73})
+
+    journal.rotate()
+    assert journal.last() is None
+    assert journal.append(START + 180, {"battery_level": 73})
+    journal.close()
+
+    records = list(replay(journal.path))
+    assert [stamp for stamp, _ in records] == [
+        dt_util.utc_from_timestamp(START + i * 60) for i in range(4)
+    ]
+    assert [values["battery_level"] for _, values in records] == [70, 71, 72, 73]
+
+    journal.remove()
+    assert list(replay(journal.path)) == []
+
+
+def test_incompatible(tmp_path) -> None:
+    """A journal of another size is kept for replay, and a new one started."""
+    small = _journal(tmp_path, 2)
+    small.open()
+    small.append(START, {"battery_level": 70})
+    small.close()
+
+    journal = _journal(tmp_path, 3)
+    journal.open()
+    assert journal.last() is None
+    journal.append(START + 60, {"battery_level": 71})
+    journal.close()
+    assert [v["battery_level"] for _, v in replay(journal.path)] == [70, 71]
+
+
+async def test_setup_entry_journal(
+    hass: HomeAssistant, mock_api, config_entry
+) -> None:
+    """The journal is only kept when enabled, and written off the event loop."""
+    path = hass.config.path(STORAGE_DIR, DOMAIN, f"{config_entry.entry_id}.journal")
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    assert coordinator.journal is None
+
+    hass.config_entries.async_update_entry(config_entry, options={CONF_JOURNAL: True})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    assert coordinator.journal.path == path
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    records = await hass.async_add_executor_job(lambda: list(replay(path)))
+    assert [stamp for stamp, _ in records] == [coordinator.data.last_remote_update]
+    assert records[0][1]["battery_level"] == 74.0
@@ -0,0 +1,52 @@
+"""Test request latency tracking."""
+
+import pytest
+
+from custom_components.teslafi.latency import (
+    LATENCY_COMMAND,
+    LATENCY_FEED,
+    LATENCY_LAST_GOOD,
+    TeslaFiLatencyTracker,
+    latency_class,
+)
+
+
+def test_latency_class() -> None:
+    """Polls, lastGood and commands are tracked separately."""
+    assert latency_class("") == LATENCY_FEED
+    assert latency_class("lastGood") == LATENCY_LAST_GOOD
+    assert latency_class("wake_up") == LATENCY_COMMAND
+
+
+def test_timeout() -> None:
+    """The timeout follows a high quantile of recent latencies, within bounds."""
+    tracker = TeslaFiLatencyTracker()
+    for _ in range(9):
+        tracker.record(LATENCY_FEED, 0.4)
+    # Not enough samples yet
+    assert tracker.timeout(LATENCY_FEED) == 5.0
+    assert tracker.hedge_delay(LATENCY_FEED) is None
+
+    tracker.record(LATENCY_FEED, 1.5)
+    assert tracker.timeout(LATENCY_FEED) == pytest.approx(3.0)
+    assert tracker.hedge_delay(LATENCY_FEED) == pytest.approx(1.5)
+    # Other classes are unaffected
+    assert tracker.timeout(LATENCY_COMMAND) == 5.0
+
+    for _ in range(10):
+        tracker.record(LATENCY_COMMAND, 0.1)
+    assert tracker.timeout(LATENCY_COMMAND) == 2.0
+    for _ in range(10):
+        tracker.record(LATENCY_COMMAND, 30.0)
+    assert tracker.timeout(LATENCY_COMMAND) == 15.0
+
+
+def test_window() -> None:
+    """Old latencies leave the window."""
+    tracker = TeslaFiLatencyTracker(window=10)
+    for _ in range(10):
+        tracker.record(LATENCY_FEED, 5.0)
+    assert tracker.quantile(LATENCY_FEED, 0.5) == 5.0
+    for _ in range(10):
+        tracker.record(LATENCY_FEED, 1.0)
+    assert tracker.quantile(LATENCY_FEED, 0.99) == 1.0
@@ -0,0 +1,73 @@
+"""Test the TPMS slow-leak detector."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.teslafi.leak import TeslaFiTpmsLeakDetector
+from custom_components.teslafi.model import TeslaFiVehicle
+
+START = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+
+def _vehicle(when: datetime, front_left: float, **fields) -> TeslaFiVehicle:
+    return TeslaFiVehicle(
+        {
+            "Date": when.strftime("%Y-%m-%d %H:%M:%S"),
+            "shift_state": "P",
+            "outside_temp": "20",
+            "pressure": "psi",
+            "tpms_front_left": str(front_left),
+            "tpms_front_right": "42.0",
+            "tpms_rear_left": "42.0",
+            "tpms_rear_right": "42.0",
+        }
+        | fields
+    )
+
+
+def test_leak() -> None:
+    """A tire losing pressure relative to the others is flagged, once."""
+    detector = TeslaFiTpmsLeakDetector()
+    started = []
+    for i in range(16):
+        now = START + timedelta(hours=6 * i)
+        # 1 psi per day
+        started += detector.ingest(_vehicle(now, 42.0 - i / 4), now)
+
+    assert started == ["front_left"]
+    assert detector.is_leaking("front_left")
+    assert not detector.is_leaking("front_right")
+    # Relative to the mean of the others, which don't move
+    assert detector.slope("front_left") == pytest.approx(-1.0)
+
+
+def test_leak_shared_trend() -> None:
+    """Pressures dropping together, e.g. as it gets colder, are not a leak."""
+    detector = TeslaFiTpmsLeakDetector()
+    for i in range(16):
+        now = START + timedelta(hours=6 * i)
+        pressure = str(42.0 - i / 4)
+        vehicle = _vehicle(
+            now,
+            42.0 - i / 4,
+            tpms_front_right=pressure,
+            tpms_rear_left=pressure,
+            tpms_rear_right=pressure,
+            outside_temp=str(20 - i),
+        )
+        assert detector.ingest(vehicle, now) == []
+    assert not any(
+        detector.is_leaking(tire)
+        for tire in ("front_left", "front_right", "rear_left", "rear_right")
+    )
+
+
+def test_leak_skipped_samples() -> None:
+    """Samples while driving, or carried over from an earlier snapshot, are skipped."""
+    detector = TeslaFiTpmsLeakDetector()
+    detector.ingest(_vehicle(START, 42.0), START)
+    later = START + timedelta(days=1)
+    detector.ingest(_vehicle(START, 30.0), later)
+    detector.ingest(_vehicle(later, 30.0, shift_state="D"), later)
+    assert detector.slope("front_left") is None
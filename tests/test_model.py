@@ -0,0 +1,159 @@
+"""Test the TeslaFi vehicle model."""
+
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant
+
+from custom_components.teslafi.model import (
+    TeslaFiVehicle,
+    _Overlay,
+    _parse_date,
+    _parse_teslafi_date,
+)
+
+START = datetime(2024, 1, 15, 12, tzinfo=UTC)
+
+
+async def test_parse_teslafi_date(hass: HomeAssistant) -> None:
+    """Dates are parsed in the configured time zone, and cached per time zone."""
+    await hass.config.async_set_time_zone("America/Chicago")
+    chicago = ZoneInfo("America/Chicago")
+    assert _parse_teslafi_date("2024-01-15 06:58:12") == datetime(
+        2024, 1, 15, 6, 58, 12, tzinfo=chicago
+    )
+    hits = _parse_date.cache_info().hits
+    assert _parse_teslafi_date("2024-01-15 06:58:12") is _parse_teslafi_date(
+        "2024-01-15 06:58:12"
+    )
+    assert _parse_date.cache_info().hits == hits + 2
+
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    parsed = _parse_teslafi_date("2024-01-15 06:58:12")
+    assert parsed.tzinfo is ZoneInfo("Europe/Amsterdam")
+
+
+async def test_parse_teslafi_date_invalid(hass: HomeAssistant) -> None:
+    """Malformed dates parse as None."""
+    assert _parse_teslafi_date("") is None
+    assert _parse_teslafi_date("2024-01-15T06:58:12") is None
+    assert _parse_teslafi_date("2024-13-15 06:58:12") is None
+    assert _parse_teslafi_date("15/01/2024 06:58") is None
+
+
+def test_stale_fields() -> None:
+    """Fields are fresh while they keep receiving non-empty values."""
+    vehicle, _ = TeslaFiVehicle({}).merged(
+        {"odometer": "1000.0", "tpms_front_left": "42"}, START
+    )
+    later = START + timedelta(hours=2)
+    vehicle, _ = vehicle.merged({"odometer": "1010.0", "tpms_front_left": ""}, later)
+
+    assert vehicle.field_updated("odometer") == later
+    assert vehicle.field_updated("tpms_front_left") == START
+    assert vehicle.field_age("tpms_front_left", later) == timedelta(hours=2)
+    assert vehicle.stale_fields(
+        ("odometer", "tpms_front_left", "inside_temp"), timedelta(hours=1), later
+    ) == {"tpms_front_left", "inside_temp"}
+
+
+def test_merged_changes() -> None:
+    """Merging reports changed fields with their previous value."""
+    vehicle = TeslaFiVehicle({"battery_level": "74", "odometer": "1000.0"})
+    merged, changed = vehicle.merged(
+        {
+            "battery_level": "75",
+            "odometer": "1000.0",
+            "inside_temp": "4.4",
+            "speed": "",
+            "tesla_request_counter": {"commands": 12},
+        },
+        START,
+    )
+
+    assert changed == {"battery_level": "74", "inside_temp": None, "commands": None}
+    assert merged["battery_level"] == "75"
+    assert merged["commands"] == 12
+    # Empty values don't overwrite, once there is data
+    assert "speed" not in merged
+    assert merged.previous is vehicle
+
+
+def test_merged_keys() -> None:
+    """Only the given keys are stored."""
+    merged, changed = TeslaFiVehicle({"Date": "2024-01-15 06:58:12"}).merged(
+        {
+            "battery_level": "75",
+            "odometer": "1000.0",
+            "tesla_request_counter": {"wakes": 3},
+        },
+        keys={"battery_level"},
+    )
+    assert changed == {"battery_level": None}
+    assert dict(merged) == {"Date": "2024-01-15 06:58:12", "battery_level": "75"}
+
+
+def test_snapshots_share_base() -> None:
+    """Versions share the unchanged fields, and are flattened as changes grow."""
+    base = {f"field_{i}": str(i) for i in range(20)}
+    first = TeslaFiVehicle(dict(base))
+    second, _ = first.merged({"field_0": "changed"}, START)
+    third, _ = second.merged({"field_1": "changed"}, START)
+
+    assert isinstance(third.data, _Overlay)
+    assert third.data._base is first.data
+    assert first["field_0"] == "0"
+    assert second["field_0"] == third["field_0"] == "changed"
+    assert second["field_1"] == "1"
+    assert len(third) == 20
+    assert set(third) == set(base)
+    # Only one version of history is kept, without changing older versions
+    assert second.previous is first
+    assert third.previous is not second
+    assert dict(third.previous) == dict(second)
+    assert third.previous.previous is None
+
+    # Past a quarter of the base, the changes are flattened
+    fourth, _ = third.merged({f"field_{i}": "x" for i in range(2, 6)}, START)
+    assert isinstance(fourth.data, dict)
+    assert fourth["field_0"] == "changed"
+    assert fourth["field_5"] == "x"
+
+
+def test_snapshots_immutable() -> None:
+    """Snapshots can't be changed in place."""
+    vehicle = TeslaFiVehicle({"battery_level": "74"})
+    with pytest.raises(TypeError):
+        vehicle["battery_level"] = "75"
+    with pytest.raises(TypeError):
+        del vehicle["battery_level"]
+    with pytest.raises(TypeError):
+        vehicle |= {"battery_level": "75"}
+    assert not hasattr(vehicle, "copy")
+    assert not hasattr(vehicle, "setdefault")
+    assert vehicle == {"battery_level": "74"}
+
+
+def test_retained() -> None:
+    """Retaining keys drops the other fields, with their versions."""
+    vehicle, _ = TeslaFiVehicle({}).merged(
+        {"battery_level": "74", "odometer": "1000.0"}, START
+    )
+    retained = vehicle.retained({"battery_level"})
+    assert dict(retained) == {"battery_level": "74"}
+    assert retained.field_updated("battery_level") == START
+    assert retained.field_updated("odometer") is None
+
+
+def test_temperature_unit() -> None:
+    """Commands use the account's temperature unit, Celsius unless it says F."""
+    assert TeslaFiVehicle({"temperature": "F"}).temperature_unit == (
+        UnitOfTemperature.FAHRENHEIT
+    )
+    assert TeslaFiVehicle({"temperature": "C"}).temperature_unit == (
+        UnitOfTemperature.CELSIUS
+    )
+    assert TeslaFiVehicle({}).temperature_unit == UnitOfTemperature.CELSIUS
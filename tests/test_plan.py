@@ -0,0 +1,104 @@
+"""Test the entity evaluation plan."""
+
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.teslafi.base import TeslaFiBaseEntityDescription
+from custom_components.teslafi.coordinator import TeslaFiCoordinator
+from custom_components.teslafi.model import TeslaFiVehicle
+from custom_components.teslafi.plan import TeslaFiEvaluationPlan
+from custom_components.teslafi.sensor import TeslaFiSensorEntityDescription
+
+
+def _fail(data, hass):
+    raise ValueError("boom")
+
+
+async def test_evaluate(hass: HomeAssistant) -> None:
+    """Every description is evaluated, and failures stay isolated."""
+    plain = TeslaFiBaseEntityDescription(key="odometer")
+    converted = TeslaFiBaseEntityDescription(key="battery_level", convert=int)
+    failing = TeslaFiBaseEntityDescription(key="broken", value=_fail)
+    unavailable = TeslaFiBaseEntityDescription(
+        key="inside_temp",
+        available=lambda u, d, h: u and d.get("inside_temp") is not None,
+    )
+    unit = TeslaFiSensorEntityDescription(
+        key="outside_temp",
+        fix_unit=lambda d, h: "°F" if d.get("temperature") == "F" else None,
+    )
+    plan = TeslaFiEvaluationPlan([plain, converted, failing, unavailable, unit])
+    assert len(plan) == 5
+    # Default Callables are skipped, and plain fields are read directly
+    assert plan._steps[0][4] == "odometer"
+    assert plan._steps[0][6] is None
+    assert plan._steps[0][8] is None
+    assert plan._steps[2][4] is None
+
+    coordinator = MagicMock(
+        data=TeslaFiVehicle(
+            {"odometer": "1000.0", "battery_level": "80", "temperature": "F"}
+        ),
+        hass=hass,
+        last_update_success=True,
+    )
+    plan.evaluate(coordinator)
+
+    assert plan.results[id(plain)].value == "1000.0"
+    assert plan.results[id(plain)].available
+    assert plan.results[id(converted)].value == 80
+    assert plan.results[id(failing)].value is None
+    assert not plan.results[id(failing)].available
+    assert not plan.results[id(unavailable)].available
+    assert plan.results[id(unit)].unit == "°F"
+
+
+async def test_evaluate_changed(hass: HomeAssistant) -> None:
+    """Descriptions whose fields did not change keep their result."""
+    odometer = TeslaFiBaseEntityDescription(key="odometer")
+    battery = TeslaFiBaseEntityDescription(key="battery_level")
+    undeclared = TeslaFiBaseEntityDescription(
+        key="_range", value=lambda d, h: d.get("battery_range")
+    )
+    plan = TeslaFiEvaluationPlan([odometer, battery, undeclared])
+    data = TeslaFiVehicle({"odometer": "1000.0", "battery_level": "80"})
+    coordinator = MagicMock(data=data, hass=hass, last_update_success=True)
+    plan.evaluate(coordinator)
+    kept = plan.results[id(odometer)]
+
+    coordinator.data, _ = data.merged({"odometer": "1000.0", "battery_level": "79"})
+    plan.evaluate(coordinator, changed={"battery_level"})
+    assert plan.results[id(odometer)] is kept
+    assert plan.results[id(battery)].value == "79"
+    # Descriptions without declared fields are always evaluated
+    assert plan.evaluated == {id(battery), id(undeclared)}
+
+    # A change of upstream availability affects every description
+    coordinator.last_update_success = False
+    plan.evaluate(coordinator, changed=set())
+    assert not plan.results[id(odometer)].available
+    assert len(plan.evaluated) == 3
+
+
+async def test_coordinator_plan(hass: HomeAssistant) -> None:
+    """The plan is rebuilt when descriptions are registered or released."""
+    coordinator = TeslaFiCoordinator(hass, MagicMock())
+    first = TeslaFiBaseEntityDescription(key="odometer")
+    second = TeslaFiBaseEntityDescription(key="battery_level")
+    coordinator.async_register_description(first)
+    coordinator.data = TeslaFiVehicle({"odometer": "1000.0", "battery_level": "80"})
+    assert coordinator.evaluation(first) is None
+
+    coordinator.async_update_listeners()
+    assert coordinator.evaluation(first).value == "1000.0"
+    assert coordinator.evaluation(second) is None
+
+    release = coordinator.async_register_description(second)
+    assert coordinator.evaluation(first) is None
+    coordinator.async_update_listeners()
+    assert coordinator.evaluation(second).value == "80"
+
+    release()
+    coordinator.async_update_listeners()
+    assert coordinator.evaluation(second) is None
@@ -0,0 +1,38 @@
+"""Test the preconditioning rate model."""
+
+import pytest
+
+from custom_components.teslafi.precondition import _RateModel
+
+
+def test_rate_model_fit() -> None:
+    """The rate is fit as a linear function of the temperature difference."""
+    model = _RateModel()
+    for x in (-20, -15, -10, -5):
+        model.add(x, 0.5 + 0.02 * x)
+    # Not enough samples yet
+    assert model.rate(-10) is None
+
+    # Older samples weigh a little less, so it takes one more
+    model.add(0, 0.5)
+    model.add(5, 0.6)
+    assert model.rate(-10) == pytest.approx(0.3)
+    assert model.rate(-25) == pytest.approx(0.0)
+
+
+def test_rate_model_same_temperatures() -> None:
+    """Samples all at one temperature difference predict their (weighted) mean."""
+    model = _RateModel()
+    for y in (0.4, 0.5, 0.6, 0.4, 0.5, 0.6):
+        model.add(-10, y)
+    assert model.rate(-30) == pytest.approx(0.5, abs=0.01)
+
+
+def test_rate_model_forgets() -> None:
+    """Recent samples outweigh old ones, so the fit follows the seasons."""
+    model = _RateModel()
+    for _ in range(500):
+        model.add(-20, 0.2)
+    for _ in range(500):
+        model.add(-20, 0.8)
+    assert model.rate(-20) > 0.79
@@ -0,0 +1,50 @@
+"""Test learning pre-wake times."""
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.teslafi.prewake import learn_slots
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+# A Monday
+NOW = datetime(2024, 1, 22, 12, tzinfo=AMSTERDAM)
+
+
+def _at(days_ago: int, hour: int, minute: int) -> float:
+    day = NOW - timedelta(days=days_ago)
+    return day.replace(hour=hour, minute=minute).timestamp()
+
+
+async def test_learn_slots(hass: HomeAssistant) -> None:
+    """Bins with commands on enough days wake a little before the early ones."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    commands = [
+        # Morning climate, on four weekdays
+        (_at(7, 7, 31), "auto_conditioning_start"),
+        (_at(6, 7, 33), "auto_conditioning_start"),
+        (_at(5, 7, 40), "auto_conditioning_start"),
+        (_at(4, 7, 36), "set_temps"),
+        # Evening charge, on only two days
+        (_at(3, 22, 0), "charge_start"),
+        (_at(2, 22, 5), "charge_start"),
+        # Too long ago
+        (_at(40, 22, 1), "charge_start"),
+        (_at(41, 22, 1), "charge_start"),
+    ]
+
+    slots = learn_slots(commands, NOW)
+    assert list(slots) == ["0730"]
+    slot = slots["0730"]
+    # Lower quartile (07:33), less the lead
+    assert slot.at == time(7, 30)
+    # Monday to Thursday
+    assert slot.weekdays == {0, 1, 2, 3}
+    assert slot.days == 4
+    assert slot.commands == ("auto_conditioning_start", "set_temps")
+
+
+async def test_learn_slots_empty(hass: HomeAssistant) -> None:
+    """Nothing is learned without commands."""
+    assert learn_slots([], NOW) == {}
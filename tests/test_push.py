@@ -0,0 +1,62 @@
+"""Test pushed feed data."""
+
+from http import HTTPStatus
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.webhook import async_generate_path
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.teslafi.const import CONF_PUSH, DOMAIN
+
+WEBHOOK_ID = "teslafi_test"
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, mock_api, config_entry: MockConfigEntry):
+    """The coordinator of an entry that accepts pushed data."""
+    assert await async_setup_component(hass, "http", {})
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PUSH: True, CONF_WEBHOOK_ID: WEBHOOK_ID}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+    yield hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_push(hass, hass_client_no_auth, mock_api, coordinator, feed):
+    """A feed posted to the webhook updates the vehicle without polling."""
+    polls = mock_api.call_count
+    pushed = dict(feed, Date="2024-01-15 07:03:12", battery_level="75")
+
+    client = await hass_client_no_auth()
+    response = await client.post(async_generate_path(WEBHOOK_ID), json=pushed)
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+
+    assert coordinator.data["battery_level"] == "75"
+    assert coordinator.data["Date"] == "2024-01-15 07:03:12"
+    assert mock_api.call_count == polls
+    assert coordinator._is_pushing(coordinator._last_push)
+    state = hass.states.get("sensor.red_rocket_battery")
+    assert state is not None and state.state == "75"
+
+
+async def test_push_other_vehicle(hass, hass_client_no_auth, coordinator, feed):
+    """Feeds of another vehicle are rejected."""
+    client = await hass_client_no_auth()
+    response = await client.post(
+        async_generate_path(WEBHOOK_ID),
+        json=dict(feed, vin="5YJ3E1EA7KF999999", battery_level="10"),
+    )
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert coordinator.data["battery_level"] == "74"
+    assert coordinator._last_push is None
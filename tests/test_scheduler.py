@@ -0,0 +1,100 @@
+"""Test the charge scheduler's planning."""
+
+from datetime import UTC, datetime, time
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant, State
+
+from custom_components.teslafi.model import TeslaFiVehicle
+from custom_components.teslafi.scheduler import (
+    TeslaFiChargeScheduler,
+    plan_windows,
+    price_slots,
+)
+
+HOUR = 3600.0
+
+
+def _slots(prices: list[float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    starts = np.arange(len(prices)) * HOUR
+    return starts, starts + HOUR, np.array(prices)
+
+
+def test_plan_cheapest() -> None:
+    """The cheapest slots are chosen, and adjacent ones merged into windows."""
+    slots = _slots([5, 1, 2, 9, 1.5, 3])
+    windows = plan_windows(slots, 0, 6 * HOUR, 2.5 * HOUR)
+    assert windows.tolist() == [[1 * HOUR, 3 * HOUR], [4 * HOUR, 5 * HOUR]]
+
+    # Only the rest of the current slot is usable
+    windows = plan_windows(slots, 1.5 * HOUR, 6 * HOUR, HOUR)
+    assert windows.tolist() == [[1.5 * HOUR, 2 * HOUR], [4 * HOUR, 5 * HOUR]]
+
+
+def test_plan_beyond_forecast() -> None:
+    """Time after the forecast counts as one slot at the median price."""
+    windows = plan_windows(_slots([3, 1]), 0, 5 * HOUR, 2 * HOUR)
+    assert windows.tolist() == [[1 * HOUR, 5 * HOUR]]
+
+
+def test_plan_nothing() -> None:
+    """Nothing to charge, or the departure passed."""
+    slots = _slots([1, 2])
+    assert plan_windows(slots, 0, 2 * HOUR, 0).shape == (0, 2)
+    assert plan_windows(slots, 2 * HOUR, HOUR, HOUR).shape == (0, 2)
+
+
+def test_price_slots() -> None:
+    """Overlapping forecast attributes are merged, and missing ends filled in."""
+    state = State(
+        "sensor.nordpool",
+        "0.21",
+        {
+            "raw_today": [
+                {
+                    "start": "2024-01-15T00:00:00+00:00",
+                    "end": "2024-01-15T01:00:00+00:00",
+                    "value": 0.2,
+                },
+                {"start": "2024-01-15T01:00:00+00:00", "value": 0.1},
+            ],
+            "forecast": [
+                {"startsAt": "2024-01-15T01:00:00+00:00", "price": 0.3},
+                {"startsAt": "2024-01-15T02:00:00+00:00", "price": "0.4"},
+                {"startsAt": "not a date", "price": 0.5},
+            ],
+        },
+    )
+    start, end, price = price_slots(state)
+    base = 1705276800.0
+    assert start.tolist() == [base, base + HOUR, base + 2 * HOUR]
+    assert end.tolist() == [base + HOUR, base + 2 * HOUR, base + 3 * HOUR]
+    # The first attribute wins on overlap
+    assert price.tolist() == [0.2, 0.1, 0.4]
+    assert price_slots(State("sensor.nordpool", "0.21")) is None
+
+
+async def test_apply_without_plan(hass: HomeAssistant) -> None:
+    """Without a plan the car's own charging is left alone, with one it follows."""
+    coordinator = MagicMock(
+        data=TeslaFiVehicle({"charging_state": "charging"}),
+        execute_command=AsyncMock(),
+    )
+    scheduler = TeslaFiChargeScheduler(
+        hass, coordinator, "sensor.electricity_price", time(7, 30)
+    )
+    now = datetime(2024, 1, 15, 12, tzinfo=UTC)
+    scheduler._apply(now)
+    await hass.async_block_till_done()
+    coordinator.execute_command.assert_not_called()
+
+    # Planned to charge later only
+    later = now.timestamp() + HOUR
+    scheduler._windows = np.array([[later, later + HOUR]])
+    scheduler._apply(now)
+    await hass.async_block_till_done()
+    coordinator.execute_command.assert_awaited_once_with(
+        "charge_stop", background=True
+    )
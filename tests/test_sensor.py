@@ -0,0 +1,69 @@
+"""Test TeslaFi sensors."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.teslafi.const import DOMAIN
+from custom_components.teslafi.sensor import CATALOG_SENSORS
+
+CABIN = "sensor.red_rocket_cabin_temperature"
+
+
+async def test_deadband(hass: HomeAssistant, mock_api, config_entry, feed) -> None:
+    """Changes within the deadband are neither written nor kept on the entity."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    entity = hass.data["sensor"].get_entity(CABIN)
+    assert hass.states.get(CABIN).state == "4.4"
+
+    feed.update(Date="2024-01-15 07:00:00", inside_temp="4.6")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(CABIN).state == "4.4"
+    assert entity.native_value == "4.4"
+
+    # The deadband applies to the written value, so small steps add up
+    feed.update(Date="2024-01-15 07:01:00", inside_temp="4.8")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(CABIN).state == "4.8"
+    assert entity.native_value == "4.8"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_catalog(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """Useful catalog sensors are enabled, the rest cost nothing until enabled."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    registry = er.async_get(hass)
+
+    assert hass.states.get("sensor.red_rocket_usable_battery_level").state == "73.0"
+
+    entry = registry.async_get("sensor.red_rocket_charger_pilot_current")
+    assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get("sensor.red_rocket_charger_pilot_current") is None
+    pilot = next(d for d in CATALOG_SENSORS if d.key == "charger_pilot_current")
+    assert coordinator.evaluation(pilot) is None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_drain_unit(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """Parked drain is a distance per hour, in the user's distance unit."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.red_rocket_parked_drain")
+    assert state.attributes["device_class"] == "distance"
+    assert state.attributes["unit_of_measurement"] == "km"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
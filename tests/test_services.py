@@ -0,0 +1,73 @@
+"""Test the integration's services."""
+
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from custom_components.teslafi.const import (
+    DOMAIN,
+    SERVICE_IMPORT_HISTORY,
+    SERVICE_PRECONDITION,
+)
+from custom_components.teslafi.services import ATTR_DEPARTURE, ATTR_PATH
+
+
+async def test_precondition(hass: HomeAssistant, mock_api, config_entry, feed) -> None:
+    """Preconditioning is planned for the vehicle of the device."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, feed["vin"])})
+    assert coordinator.preconditioner is None
+    # Fields no entity uses are dropped once the entities are known
+    await coordinator.async_refresh()
+    assert "driver_temp_setting" not in coordinator.data
+
+    departure = dt_util.utcnow() + timedelta(hours=2)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PRECONDITION,
+        {
+            ATTR_DEVICE_ID: device.id,
+            ATTR_DEPARTURE: departure.isoformat(),
+            ATTR_TEMPERATURE: 21,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert dt_util.parse_datetime(response["start"]) < departure
+    # Created on first use, which fetched the fields it needs
+    assert coordinator.preconditioner is not None
+    assert coordinator.data["driver_temp_setting"] == "21.0"
+
+    with pytest.raises(ServiceValidationError, match="in the future"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PRECONDITION,
+            {ATTR_DEVICE_ID: device.id, ATTR_DEPARTURE: dt_util.utcnow().isoformat()},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_not_a_vehicle(hass: HomeAssistant, mock_api, config_entry) -> None:
+    """Services reject devices that are not TeslaFi vehicles."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError, match="Not a TeslaFi vehicle"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_HISTORY,
+            {ATTR_DEVICE_ID: "unknown", ATTR_PATH: hass.config.path("export.csv")},
+            blocking=True,
+            return_response=True,
+        )
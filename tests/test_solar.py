@@ -0,0 +1,95 @@
+"""Test the solar charging controller."""
+
+from unittest.mock import MagicMock
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import HomeAssistant, State
+
+from custom_components.teslafi.model import TeslaFiVehicle
+from custom_components.teslafi.solar import TeslaFiSolarController
+
+EXPORT = "sensor.grid_export"
+DATE = "2024-01-15 12:00:00"
+
+
+def _vehicle(charging_state: str, **data) -> TeslaFiVehicle:
+    return TeslaFiVehicle(
+        {
+            "Date": DATE,
+            "charging_state": charging_state,
+            "charger_voltage": "240",
+            "charger_phases": "1",
+            "charge_current_request": "10",
+            "charge_current_request_max": "16",
+            "battery_level": "60",
+            "charge_limit_soc": "80",
+        }
+        | data
+    )
+
+
+def _export(watts: float) -> State:
+    return State(EXPORT, str(watts), {ATTR_UNIT_OF_MEASUREMENT: UnitOfPower.WATT})
+
+
+def _controller(hass: HomeAssistant, vehicle: TeslaFiVehicle) -> TeslaFiSolarController:
+    return TeslaFiSolarController(hass, MagicMock(data=vehicle), EXPORT)
+
+
+async def test_decide_start(hass: HomeAssistant) -> None:
+    """Charging starts above the minimum current plus the margin."""
+    controller = _controller(hass, _vehicle("stopped"))
+    # 5 A is enough to keep charging, but not to start
+    assert controller._decide(_export(5 * 240)) is None
+    assert controller._decide(_export(6 * 240)) == ("charge_start", {})
+    assert controller._decide(
+        State(EXPORT, "1.5", {ATTR_UNIT_OF_MEASUREMENT: UnitOfPower.KILO_WATT})
+    ) == ("charge_start", {})
+    assert controller._decide(State(EXPORT, "unavailable")) is None
+
+    # Not when full, unplugged or at a supercharger
+    controller = _controller(hass, _vehicle("stopped", battery_level="80"))
+    assert controller._decide(_export(3000)) is None
+    controller = _controller(hass, _vehicle("disconnected"))
+    assert controller._decide(_export(3000)) is None
+    controller = _controller(hass, _vehicle("stopped", fast_charger_present="1"))
+    assert controller._decide(_export(3000)) is None
+
+
+async def test_decide_own_session(hass: HomeAssistant) -> None:
+    """The current follows the surplus in steps, and stops below the margin."""
+    controller = _controller(hass, _vehicle("charging"))
+    controller._started = DATE
+    # The car's own 10 A are part of the surplus
+    assert controller._decide(_export(0)) is None
+    assert controller._decide(_export(240)) is None
+    assert controller._decide(_export(2 * 240)) == (
+        "set_charging_amps",
+        {"charging_amps": 12},
+    )
+    # Limited to what the car accepts
+    assert controller._decide(_export(5000)) == (
+        "set_charging_amps",
+        {"charging_amps": 16},
+    )
+    # 4 A still charges at the minimum, below that it stops
+    assert controller._decide(_export(-6 * 240)) == (
+        "set_charging_amps",
+        {"charging_amps": 5},
+    )
+    assert controller._decide(_export(-7 * 240)) == ("charge_stop", {})
+
+
+async def test_decide_user_session(hass: HomeAssistant) -> None:
+    """Charging started by someone else is never adjusted or stopped."""
+    controller = _controller(hass, _vehicle("charging"))
+    assert controller._decide(_export(-5000)) is None
+    assert controller._decide(_export(5000)) is None
+
+    # Once our own session has ended, a new one isn't ours either
+    controller._started = "2024-01-15 11:00:00"
+    controller._coordinator.data = _vehicle("stopped")
+    assert controller._decide(_export(0)) is None
+    assert controller._started is None
+    controller._coordinator.data = _vehicle("charging")
+    assert controller._decide(_export(-5000)) is None
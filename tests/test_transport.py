@@ -0,0 +1,35 @@
+"""Test the shared HTTP transport."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.teslafi.const import (
+    DOMAIN,
+    HTTP_CLIENT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from custom_components.teslafi.transport import async_get_transport
+
+
+async def test_shared_pool(hass: HomeAssistant) -> None:
+    """Entries share one pool, sized independently of how many there are."""
+    with patch("custom_components.teslafi.transport.httpx.AsyncClient") as client:
+        client.return_value.aclose = AsyncMock()
+        transport = async_get_transport(hass)
+        first = transport.acquire()
+        # An entry added later
+        second = async_get_transport(hass).acquire()
+
+    assert first is second
+    client.assert_called_once()
+    limits = client.call_args.kwargs["limits"]
+    assert limits.max_connections == HTTP_MAX_CONNECTIONS
+    assert limits.max_keepalive_connections == HTTP_MAX_KEEPALIVE_CONNECTIONS
+
+    await transport.async_release(hass)
+    first.aclose.assert_not_awaited()
+    await transport.async_release(hass)
+    first.aclose.assert_awaited_once()
+    assert HTTP_CLIENT not in hass.data[DOMAIN]